@@ -0,0 +1,250 @@
+"""
+Non-blocking Animation Engine
+Drives terminal effects as frames on an asyncio schedule, writing each frame
+with a single write/flush. Any key skips to the end of the effect; Esc, q or
+Ctrl+C cancel it.
+"""
+
+import os
+import sys
+import time
+
+# Keys that cancel instead of skip
+CANCEL_KEYS = ('\x1b', 'q', 'Q', '\x03')
+
+class Reveal:
+    """Write content chunks one per frame; skipping writes whatever is left"""
+
+    # Every chunk is part of the output, so none may be dropped for a slow client
+    droppable = False
+
+    def __init__(self, chunks, interval, final=''):
+        self.chunks = list(chunks)
+        self.interval = interval
+        self.final = final
+        self.pos = 0
+
+    def frames(self):
+        while self.pos < len(self.chunks):
+            self.pos += 1
+            yield self.chunks[self.pos - 1]
+        self.pos += 1
+        yield self.final
+
+    def skip(self):
+        if self.pos > len(self.chunks):
+            return ''
+        rest = ''.join(self.chunks[self.pos:]) + self.final
+        self.pos = len(self.chunks) + 1
+        return rest
+
+class Transient:
+    """Frames that replace each other (spinners, pauses); skipping jumps straight to final"""
+
+    # Each frame overwrites the last, so a slow client may miss some; never the final one
+    droppable = True
+
+    def __init__(self, frames, interval, final=''):
+        self._frames = frames
+        self.interval = interval
+        self.final = final
+        self.done = False
+
+    def frames(self):
+        for frame in self._frames:
+            if self.done:
+                return
+            yield frame
+        if not self.done:
+            self.done = True
+            self.droppable = False
+            yield self.final
+
+    def skip(self):
+        if self.done:
+            return ''
+        self.done = True
+        return self.final
+
+class Sequence:
+    """Several effects played back to back"""
+
+    def __init__(self, *effects):
+        self.effects = list(effects)
+        self.interval = None
+        self.droppable = False
+        self.index = 0
+
+    def frames(self):
+        while self.index < len(self.effects):
+            effect = self.effects[self.index]
+            for frame in effect.frames():
+                # The scheduler reads the interval of whichever effect is playing
+                self.interval = effect.interval
+                self.droppable = getattr(effect, 'droppable', False)
+                yield frame
+            self.index += 1
+
+    def skip(self):
+        rest = ''.join(effect.skip() for effect in self.effects[self.index:])
+        self.index = len(self.effects)
+        return rest
+
+    def cancel(self):
+        current = self.effects[self.index] if self.index < len(self.effects) else None
+        self.index = len(self.effects)
+        return cancel_output(current) if current else ''
+
+def cancel_output(effect):
+    """Text an effect needs written when cancelled (e.g. leaving the alternate screen)"""
+    cancel = getattr(effect, 'cancel', None)
+    return cancel() if cancel else ''
+
+def text(content):
+    """An effect that writes content at once"""
+    return Reveal([content], 0)
+
+def pause(seconds):
+    """An effect that writes nothing for a while"""
+    return Transient([''] * max(1, round(seconds / 0.05)), 0.05)
+
+def typing(content, delay=0.03, max_fps=60):
+    """Typewriter effect, batching several characters per frame above max_fps"""
+    per_frame = max(1, round((1 / max_fps) / delay)) if delay > 0 else len(content) or 1
+    chunks = [content[i:i + per_frame] for i in range(0, len(content), per_frame)]
+    return Reveal(chunks, delay * per_frame, final='\n')
+
+def lines(content_lines, interval=0.1):
+    """Reveal whole lines one at a time"""
+    return Reveal([line + '\n' for line in content_lines], interval)
+
+class _KeyWatcher:
+    """Puts the terminal in cbreak mode and reports keypresses while an effect plays"""
+
+    def __init__(self, loop, on_key):
+        self.loop = loop
+        self.on_key = on_key
+        self.fd = None
+        self.saved = None
+        self.poll = None
+
+    def __enter__(self):
+        stdin = sys.stdin
+        # Served sessions hand over the keys their client typed during the effect
+        poll_key = getattr(stdin, 'poll_key', None)
+        if poll_key:
+            self.poll = poll_key
+            return self
+        try:
+            if stdin is None or not stdin.isatty():
+                return self
+        except (AttributeError, ValueError):
+            return self
+        if os.name == 'nt':
+            import msvcrt
+            self.poll = lambda: msvcrt.getwch() if msvcrt.kbhit() else None
+            return self
+        import termios
+        import tty
+        self.fd = stdin.fileno()
+        try:
+            self.saved = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+            self.loop.add_reader(self.fd, self._read)
+        except (termios.error, OSError, NotImplementedError):
+            self.fd = None
+        return self
+
+    def _read(self):
+        data = os.read(self.fd, 32)
+        if data:
+            self.on_key(data.decode('utf-8', 'replace')[:1])
+
+    def check(self):
+        """Poll for a key on platforms without a selectable stdin"""
+        if self.poll:
+            key = self.poll()
+            if key:
+                self.on_key(key)
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            import termios
+            self.loop.remove_reader(self.fd)
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+        return False
+
+async def play_async(effect, write=None, flush=None, watch_keys=True):
+    """Play an effect frame by frame; returns 'done', 'skipped' or 'cancelled'"""
+    import asyncio
+
+    out = sys.stdout
+    write = write or out.write
+    flush = flush or out.flush
+    # Served sessions report when their client is behind, so replaceable frames can be dropped
+    skip_frame = getattr(out, 'skip_frame', None)
+    loop = asyncio.get_running_loop()
+    interrupt = asyncio.Event()
+    outcome = ['done']
+
+    def on_key(key):
+        outcome[0] = 'cancelled' if key in CANCEL_KEYS else 'skipped'
+        interrupt.set()
+
+    watcher = _KeyWatcher(loop, on_key) if watch_keys else None
+    if watcher:
+        watcher.__enter__()
+    try:
+        deadline = time.perf_counter()
+        for frame in effect.frames():
+            if frame and not (skip_frame and effect.droppable and skip_frame()):
+                write(frame)
+                flush()
+            interval = effect.interval or 0
+            if interval <= 0:
+                continue
+            # Fixed-rate schedule: sleep to the next tick, not for a fixed delay, so slow writes do not drift
+            deadline += interval
+            while not interrupt.is_set():
+                if watcher:
+                    watcher.check()
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(interrupt.wait(), min(remaining, 0.05))
+                except asyncio.TimeoutError:
+                    pass
+            if interrupt.is_set():
+                break
+    except BaseException:
+        # An effect that fails mid-play must not leave the alternate screen on or the cursor hidden
+        write(cancel_output(effect) + '\033[0m')
+        flush()
+        raise
+    finally:
+        if watcher:
+            watcher.__exit__(None, None, None)
+
+    if outcome[0] == 'skipped':
+        write(effect.skip())
+    elif outcome[0] == 'cancelled':
+        write(cancel_output(effect) + '\033[0m\n')
+    flush()
+    return outcome[0]
+
+def play(effect, write=None, flush=None, animate=True):
+    """Play an effect from synchronous code; Ctrl+C cancels the effect rather than the program"""
+    if not animate:
+        # Straight to the final state, in one write
+        (write or sys.stdout.write)(effect.skip())
+        (flush or sys.stdout.flush)()
+        return 'skipped'
+    # asyncio costs ~40 ms to import, so only effects that actually animate pay for it
+    import asyncio
+
+    try:
+        return asyncio.run(play_async(effect, write, flush))
+    except KeyboardInterrupt:
+        (write or sys.stdout.write)(cancel_output(effect) + '\033[0m\n')
+        return 'cancelled'
@@ -0,0 +1,332 @@
+"""
+Batched Image-to-ASCII Renderer
+Pulls the whole resized pixel buffer at once and maps brightness to glyphs
+through a precomputed lookup table instead of calling getpixel per cell
+"""
+
+from term_caps import TRUECOLOR, MONO, palette
+
+# Glyph ramps, darkest to lightest
+DETAILED_RAMP = ['█', '▓', '▒', '░', '@', '#', 'S', '%', '?', '*', '+', ';', ':', ',', '.', ' ']
+CLASSIC_RAMP = ['@', '#', 'S', '%', '?', '*', '+', ';', ':', ',', '.', ' ']
+
+RESET = '\033[0m'
+
+# Banner render modes: one pixel per cell, two stacked pixels per cell, 2x4 dots per cell
+ASCII = 'ascii'
+HALFBLOCK = 'halfblock'
+BRAILLE = 'braille'
+RENDER_MODES = (ASCII, HALFBLOCK, BRAILLE)
+
+UPPER_HALF = '▀'
+# Braille dot bit for each (column, row) of a 2x4 cell
+_BRAILLE_BITS = ((0x01, 0x02, 0x04, 0x40), (0x08, 0x10, 0x20, 0x80))
+_BRAILLE = [' '] + [chr(0x2800 + bits) for bits in range(1, 256)]
+
+# Decimal strings for every channel value, so escapes are built without int formatting
+_DEC = [str(i) for i in range(256)]
+
+# Streaming: cell rows resampled and rendered per strip, and the source size that switches render_image over
+STRIP_CELLS = 16
+STREAM_PIXELS = 4096 * 4096
+
+_glyph_tables = {}
+_quantize_tables = {}
+
+def glyph_table(ascii_chars):
+    """Return a lookup table mapping every r+g+b sum (0-765) to a glyph"""
+    key = tuple(ascii_chars)
+    table = _glyph_tables.get(key)
+    if table is None:
+        last = len(ascii_chars) - 1
+        # Same arithmetic as the per-pixel loop: brightness = (r + g + b) / 3
+        table = [ascii_chars[last - int((total / 3) / 255 * last)] for total in range(766)]
+        _glyph_tables[key] = table
+    return table
+
+def open_image(image):
+    """An image path or an already opened PIL image, as an opened image"""
+    if hasattr(image, 'draft'):
+        return image
+    from PIL import Image
+    return Image.open(image)
+
+def load_image(image_path, width, aspect=0.45, x_scale=1, y_scale=1):
+    """Open an image (or take an opened one) and resize it to the cell grid of the given width
+
+    x_scale/y_scale give the pixels per cell for the dense modes
+    (1x2 for half blocks, 2x4 for braille).
+    """
+    img = open_image(image_path)
+
+    # Terminal cells are taller than wide, so squash the height by the aspect factor
+    height = max(1, int(width * (img.height / img.width) * aspect))
+    img = img.resize((width * x_scale, height * y_scale))
+    return img.convert('RGB')
+
+def open_reduced(image_path, width, aspect=0.45, x_scale=1, y_scale=1):
+    """Open an image shrunk towards its target size while it is decoded
+
+    Returns (image, (target width, target height)) in pixels. JPEGs use draft
+    mode so libjpeg decodes straight to 1/2, 1/4 or 1/8 scale; other formats
+    are box-reduced by an integer factor right after decoding. Both keep at
+    least twice the target resolution for the final resample. An opened image
+    works too, as long as its pixels have not been loaded yet.
+    """
+    img = open_image(image_path)
+    height = max(1, int(width * (img.height / img.width) * aspect))
+    size = (width * x_scale, height * y_scale)
+
+    img.draft('RGB', (size[0] * 2, size[1] * 2))
+    if img.mode not in ('RGB', 'RGBA', 'L'):
+        img = img.convert('RGB')
+    factor = min(img.width // (size[0] * 2), img.height // (size[1] * 2))
+    if factor > 1 and hasattr(img, 'reduce'):
+        img = img.reduce(factor)
+    return img.convert('RGB'), size
+
+def iter_strips(img, size, strip_cells=STRIP_CELLS, y_scale=1):
+    """Yield the image resized to size a few cell rows at a time, each resampled from its own source band"""
+    width, height = size
+    strip = strip_cells * y_scale
+    scale = img.height / height
+    for top in range(0, height, strip):
+        bottom = min(height, top + strip)
+        yield img.resize((width, bottom - top), box=(0, top * scale, img.width, bottom * scale))
+
+def iter_pixel_rows(img):
+    """Yield (reds, greens, blues) byte strings for each row of an RGB image"""
+    buf = img.tobytes()
+    stride = img.width * 3
+    for offset in range(0, len(buf), stride):
+        row = buf[offset:offset + stride]
+        yield row[0::3], row[1::3], row[2::3]
+
+def quantize_table(step):
+    """Return a bytes.translate table snapping channel values to buckets of size step"""
+    table = _quantize_tables.get(step)
+    if table is None:
+        table = bytes(min(255, (v // step) * step + step // 2) for v in range(256))
+        _quantize_tables[step] = table
+    return table
+
+def render_rows_per_cell(img, ascii_chars=DETAILED_RAMP):
+    """Render with a color escape and a reset around every cell (the original format)"""
+    table = glyph_table(ascii_chars)
+    dec = _DEC
+    lines = []
+    for reds, greens, blues in iter_pixel_rows(img):
+        lines.append(''.join([
+            f"\033[38;2;{dec[r]};{dec[g]};{dec[b]}m{table[r + g + b]}{RESET}"
+            for r, g, b in zip(reds, greens, blues)
+        ]))
+    return lines
+
+def render_rows(img, ascii_chars=DETAILED_RAMP, quantize=0, depth=TRUECOLOR):
+    """Render an RGB image to colored ASCII lines with run-length color encoding
+
+    An escape is only written when the color changes; spaces never change it
+    since their foreground is not drawn. quantize snaps true colors to buckets
+    so neighbouring cells share longer runs; 256/16 color depths map through
+    the palette lookup tables instead.
+    """
+    table = glyph_table(ascii_chars)
+    if depth == MONO:
+        return [''.join([table[r + g + b] for r, g, b in zip(reds, greens, blues)])
+                for reds, greens, blues in iter_pixel_rows(img)]
+    if depth != TRUECOLOR:
+        return _render_rows_palette(img, table, palette(depth))
+
+    dec = _DEC
+    snap = quantize_table(quantize) if quantize > 1 else None
+    lines = []
+    for reds, greens, blues in iter_pixel_rows(img):
+        # Glyphs come from the exact brightness, colors from the (optionally) snapped channels
+        if snap:
+            color_rows = (reds.translate(snap), greens.translate(snap), blues.translate(snap))
+        else:
+            color_rows = (reds, greens, blues)
+        parts = []
+        prev = -1
+        for r, g, b, cr, cg, cb in zip(reds, greens, blues, *color_rows):
+            glyph = table[r + g + b]
+            if glyph != ' ':
+                color = (cr << 16) | (cg << 8) | cb
+                if color != prev:
+                    parts.append(f"\033[38;2;{dec[cr]};{dec[cg]};{dec[cb]}m")
+                    prev = color
+            parts.append(glyph)
+        if prev != -1:
+            parts.append(RESET)
+        lines.append(''.join(parts))
+    return lines
+
+def _render_rows_palette(img, table, pal):
+    """Run-length encoded rows for an indexed (256 or 16 color) palette"""
+    fg = pal.fg
+    lines = []
+    for reds, greens, blues in iter_pixel_rows(img):
+        parts = []
+        prev = -1
+        for r, g, b, index in zip(reds, greens, blues, pal.index_row(reds, greens, blues)):
+            glyph = table[r + g + b]
+            if glyph != ' ' and index != prev:
+                parts.append(fg[index])
+                prev = index
+            parts.append(glyph)
+        if prev != -1:
+            parts.append(RESET)
+        lines.append(''.join(parts))
+    return lines
+
+def _color_keys(reds, greens, blues, depth, snap):
+    """Per-pixel color keys for a row: packed RGB for truecolor, palette indices otherwise"""
+    if depth == TRUECOLOR:
+        if snap:
+            reds, greens, blues = reds.translate(snap), greens.translate(snap), blues.translate(snap)
+        return [(r << 16) | (g << 8) | b for r, g, b in zip(reds, greens, blues)]
+    return palette(depth).index_row(reds, greens, blues)
+
+def _escapes(depth):
+    """Return (foreground, background) functions turning a color key into an escape"""
+    if depth == TRUECOLOR:
+        dec = _DEC
+        fg = lambda key: f"\033[38;2;{dec[key >> 16]};{dec[(key >> 8) & 255]};{dec[key & 255]}m"
+        bg = lambda key: f"\033[48;2;{dec[key >> 16]};{dec[(key >> 8) & 255]};{dec[key & 255]}m"
+        return fg, bg
+    pal = palette(depth)
+    return pal.fg.__getitem__, pal.bg.__getitem__
+
+def foreground(depth):
+    """Return a function turning a color key into a foreground escape, or None for no color"""
+    return None if depth == MONO else _escapes(depth)[0]
+
+def cell_rows(img, ascii_chars=DETAILED_RAMP, depth=TRUECOLOR):
+    """Yield (glyphs, color keys) for each row of an RGB image
+
+    Spaces get key -1 since their color is never drawn, so two cells compare
+    equal exactly when they look the same on screen.
+    """
+    table = glyph_table(ascii_chars)
+    for reds, greens, blues in iter_pixel_rows(img):
+        glyphs = [table[r + g + b] for r, g, b in zip(reds, greens, blues)]
+        if depth == MONO:
+            keys = [0] * len(glyphs)
+        else:
+            keys = [-1 if glyph == ' ' else key for glyph, key in zip(glyphs, _color_keys(reds, greens, blues, depth, None))]
+        yield glyphs, keys
+
+def render_halfblock_rows(img, quantize=0, depth=TRUECOLOR):
+    """Render two vertical pixels per cell as ▀ with the top pixel as foreground and the bottom as background"""
+    fg, bg = _escapes(depth)
+    snap = quantize_table(quantize) if quantize > 1 else None
+    rows = list(iter_pixel_rows(img))
+    if len(rows) % 2:
+        rows.append(rows[-1])
+    lines = []
+    for top, bottom in zip(rows[0::2], rows[1::2]):
+        parts = []
+        prev_fg = prev_bg = -1
+        for upper, lower in zip(_color_keys(*top, depth, snap), _color_keys(*bottom, depth, snap)):
+            if upper == lower:
+                # Both halves match: a background-colored space leaves the foreground run intact
+                if lower != prev_bg:
+                    parts.append(bg(lower))
+                    prev_bg = lower
+                parts.append(' ')
+                continue
+            if upper != prev_fg:
+                parts.append(fg(upper))
+                prev_fg = upper
+            if lower != prev_bg:
+                parts.append(bg(lower))
+                prev_bg = lower
+            parts.append(UPPER_HALF)
+        # Reset before the newline so the background does not bleed into the next line
+        parts.append(RESET)
+        lines.append(''.join(parts))
+    return lines
+
+def braille_threshold(gray):
+    """Mean brightness of a grayscale image; brighter pixels become raised dots"""
+    histogram = gray.histogram()
+    return sum(value * count for value, count in enumerate(histogram)) / max(1, sum(histogram))
+
+def render_braille_rows(img, quantize=0, depth=TRUECOLOR, threshold=None):
+    """Render 2x4 pixel blocks as braille dots, colored with the block's average color"""
+    gray = img.convert('L')
+    if threshold is None:
+        threshold = braille_threshold(gray)
+    # One translate table per dot position: lit pixels become that dot's bit, dark ones 0
+    dot_tables = [[bytes(bit if v > threshold else 0 for v in range(256)) for bit in column]
+                  for column in _BRAILLE_BITS]
+
+    cells = img.reduce((2, 4)) if hasattr(img, 'reduce') else img.resize((img.width // 2, img.height // 4))
+    fg = None if depth == MONO else _escapes(depth)[0]
+    snap = quantize_table(quantize) if quantize > 1 else None
+
+    buf = gray.tobytes()
+    stride = gray.width
+    lines = []
+    for cell_row, color_row in enumerate(iter_pixel_rows(cells)):
+        base = cell_row * 4 * stride
+        planes = []
+        for dy in range(4):
+            row = buf[base + dy * stride:base + (dy + 1) * stride]
+            planes.append(row[0::2].translate(dot_tables[0][dy]))
+            planes.append(row[1::2].translate(dot_tables[1][dy]))
+        glyphs = [_BRAILLE[sum(bits)] for bits in zip(*planes)]
+        if fg is None:
+            lines.append(''.join(glyphs))
+            continue
+        parts = []
+        prev = -1
+        for glyph, key in zip(glyphs, _color_keys(*color_row, depth, snap)):
+            if glyph != ' ' and key != prev:
+                parts.append(fg(key))
+                prev = key
+            parts.append(glyph)
+        if prev != -1:
+            parts.append(RESET)
+        lines.append(''.join(parts))
+    return lines
+
+def stream_rows(image_path, width=100, aspect=0.45, ascii_chars=DETAILED_RAMP, quantize=0, depth=TRUECOLOR, mode=ASCII, strip_cells=STRIP_CELLS):
+    """Yield the lines of render_image (from a path or an opened image) one strip at a time
+
+    Memory stays at the shrink-on-load frame plus one strip, and the first
+    lines are ready before the rest of the image has been resampled.
+    """
+    x_scale, y_scale = {BRAILLE: (2, 4), HALFBLOCK: (1, 2)}.get(mode, (1, 1))
+    # Half blocks need color; monochrome terminals get the glyph ramp instead
+    if mode == HALFBLOCK and depth == MONO:
+        mode, y_scale = ASCII, 1
+    img, size = open_reduced(image_path, width, aspect, x_scale, y_scale)
+    # One dot threshold for the whole image, not one per strip
+    threshold = braille_threshold(img.convert('L')) if mode == BRAILLE else None
+    for strip in iter_strips(img, size, strip_cells, y_scale):
+        if mode == BRAILLE:
+            yield from render_braille_rows(strip, quantize, depth, threshold)
+        elif mode == HALFBLOCK:
+            yield from render_halfblock_rows(strip, quantize, depth)
+        else:
+            yield from render_rows(strip, ascii_chars, quantize, depth)
+
+def render_image(image_path, width=100, aspect=0.45, ascii_chars=DETAILED_RAMP, quantize=0, depth=TRUECOLOR, mode=ASCII):
+    """Convert an image file to colored ASCII, half-block or braille art"""
+    from PIL import Image
+
+    # Opened once: the header decides between the two paths, which then decode from it
+    with Image.open(image_path) as source:
+        # Posters and scans stream through shrink-on-load instead of a full-frame resize
+        if source.width * source.height > STREAM_PIXELS:
+            return '\n'.join(stream_rows(source, width, aspect, ascii_chars, quantize, depth, mode))
+        if mode == BRAILLE:
+            img = load_image(source, width, aspect, x_scale=2, y_scale=4)
+            return '\n'.join(render_braille_rows(img, quantize, depth))
+        # Half blocks need color; monochrome terminals get the glyph ramp instead
+        if mode == HALFBLOCK and depth != MONO:
+            img = load_image(source, width, aspect, y_scale=2)
+            return '\n'.join(render_halfblock_rows(img, quantize, depth))
+        img = load_image(source, width, aspect)
+        return '\n'.join(render_rows(img, ascii_chars, quantize, depth))
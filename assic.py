@@ -1,37 +1,191 @@
+"""
+Image to ASCII Converter
+With no arguments prints IMAGE_PATH as ASCII art. Given files, globs or
+directories it converts every image on a process pool into a plain .txt and
+a colored .ans file, and records them in a manifest so unchanged images are
+skipped on the next run.
+Usage: python assic.py [inputs ...] [-o DIR] [--width N] [--jobs N] [--force]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from PIL import Image
 
+from ascii_render import glyph_table, iter_strips, open_reduced, render_rows
+from banner_cache import image_digest
+
 # change filename if needed
 IMAGE_PATH = "dragon.png"
 
 ASCII_CHARS = "@%#*+=-:. "
 
-def resize_image(image, new_width=120):
-    width, height = image.size
-    ratio = height / width
-    new_height = int(new_width * ratio * 0.55)
-    return image.resize((new_width, new_height))
+# ascii_render picks ramp[last - level], so the ramp is reversed to keep dark pixels as '@' in the .ans too
+ANSI_RAMP = list(reversed(ASCII_CHARS))
 
-def grayify(image):
-    return image.convert("L")
+# Inputs are local files picked by the user and shrink on load, so posters past
+# Pillow's decompression-bomb limit are fine (set at import so pool workers see it too)
+Image.MAX_IMAGE_PIXELS = None
 
-def pixels_to_ascii(image):
-    pixels = image.getdata()
-    return "".join(ASCII_CHARS[pixel // 25] for pixel in pixels)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp')
+MANIFEST_NAME = 'manifest.json'
 
-def main():
-    image = Image.open(IMAGE_PATH)
-    image = resize_image(image)
-    image = grayify(image)
+# Bump when the output format changes so every image is converted again
+CONVERT_VERSION = 3
+
+def pixels_to_ascii(image):
+    """One ASCII_CHARS glyph per pixel of an RGB image, picked exactly as the .ans output picks it"""
+    table = glyph_table(ANSI_RAMP)
+    pixels = image.tobytes()
+    return "".join(table[pixels[i] + pixels[i + 1] + pixels[i + 2]] for i in range(0, len(pixels), 3))
 
+def image_to_text(image):
+    """Turn an RGB image into lines of ASCII_CHARS"""
     ascii_str = pixels_to_ascii(image)
     width = image.width
-
-    ascii_img = "\n".join(
+    return "\n".join(
         ascii_str[i:(i+width)]
         for i in range(0, len(ascii_str), width)
     )
 
-    print(ascii_img)
+def iter_strips_for(path, width=120, aspect=0.55):
+    """Open an image with shrink-on-load and yield it resized, a strip of rows at a time"""
+    img, size = open_reduced(path, width, aspect)
+    return iter_strips(img, size)
+
+def expand_inputs(patterns):
+    """Resolve files, globs and directories to a sorted list of image paths"""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                paths.update(os.path.join(root, name) for name in files if name.lower().endswith(IMAGE_EXTENSIONS))
+        elif any(c in pattern for c in '*?['):
+            paths.update(path for path in glob.glob(pattern, recursive=True)
+                         if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS))
+        elif os.path.isfile(pattern):
+            paths.add(pattern)
+        else:
+            print(f"warning: no such file or directory: {pattern}", file=sys.stderr)
+    return sorted(os.path.normpath(path) for path in paths)
+
+def output_stems(paths, entries):
+    """Pick an output file stem per input; a stem already used by another source gets a path hash appended"""
+    owners = {entry['stem']: source for source, entry in entries.items()}
+    stems = {}
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if owners.get(stem, path) != path:
+            stem = f"{stem}-{hashlib.sha1(path.encode('utf-8')).hexdigest()[:8]}"
+        owners[stem] = path
+        stems[path] = stem
+    return stems
+
+def settings_key(width, aspect):
+    return f"{CONVERT_VERSION}:{width}:{aspect!r}:{ASCII_CHARS}"
+
+def convert_file(path, stem, out_dir, width, aspect):
+    """Worker: render one image to <stem>.txt and <stem>.ans; returns its manifest entry"""
+    rows = 0
+    with open(os.path.join(out_dir, stem + '.txt'), 'w', encoding='utf-8', newline='\n') as txt, \
+         open(os.path.join(out_dir, stem + '.ans'), 'w', encoding='utf-8', newline='\n') as ans:
+        # Each strip is written as soon as it is rendered, so a poster never sits in memory as text
+        for strip in iter_strips_for(path, width, aspect):
+            txt.write(image_to_text(strip) + '\n')
+            ans.write('\n'.join(render_rows(strip, ANSI_RAMP)) + '\n')
+            rows += strip.height
+    return {'stem': stem, 'columns': width, 'rows': rows}
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f).get('images', {})
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(out_dir, entries):
+    """Write the manifest atomically so an interrupted run never leaves it half written"""
+    import tempfile
+
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'version': CONVERT_VERSION, 'images': entries}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+
+def is_current(entry, digest, settings, out_dir):
+    """True when an entry was built from these exact bytes and settings and its outputs still exist"""
+    return (
+        entry is not None
+        and entry.get('hash') == digest
+        and entry.get('settings') == settings
+        and all(os.path.exists(os.path.join(out_dir, entry['stem'] + suffix)) for suffix in ('.txt', '.ans'))
+    )
+
+def convert_batch(patterns, out_dir, width=120, aspect=0.55, jobs=None, force=False):
+    """Convert every matching image; returns (converted, skipped, failed) path lists"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = expand_inputs(patterns)
+    entries = load_manifest(out_dir)
+    settings = settings_key(width, aspect)
+    stems = output_stems(paths, entries)
+
+    # Hash up front in this process; only changed images are sent to the pool
+    todo = []
+    skipped = []
+    for path in paths:
+        digest = image_digest(path)
+        if not force and is_current(entries.get(path), digest, settings, out_dir):
+            skipped.append(path)
+        else:
+            todo.append((path, digest))
+
+    converted = []
+    failed = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(convert_file, path, stems[path], out_dir, width, aspect): (path, digest)
+                for path, digest in todo
+            }
+            for future in as_completed(futures):
+                path, digest = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    print(f"failed: {path}: {e}", file=sys.stderr)
+                    failed.append(path)
+                    continue
+                entry.update(hash=digest, settings=settings)
+                entries[path] = entry
+                converted.append(path)
+                print(f"  {path} -> {entry['stem']}.txt, {entry['stem']}.ans")
+        save_manifest(out_dir, entries)
+    return converted, skipped, failed
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert images to ASCII art (.txt) and colored ANSI art (.ans)')
+    parser.add_argument('inputs', nargs='*', help='image files, globs or directories (default: print IMAGE_PATH)')
+    parser.add_argument('-o', '--output', default='ascii-out', help='output directory (default: ascii-out)')
+    parser.add_argument('--width', type=int, default=120, help='columns per line (default: 120)')
+    parser.add_argument('--aspect', type=float, default=0.55, help='row/column squash factor (default: 0.55)')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='convert even when the manifest says an output is current')
+    args = parser.parse_args()
+
+    if not args.inputs:
+        for strip in iter_strips_for(IMAGE_PATH, args.width, args.aspect):
+            print(image_to_text(strip), flush=True)
+        return
+
+    converted, skipped, failed = convert_batch(args.inputs, args.output, args.width, args.aspect, args.jobs, args.force)
+    print(f"Converted {len(converted)}, skipped {len(skipped)} unchanged, {len(failed)} failed -> {args.output}")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,179 @@
+"""
+Animated Banners
+Converts animated GIF / APNG banners once into a first frame plus per-frame
+ANSI deltas that rewrite only the cells that changed, caches them on disk
+next to the static banners, and plays them back at the source frame rate.
+"""
+
+import sys
+
+import animation
+import banner_cache
+from ascii_render import DETAILED_RAMP, RESET, cell_rows, foreground
+from term_caps import TRUECOLOR, terminal_size
+
+HIDE_CURSOR = '\033[?25l'
+SHOW_CURSOR = '\033[?25h'
+
+# Frames separated in the cache blob by an ASCII record separator
+FRAME_SEPARATOR = '\x1e'
+
+# Unchanged cells between two changed spans are rewritten when that is cheaper than a cursor move
+MERGE_GAP = 6
+
+# GIFs with no (or a near-zero) frame duration play at 10 fps, like browsers do
+DEFAULT_DURATION = 100
+
+def _span(glyphs, keys, start, end, fg):
+    """Cells start..end of a row with run-length color; ends reset so nothing leaks past it"""
+    if fg is None:
+        return ''.join(glyphs[start:end])
+    parts = []
+    prev = -1
+    for glyph, key in zip(glyphs[start:end], keys[start:end]):
+        if key != -1 and key != prev:
+            parts.append(fg(key))
+            prev = key
+        parts.append(glyph)
+    if prev != -1:
+        parts.append(RESET)
+    return ''.join(parts)
+
+def _changed_spans(old, new):
+    """Yield (start, end) column ranges where two rows differ, merging spans separated by short gaps"""
+    old_glyphs, old_keys = old
+    new_glyphs, new_keys = new
+    start = end = None
+    for col, (a, b, c, d) in enumerate(zip(old_glyphs, new_glyphs, old_keys, new_keys)):
+        if a == b and c == d:
+            continue
+        if start is not None and col - end > MERGE_GAP:
+            yield start, end
+            start = None
+        if start is None:
+            start = col
+        end = col + 1
+    if start is not None:
+        yield start, end
+
+def delta(old_rows, new_rows, fg):
+    """Escape sequence turning old_rows into new_rows on screen
+
+    Starts and ends with the cursor in column 1 of the line below the banner,
+    moving relative to it so the banner can sit anywhere in the scrollback.
+    """
+    height = len(new_rows)
+    parts = []
+    row_at = height
+    for row, (old, new) in enumerate(zip(old_rows, new_rows)):
+        for start, end in _changed_spans(old, new):
+            if row != row_at:
+                parts.append(f'\033[{row_at - row}A' if row < row_at else f'\033[{row - row_at}B')
+                row_at = row
+            parts.append(f'\033[{start + 1}G')
+            parts.append(_span(*new, start, end, fg))
+    if not parts:
+        return ''
+    parts.append(f'\033[{height - row_at}B\r' if row_at < height else '\r')
+    return ''.join(parts)
+
+def encode(image_path, width=100, aspect=0.45, ascii_chars=DETAILED_RAMP, depth=TRUECOLOR):
+    """Render an animation to its cache blob: a line of frame durations, then the frames
+
+    The first frame is drawn in full; every later one is a delta from the
+    frame before, so only one decoded frame is held at a time. A still image
+    encodes to an empty durations line.
+    """
+    from PIL import Image, ImageSequence
+
+    img = Image.open(image_path)
+    if not getattr(img, 'is_animated', False):
+        return '\n'
+    height = max(1, int(width * (img.height / img.width) * aspect))
+    fg = foreground(depth)
+
+    durations = []
+    frames = []
+    previous = None
+    for frame in ImageSequence.Iterator(img):
+        rows = list(cell_rows(frame.convert('RGB').resize((width, height)), ascii_chars, depth))
+        if previous is None:
+            frames.append(''.join(_span(*row, 0, width, fg) + '\n' for row in rows))
+        else:
+            frames.append(delta(previous, rows, fg))
+        duration = frame.info.get('duration') or 0
+        durations.append(duration if duration > 10 else DEFAULT_DURATION)
+        previous = rows
+    return ','.join(str(int(duration)) for duration in durations) + '\n' + FRAME_SEPARATOR.join(frames)
+
+class Playback:
+    """Effect playing a cached animation: the first frame, then each delta after its frame's duration"""
+
+    # Every delta builds on the one before, so none may be dropped
+    droppable = False
+
+    def __init__(self, blob):
+        header, _, body = blob.partition('\n')
+        self.durations = [int(value) / 1000 for value in header.split(',')]
+        self.deltas = body.split(FRAME_SEPARATOR)
+        self.height = self.deltas[0].count('\n')
+        self.interval = 0
+        self.started = False
+        self.done = False
+
+    def frames(self):
+        self.started = True
+        for index, frame in enumerate(self.deltas):
+            if self.done:
+                return
+            self.interval = self.durations[index]
+            yield (HIDE_CURSOR + frame) if index == 0 else frame
+        self.interval = 0
+        self.done = True
+        yield SHOW_CURSOR
+
+    def skip(self):
+        """Stop on the frame showing now; before the first frame, just draw that"""
+        if self.done:
+            return ''
+        self.done = True
+        return SHOW_CURSOR if self.started else self.deltas[0]
+
+    def cancel(self):
+        return self.skip()
+
+def decode(blob):
+    """Return a Playback for a cache blob, or None when the image is not animated"""
+    if not blob or blob.startswith('\n'):
+        return None
+    return Playback(blob)
+
+def can_animate(out, height):
+    """Cursor moves need a terminal (or a served session) tall enough to keep the whole banner on screen"""
+    if not getattr(out, 'skip_frame', None):
+        try:
+            if not out.isatty():
+                return False
+        except (AttributeError, ValueError):
+            return False
+    return height < terminal_size().lines
+
+def play_banner(image_path, width, aspect, ascii_chars, depth, lazy=False):
+    """Play an animated banner; returns False when the image is not animated (or not ready) so the caller draws it still"""
+    mode = f'anim-{depth}'
+    render = lambda: encode(image_path, width, aspect, ascii_chars, depth)
+    try:
+        if lazy:
+            # Never block on Pillow: play from the cache, or build it in the background for next time
+            blob = banner_cache.peek(image_path, width, aspect, ascii_chars, mode)
+            if blob is None:
+                banner_cache.warm_in_background(image_path, width, aspect, ascii_chars, render, mode)
+        else:
+            blob = banner_cache.cached_render(image_path, width, aspect, ascii_chars, render, mode)
+    except Exception:
+        return False
+    playback = decode(blob)
+    if playback is None:
+        return False
+    animation.play(playback, animate=can_animate(sys.stdout, playback.height))
+    return True
@@ -0,0 +1,167 @@
+"""
+Persistent Banner Render Cache
+Stores finished ANSI banners on disk, keyed by the image contents and the
+render settings, so a repeat banner is a file read instead of a PIL render
+"""
+
+import hashlib
+import os
+import threading
+
+# Bump when the renderer output changes so old entries stop matching
+CACHE_VERSION = 2
+
+# LRU size cap for the whole cache directory
+MAX_CACHE_BYTES = 8 * 1024 * 1024
+
+CACHE_SUFFIX = '.ans'
+
+# (path, mtime_ns, size) -> content digest, so unchanged images are hashed once per process
+_digests = {}
+
+def cache_dir():
+    """Return the directory holding rendered banners"""
+    override = os.environ.get('PORTFOLIO_CACHE_DIR')
+    if override:
+        return override
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'terminal-portfolio')
+
+def image_digest(image_path):
+    """Return a SHA-256 digest of the image file contents"""
+    st = os.stat(image_path)
+    stamp = (os.path.abspath(image_path), st.st_mtime_ns, st.st_size)
+    digest = _digests.get(stamp)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _digests[stamp] = digest
+    return digest
+
+def cache_key(image_path, width, aspect, ascii_chars, mode='ascii'):
+    """Build the cache key for one image rendered with one set of settings"""
+    parts = [
+        str(CACHE_VERSION),
+        image_digest(image_path),
+        str(width),
+        repr(float(aspect)),
+        ''.join(ascii_chars),
+        mode,
+    ]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+def load(key):
+    """Return the cached blob for a key, or None on a miss"""
+    path = os.path.join(cache_dir(), key + CACHE_SUFFIX)
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            blob = f.read()
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+    except OSError:
+        return None
+    return blob
+
+def store(key, blob):
+    """Write a blob to the cache atomically, then trim the cache to its size cap"""
+    # tempfile pulls in shutil and random; only pay for it when actually writing
+    import tempfile
+
+    directory = cache_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(blob)
+        os.replace(tmp_path, os.path.join(directory, key + CACHE_SUFFIX))
+    except OSError:
+        # A read-only or full cache directory just means no caching
+        return
+    evict(directory)
+
+def evict(directory=None, max_bytes=MAX_CACHE_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes"""
+    directory = directory or cache_dir()
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+def cached_render(image_path, width, aspect, ascii_chars, render, mode='ascii'):
+    """Return a rendered banner from the cache, calling render() only on a miss"""
+    key = cache_key(image_path, width, aspect, ascii_chars, mode)
+    blob = load(key)
+    if blob is None:
+        blob = render()
+        if blob:
+            store(key, blob)
+    return blob
+
+def peek(image_path, width, aspect, ascii_chars, mode='ascii'):
+    """Return a cached banner without ever rendering, or None on a miss"""
+    try:
+        return load(cache_key(image_path, width, aspect, ascii_chars, mode))
+    except OSError:
+        return None
+
+# Image path -> (worker thread, {cache key: render} still to do, the running one included)
+_warming = {}
+_warming_lock = threading.Lock()
+
+def _warm(image_path, jobs):
+    """Thread body for warm_in_background: render an image's queued banners one after another"""
+    while True:
+        with _warming_lock:
+            if not jobs:
+                del _warming[image_path]
+                return
+            key, render = next(iter(jobs.items()))
+        try:
+            if load(key) is None:
+                blob = render()
+                if blob:
+                    store(key, blob)
+        except Exception:
+            # Pillow missing or a bad image; the text banner stays in use
+            pass
+        with _warming_lock:
+            del jobs[key]
+
+def warm_in_background(image_path, width, aspect, ascii_chars, render, mode='ascii'):
+    """Import Pillow and render a banner into the cache on a daemon thread
+
+    Each image gets at most one warm thread, and a key already queued or
+    rendering is not queued again, so the still and animated banners of one
+    image are decoded one after the other instead of at the same time.
+    """
+    key = cache_key(image_path, width, aspect, ascii_chars, mode)
+    image_path = os.path.abspath(image_path)
+    with _warming_lock:
+        running = _warming.get(image_path)
+        if running is not None:
+            thread, jobs = running
+            jobs.setdefault(key, render)
+            return thread
+        jobs = {key: render}
+        thread = threading.Thread(target=_warm, args=(image_path, jobs), name='banner-warm', daemon=True)
+        _warming[image_path] = (thread, jobs)
+    thread.start()
+    return thread
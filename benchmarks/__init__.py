@@ -0,0 +1 @@
+"""Benchmarks for the terminal portfolio (run with `python -m benchmarks.<name>`)"""
@@ -0,0 +1,72 @@
+"""
+Benchmark: command completion lookups
+Compares the old linear startswith scan with the sorted prefix index used for
+TAB completion and "Did you mean", and a full edit-distance scan with the
+BK-tree used for typo matching, over command tables of growing size.
+Run from the repository root with: python -m benchmarks.bench_completion
+"""
+
+import random
+import string
+import time
+
+from completion import PrefixIndex, BKTree, edit_distance
+
+def linear_suggestions(names, partial):
+    """The previous get_suggestions: scan every name"""
+    return [cmd for cmd in names if cmd.startswith(partial.lower())]
+
+def linear_fuzzy(names, word, max_distance=2):
+    """Edit distance against every name"""
+    found = [(name, edit_distance(word, name)) for name in names]
+    return sorted((item for item in found if item[1] <= max_distance), key=lambda item: (item[1], item[0]))
+
+def typo(word, rng):
+    """Drop, double or swap one character"""
+    i = rng.randrange(len(word))
+    return rng.choice((word[:i] + word[i + 1:], word[:i] + word[i] + word[i:], word[:i] + 'x' + word[i + 1:]))
+
+def make_names(count, rng):
+    letters = string.ascii_lowercase
+    names = set()
+    while len(names) < count:
+        names.add(''.join(rng.choice(letters) for _ in range(rng.randint(3, 12))))
+    return list(names)
+
+def timed(func, queries, repeat):
+    began = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            func(query)
+    return (time.perf_counter() - began) / (repeat * len(queries)) * 1e6
+
+def main():
+    rng = random.Random(42)
+    print(f"{'entries':>8} {'linear us':>10} {'index us':>10} {'speedup':>8}")
+    for count in (20, 200, 2000, 20000):
+        names = make_names(count, rng)
+        index = PrefixIndex(names)
+        # Typical keystrokes: 1-3 character prefixes of real entries
+        queries = [rng.choice(names)[:rng.randint(1, 3)] for _ in range(200)]
+        for query in queries:
+            assert index.complete(query) == sorted(linear_suggestions(names, query))
+        repeat = max(1, 20000 // count)
+        linear = timed(lambda q: linear_suggestions(names, q), queries, repeat)
+        indexed = timed(index.complete, queries, repeat)
+        print(f"{count:>8} {linear:>10.2f} {indexed:>10.2f} {linear / indexed:>7.1f}x")
+
+    print()
+    print(f"{'entries':>8} {'scan us':>10} {'bk-tree us':>10} {'speedup':>8}")
+    for count in (20, 200, 2000, 20000):
+        names = make_names(count, rng)
+        tree = BKTree(names)
+        queries = [typo(rng.choice(names), rng) for _ in range(50)]
+        for query in queries[:10]:
+            assert tree.search(query, 2) == linear_fuzzy(names, query)
+        repeat = max(1, 2000 // count)
+        scan = timed(lambda q: linear_fuzzy(names, q), queries, repeat)
+        indexed = timed(lambda q: tree.search(q, 2), queries, repeat)
+        print(f"{count:>8} {scan:>10.0f} {indexed:>10.0f} {scan / indexed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
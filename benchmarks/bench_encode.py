@@ -0,0 +1,72 @@
+"""
+Benchmark: bytes per banner frame for each ANSI color encoding
+Compares the per-cell escape format with run-length color encoding, with and
+without color quantization and at each palette depth, and checks the lossless encoding draws the same cells.
+Run from the repository root with: python -m benchmarks.bench_encode [image]
+"""
+
+import os
+import re
+import sys
+
+from ascii_render import DETAILED_RAMP, RENDER_MODES, load_image, render_image, render_rows, render_rows_per_cell
+from term_caps import TRUECOLOR, COLOR_256, COLOR_16, MONO
+
+IMAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Charliee.png')
+WIDTHS = [60, 100, 200]
+QUANTIZE_STEPS = [8, 16, 32]
+DEPTHS = [COLOR_256, COLOR_16, MONO]
+
+SGR = re.compile(r'\033\[([0-9;]*)m')
+
+def screen_cells(lines):
+    """Replay SGR escapes and return the (color, glyph) drawn in every visible cell"""
+    cells = []
+    for line in lines:
+        color = None
+        row = []
+        pos = 0
+        for match in SGR.finditer(line):
+            for glyph in line[pos:match.start()]:
+                row.append((color, glyph) if glyph != ' ' else (None, ' '))
+            params = match.group(1)
+            color = None if params in ('', '0') else params
+            pos = match.end()
+        for glyph in line[pos:]:
+            row.append((color, glyph) if glyph != ' ' else (None, ' '))
+        cells.append(row)
+    return cells
+
+def frame_bytes(lines):
+    return len('\n'.join(lines).encode('utf-8'))
+
+def main():
+    image_path = sys.argv[1] if len(sys.argv) > 1 else IMAGE_PATH
+    header = f"{'width':>6} {'glyphs':>8} {'per-cell':>10} {'rle':>10}"
+    header += ''.join(f" {'rle q' + str(step):>10}" for step in QUANTIZE_STEPS)
+    header += ''.join(f" {depth:>8}" for depth in DEPTHS)
+    print(header + "   (bytes per frame)")
+    for width in WIDTHS:
+        img = load_image(image_path, width)
+        per_cell = render_rows_per_cell(img, DETAILED_RAMP)
+        rle = render_rows(img, DETAILED_RAMP)
+        assert screen_cells(per_cell) == screen_cells(rle), f"RLE output differs on screen at width {width}"
+
+        glyphs = img.width * img.height
+        row = f"{width:>6} {glyphs:>8} {frame_bytes(per_cell):>10} {frame_bytes(rle):>10}"
+        for step in QUANTIZE_STEPS:
+            row += f" {frame_bytes(render_rows(img, DETAILED_RAMP, step)):>10}"
+        for depth in DEPTHS:
+            row += f" {frame_bytes(render_rows(img, DETAILED_RAMP, depth=depth)):>8}"
+        print(row)
+
+    print(f"\n{'mode':>10} {'width':>6}" + ''.join(f" {depth:>10}" for depth in (TRUECOLOR,) + tuple(DEPTHS)) + "   (bytes per frame)")
+    for mode in RENDER_MODES:
+        for width in WIDTHS:
+            row = f"{mode:>10} {width:>6}"
+            for depth in (TRUECOLOR,) + tuple(DEPTHS):
+                row += f" {len(render_image(image_path, width, depth=depth, mode=mode).encode('utf-8')):>10}"
+            print(row)
+
+if __name__ == "__main__":
+    main()
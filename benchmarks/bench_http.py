@@ -0,0 +1,109 @@
+"""
+Benchmark: web terminal HTTP server
+Starts `portfolio_enhanced.py --http` on a loopback port and has many
+keep-alive clients fetch the page (brotli/gzip), revalidate it with
+If-None-Match, and fetch the banner image, reporting requests/sec and
+p50/p99 latency for each.
+Run from the repository root with: python -m benchmarks.bench_http [connections seconds]
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+def request(path, *headers):
+    lines = [f'GET {path} HTTP/1.1', 'Host: 127.0.0.1'] + list(headers)
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+async def fetch(reader, writer, data):
+    """Send one request and read the whole response; returns (status, headers, body length)"""
+    writer.write(data)
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0)) if status != 304 else 0
+    if length:
+        await reader.readexactly(length)
+    return status, headers, length
+
+async def client(port, data, until, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    sent = 0
+    try:
+        while time.perf_counter() < until:
+            began = time.perf_counter()
+            status, headers, length = await fetch(reader, writer, data)
+            latencies.append(time.perf_counter() - began)
+            sent += length
+    finally:
+        writer.close()
+    return sent
+
+async def scenario(port, data, connections, seconds):
+    latencies = []
+    began = time.perf_counter()
+    sizes = await asyncio.gather(*(client(port, data, began + seconds, latencies) for _ in range(connections)))
+    wall = time.perf_counter() - began
+    return len(latencies) / wall, percentile(latencies, 0.5), percentile(latencies, 0.99), sum(sizes) / max(1, len(latencies))
+
+async def run(port, connections, seconds):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    status, headers, length = await fetch(reader, writer, request('/', 'Accept-Encoding: br, gzip'))
+    writer.close()
+    scenarios = [
+        (f"page ({headers.get('content-encoding', 'identity')})", request('/', 'Accept-Encoding: br, gzip')),
+        ('page revalidated (304)', request('/', 'Accept-Encoding: br, gzip', f"If-None-Match: {headers['etag']}")),
+        ('page (identity)', request('/')),
+        ('banner png (sendfile)', request('/Charliee.png')),
+    ]
+    print(f"{connections} keep-alive connections, {seconds}s per scenario")
+    print(f"{'scenario':<26} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'bytes/req':>10}")
+    for name, data in scenarios:
+        rate, p50, p99, size = await scenario(port, data, connections, seconds)
+        print(f"{name:<26} {rate:>9.0f} {p50:>8.2f} {p99:>8.2f} {size:>10.0f}")
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('server did not start')
+
+def main():
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'portfolio_enhanced.py'), '--http', '--port', str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        asyncio.run(run(port, connections, seconds))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark: full-screen matrix rain frame cost
+Steps and renders the rain into a null sink without sleeping and reports
+frame times against the budget for the target FPS.
+Run from the repository root with: python -m benchmarks.bench_matrix [width height fps]
+"""
+
+import sys
+import time
+
+from matrix_rain import MatrixRain
+
+def main():
+    width, height, fps = 200, 60, 30
+    if len(sys.argv) == 4:
+        width, height, fps = (int(arg) for arg in sys.argv[1:])
+    rain = MatrixRain(width, height, fps=fps)
+
+    frames = 300
+    total_bytes = 0
+    times = []
+    for _ in range(frames):
+        began = time.perf_counter()
+        rain.step()
+        total_bytes += len(rain.render().encode('utf-8'))
+        times.append(time.perf_counter() - began)
+
+    times.sort()
+    budget_ms = 1000 / fps
+    mean_ms = sum(times) / frames * 1000
+    p95_ms = times[int(frames * 0.95)] * 1000
+    print(f"{width}x{height} @ {fps} FPS (budget {budget_ms:.1f} ms/frame)")
+    print(f"  mean frame  {mean_ms:7.2f} ms")
+    print(f"  p95 frame   {p95_ms:7.2f} ms")
+    print(f"  max FPS     {1000 / mean_ms:7.0f}")
+    print(f"  bytes/frame {total_bytes / frames:7.0f}")
+    print(f"  headroom    {'ok' if p95_ms < budget_ms else 'frames would be dropped'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: batched image_to_ascii renderer vs the original getpixel loop
+Run from the repository root with: python -m benchmarks.bench_render
+"""
+
+import os
+import sys
+import time
+
+from ascii_render import DETAILED_RAMP, load_image, render_rows, render_rows_per_cell
+
+IMAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Charliee.png')
+WIDTHS = [60, 100, 200, 400]
+
+def legacy_render(img, ascii_chars):
+    """The original per-pixel renderer, kept here as the baseline"""
+    ascii_art = []
+    for y in range(img.height):
+        line = ""
+        for x in range(img.width):
+            r, g, b = img.getpixel((x, y))
+            brightness = (r + g + b) / 3
+            char_index = int(brightness / 255 * (len(ascii_chars) - 1))
+            char = ascii_chars[len(ascii_chars) - 1 - char_index]
+            line += f"\033[38;2;{r};{g};{b}m{char}\033[0m"
+        ascii_art.append(line)
+    return '\n'.join(ascii_art)
+
+def best_of(func, repeat):
+    """Return the fastest wall-clock time of several runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    image_path = sys.argv[1] if len(sys.argv) > 1 else IMAGE_PATH
+    print(f"{'width':>6} {'cells':>8} {'legacy ms':>10} {'batched ms':>11} {'speedup':>8} {'rle ms':>8}")
+    for width in WIDTHS:
+        img = load_image(image_path, width)
+        legacy = legacy_render(img, DETAILED_RAMP)
+        batched = '\n'.join(render_rows_per_cell(img, DETAILED_RAMP))
+        assert legacy == batched, f"renderers disagree at width {width}"
+
+        repeat = 5 if width <= 200 else 3
+        legacy_ms = best_of(lambda: legacy_render(img, DETAILED_RAMP), repeat)
+        batched_ms = best_of(lambda: '\n'.join(render_rows_per_cell(img, DETAILED_RAMP)), repeat)
+        rle_ms = best_of(lambda: '\n'.join(render_rows(img, DETAILED_RAMP)), repeat)
+        cells = img.width * img.height
+        print(f"{width:>6} {cells:>8} {legacy_ms:>10.2f} {batched_ms:>11.2f} {legacy_ms / batched_ms:>7.1f}x {rle_ms:>8.2f}")
+
+if __name__ == "__main__":
+    main()
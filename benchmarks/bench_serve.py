@@ -0,0 +1,114 @@
+"""
+Benchmark: multi-visitor server load
+Starts `portfolio_enhanced.py --serve` on a loopback port, holds many idle
+telnet visitors open at once, then has a group of active visitors run
+commands, reporting time to prompt, command latency and server memory.
+Run from the repository root with: python -m benchmarks.bench_serve [idle active]
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT_MARKER = b'portfolio@terminal'
+COMMANDS = ['about', 'projects 2', 'contact', 'help', 'history']
+ROUNDS = 5
+
+# What a telnet client sends when asked for its window size: WILL NAWS, then 120x40
+NAWS_REPLY = bytes([255, 251, 31, 255, 250, 31, 0, 120, 0, 40, 255, 240])
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def server_rss_kb(pid):
+    """Resident memory of the server process (Linux only)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+async def read_prompt(reader):
+    """Read until the next prompt; returns the bytes read"""
+    seen = b''
+    while PROMPT_MARKER not in seen[-4096:]:
+        chunk = await reader.read(65536)
+        if not chunk:
+            raise ConnectionError('server closed the connection')
+        seen += chunk
+    return seen
+
+async def visitor(port, commands, connect_times, command_times):
+    began = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(NAWS_REPLY)
+    await read_prompt(reader)
+    connect_times.append(time.perf_counter() - began)
+    for command in commands:
+        began = time.perf_counter()
+        writer.write(command.encode() + b'\r\n')
+        await read_prompt(reader)
+        command_times.append(time.perf_counter() - began)
+    return reader, writer
+
+async def load(port, idle_count, active_count, pid):
+    connect_times = []
+    command_times = []
+    # Idle visitors connect, see the banner and sit at the prompt
+    began = time.perf_counter()
+    idle = await asyncio.gather(*(visitor(port, [], connect_times, []) for _ in range(idle_count)))
+    connect_wall = time.perf_counter() - began
+    # Active visitors run commands while the idle ones stay connected
+    began = time.perf_counter()
+    active = await asyncio.gather(*(visitor(port, COMMANDS * ROUNDS, [], command_times) for _ in range(active_count)))
+    active_wall = time.perf_counter() - began
+    rss = server_rss_kb(pid)
+    for reader, writer in idle + active:
+        writer.close()
+    return connect_times, connect_wall, command_times, active_wall, rss
+
+def main():
+    idle_count, active_count = 300, 50
+    if len(sys.argv) == 3:
+        idle_count, active_count = int(sys.argv[1]), int(sys.argv[2])
+    port = free_port()
+    env = dict(os.environ, TERM=os.environ.get('TERM', 'xterm-256color'))
+    proc = subprocess.Popen(
+        [sys.executable, 'portfolio_enhanced.py', '--serve', '--port', str(port), '--ssh-port', '0'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Wait for the listener
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', port), 0.2).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        base_rss = server_rss_kb(proc.pid)
+        connect_times, connect_wall, command_times, active_wall, loaded_rss = asyncio.run(load(port, idle_count, active_count, proc.pid))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    print(f"{idle_count} idle + {active_count} active visitors on one server process")
+    print(f"  welcome screen  p50 {percentile(connect_times, 0.5):7.1f} ms   p95 {percentile(connect_times, 0.95):7.1f} ms   ({idle_count / connect_wall:.0f} connects/s)")
+    print(f"  command         p50 {percentile(command_times, 0.5):7.1f} ms   p95 {percentile(command_times, 0.95):7.1f} ms   ({len(command_times) / active_wall:.0f} commands/s)")
+    if base_rss and loaded_rss:
+        print(f"  server RSS      {base_rss / 1024:.1f} MB idle -> {loaded_rss / 1024:.1f} MB loaded ({(loaded_rss - base_rss) / (idle_count + active_count):.0f} KB/visitor)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: portfolio cold start
+Reports `python -X importtime` totals and wall-clock time to first prompt
+for a cold cache, a warm cache and --fast-start.
+Run from the repository root with: python -m benchmarks.bench_startup [script]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT_MARKER = b'portfolio@terminal'
+RUNS = 5
+
+def run_env(cache_dir, fast=False):
+    """Environment for a child portfolio process"""
+    env = dict(os.environ, PORTFOLIO_CACHE_DIR=cache_dir, TERM=os.environ.get('TERM', 'dumb'))
+    env.pop('PORTFOLIO_FAST', None)
+    if fast:
+        env['PORTFOLIO_FAST'] = '1'
+    return env
+
+def time_to_prompt(script, env):
+    """Start the script and return seconds until its prompt reaches stdout"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, script],
+        cwd=ROOT, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    seen = b''
+    elapsed = None
+    while True:
+        chunk = os.read(proc.stdout.fileno(), 65536)
+        if not chunk:
+            break
+        seen = seen[-64:] + chunk
+        if PROMPT_MARKER in seen:
+            elapsed = time.perf_counter() - start
+            break
+    proc.stdin.write(b'exit\n')
+    proc.stdin.close()
+    proc.stdout.read()
+    proc.wait()
+    return elapsed
+
+def import_times(script, env, top=8):
+    """Run the script under -X importtime and return (total_us, slowest imports)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', script],
+        cwd=ROOT, env=env, input=b'exit\n',
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    rows = []
+    for line in result.stderr.decode('utf-8', 'replace').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    # Only top-level imports (a single space of indentation) add up to the total
+    total = sum(cumulative for cumulative, _, name in rows if not name.startswith('  '))
+    return total, sorted(rows, reverse=True)[:top]
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def main():
+    script = sys.argv[1] if len(sys.argv) > 1 else 'portfolio_enhanced.py'
+    cache_dir = tempfile.mkdtemp(prefix='portfolio-bench-')
+    try:
+        env = run_env(cache_dir)
+        total, slowest = import_times(script, env)
+        print(f"-X importtime ({script}): {total / 1000:.1f} ms total across top-level imports")
+        for cumulative, self_us, name in slowest:
+            print(f"  {cumulative / 1000:8.1f} ms cumulative  {self_us / 1000:7.1f} ms self  {name.strip()}")
+
+        print("\nTime to first prompt (median of %d runs):" % RUNS)
+        cases = [
+            ('cold cache', lambda: (shutil.rmtree(cache_dir, ignore_errors=True), run_env(cache_dir))[1]),
+            ('warm cache', lambda: run_env(cache_dir)),
+            ('fast start, cold cache', lambda: (shutil.rmtree(cache_dir, ignore_errors=True), run_env(cache_dir, fast=True))[1]),
+            ('fast start, warm cache', lambda: run_env(cache_dir, fast=True)),
+        ]
+        for label, make_env in cases:
+            samples = []
+            for _ in range(RUNS):
+                elapsed = time_to_prompt(script, make_env())
+                if elapsed is not None:
+                    samples.append(elapsed)
+            if samples:
+                print(f"  {label:<24} {median(samples) * 1000:8.1f} ms")
+            else:
+                print(f"  {label:<24}   no prompt seen")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
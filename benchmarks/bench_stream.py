@@ -0,0 +1,64 @@
+"""
+Benchmark: full-frame load_image + render_rows vs streaming stream_rows on a large poster
+Each run is a fresh subprocess so peak RSS (Linux /proc) belongs to that path alone.
+Run from the repository root with: python -m benchmarks.bench_stream [image]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, 'dragon.png')
+POSTER_SIZE = (16000, 10666)
+WIDTH = 120
+
+# Run in the child: render one way, report first-row latency, total time and peak RSS
+CHILD = '''
+import sys, time
+from PIL import Image
+Image.MAX_IMAGE_PIXELS = None
+from ascii_render import load_image, render_rows, stream_rows
+path, how, width = sys.argv[1], sys.argv[2], int(sys.argv[3])
+start = time.perf_counter()
+first = None
+if how == 'full':
+    rows = render_rows(load_image(path, width))
+    first = time.perf_counter() - start
+else:
+    for row in stream_rows(path, width):
+        if first is None:
+            first = time.perf_counter() - start
+total = time.perf_counter() - start
+# VmHWM is per address space, so unlike ru_maxrss it does not carry over from the parent through exec
+with open('/proc/self/status') as f:
+    peak = next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))
+print(first * 1000, total * 1000, peak / 1024)
+'''
+
+def make_posters(directory):
+    """Upscale the dragon to a poster-sized JPEG and PNG"""
+    from PIL import Image
+
+    img = Image.open(SOURCE).convert('RGB').resize(POSTER_SIZE)
+    paths = [os.path.join(directory, 'poster.jpg'), os.path.join(directory, 'poster.png')]
+    img.save(paths[0], quality=85)
+    img.save(paths[1], compress_level=1)
+    return paths
+
+def measure(path, how):
+    out = subprocess.run([sys.executable, '-c', CHILD, path, how, str(WIDTH)], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [float(value) for value in out.stdout.split()]
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        paths = sys.argv[1:] or make_posters(directory)
+        print(f"{'image':<12} {'path':<7} {'first row ms':>13} {'total ms':>9} {'peak MB':>8}")
+        for path in paths:
+            for how in ('full', 'stream'):
+                first, total, peak = measure(path, how)
+                print(f"{os.path.basename(path):<12} {how:<7} {first:>13.0f} {total:>9.0f} {peak:>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: WebSocket sessions
+Starts `portfolio_enhanced.py --http` on a loopback port and attaches many
+browser-like sessions at once through ws_client, each running commands,
+reporting time to prompt, command latency, output frames per command and
+server memory.
+Run from the repository root with: python -m benchmarks.bench_ws [sessions]
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_http import free_port, percentile, wait_for_port
+from benchmarks.bench_serve import server_rss_kb
+from ws_client import WebSocketClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = ['about', 'projects 2', 'contact', 'help', 'history']
+ROUNDS = 5
+
+class Counting(WebSocketClient):
+    """Client that counts the output frames it receives"""
+
+    frames = 0
+    size = 0
+
+    async def recv(self):
+        data = await super().recv()
+        if data is not None:
+            self.frames += 1
+            self.size += len(data)
+        return data
+
+async def session(url, connect_times, command_times, totals):
+    began = time.perf_counter()
+    client = await Counting.connect(url)
+    client.resize(120, 40)
+    await client.expect()
+    connect_times.append(time.perf_counter() - began)
+    frames, size = client.frames, client.size
+    for command in COMMANDS * ROUNDS:
+        began = time.perf_counter()
+        client.send_keys(command + '\r')
+        await client.expect()
+        command_times.append(time.perf_counter() - began)
+    totals.append((client.frames - frames, client.size - size))
+    await client.close()
+
+async def load(url, count, pid):
+    connect_times = []
+    command_times = []
+    totals = []
+    began = time.perf_counter()
+    await asyncio.gather(*(session(url, connect_times, command_times, totals) for _ in range(count)))
+    wall = time.perf_counter() - began
+    rss = server_rss_kb(pid)
+    commands = len(command_times)
+    frames = sum(frames for frames, size in totals)
+    size = sum(size for frames, size in totals)
+    print(f"{count} sessions x {len(COMMANDS) * ROUNDS} commands in {wall:.2f}s ({commands / wall:.0f} commands/s)")
+    print(f"time to prompt   p50 {percentile(connect_times, 0.5):7.1f} ms   p99 {percentile(connect_times, 0.99):7.1f} ms")
+    print(f"command latency  p50 {percentile(command_times, 0.5):7.1f} ms   p99 {percentile(command_times, 0.99):7.1f} ms")
+    print(f"output frames    {frames / commands:.1f} per command, {size / max(1, frames):.0f} bytes per frame")
+    if rss:
+        print(f"server RSS       {rss / 1024:.1f} MB")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'portfolio_enhanced.py'), '--http', '--port', str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        asyncio.run(load(f'ws://127.0.0.1:{port}/ws', count, proc.pid))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+if __name__ == '__main__':
+    main()
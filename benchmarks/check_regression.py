@@ -0,0 +1,67 @@
+"""
+Benchmark regression check
+Compares two benchmarks.suite result files metric by metric and exits with
+status 1 when any metric got worse than the baseline by more than the
+threshold (in percent). Metrics only in one file are listed, not failed.
+Run from the repository root with:
+    python -m benchmarks.check_regression baseline.json current.json [--threshold 10] [--only PREFIX ...]
+"""
+
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['metrics']
+
+def change(entry, base, current):
+    """Percent change, positive when the metric got worse"""
+    if base == 0:
+        return 0.0
+    delta = (current - base) / abs(base) * 100
+    return delta if entry['better'] == 'lower' else -delta
+
+def compare(baseline, current, threshold, only=()):
+    """Return (rows, regressions); rows are (name, base, current, unit, worse %, status)"""
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline) | set(current)):
+        if only and not name.startswith(tuple(only)):
+            continue
+        old, new = baseline.get(name), current.get(name)
+        if old is None or new is None:
+            entry = old or new
+            rows.append((name, old and old['value'], new and new['value'], entry['unit'], None, 'new' if old is None else 'missing'))
+            continue
+        if not new.get('better'):
+            continue
+        worse = change(new, old['value'], new['value'])
+        status = 'REGRESSED' if worse > threshold else ('improved' if worse < -threshold else 'ok')
+        rows.append((name, old['value'], new['value'], new['unit'], worse, status))
+        if status == 'REGRESSED':
+            regressions.append(name)
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Fail when benchmark metrics regress')
+    parser.add_argument('baseline', help='results JSON to compare against')
+    parser.add_argument('current', help='results JSON of this run')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed slowdown in percent (default: 10)')
+    parser.add_argument('--only', nargs='*', default=(), help='compare only metrics starting with these prefixes')
+    args = parser.parse_args()
+
+    rows, regressions = compare(load(args.baseline), load(args.current), args.threshold, args.only)
+    width = max([len(row[0]) for row in rows] + [6])
+    fmt = lambda value: '-' if value is None else f'{value:.4g}'
+    print(f"{'metric':<{width}} {'baseline':>12} {'current':>12} {'unit':<6} {'worse':>8}  status")
+    for name, old, new, unit, worse, status in rows:
+        worse = '' if worse is None else f'{worse:+.1f}%'
+        print(f"{name:<{width}} {fmt(old):>12} {fmt(new):>12} {unit:<6} {worse:>8}  {status}")
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) worse than {args.threshold:g}%: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nNo metric worse than {args.threshold:g}%")
+
+if __name__ == '__main__':
+    main()
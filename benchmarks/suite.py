@@ -0,0 +1,208 @@
+"""
+Benchmark suite: banner rendering, command dispatch and output throughput
+Runs in-process against portfolio_enhanced with stdout swapped for a null
+sink that counts bytes, animations jumped to their final frame and
+time.sleep patched out, and writes every metric as JSON so two runs can be
+compared with benchmarks.check_regression. "Cold" means an empty banner
+cache in an already warm interpreter; bench_startup covers process start.
+Run from the repository root with: python -m benchmarks.suite [-o results.json] [--quick]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lines fed through dispatch, including a typo and a prefix that only get suggestions
+SCRIPT = [
+    'help', 'whoami', 'about', 'skills', 'projects', 'projects 2', 'experience', 'contact',
+    'social', 'resume', 'time', 'quote', 'joke', 'history', 'search python', 'abuot', 'proj',
+]
+
+WIDTHS = [60, 100, 200]
+
+class _NullBuffer:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def write(self, data):
+        self.sink.bytes += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+class NullSink:
+    """Stands in for stdout: counts the bytes written (text or pre-encoded) and drops them"""
+
+    encoding = 'utf-8'
+
+    def __init__(self):
+        self.bytes = 0
+        self.buffer = _NullBuffer(self)
+
+    def write(self, text):
+        self.bytes += len(text.encode('utf-8', 'replace'))
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+class Patched:
+    """Null sink on stdout, no sleeping, and every animation jumps straight to its final frame"""
+
+    def __init__(self, animation):
+        self.animation = animation
+        self.sink = NullSink()
+
+    def __enter__(self):
+        self.saved = (sys.stdout, time.sleep, self.animation.play)
+        play = self.animation.play
+        sys.stdout = self.sink
+        time.sleep = lambda seconds: None
+        self.animation.play = lambda effect, write=None, flush=None, animate=True: play(effect, write, flush, animate=False)
+        return self.sink
+
+    def __exit__(self, *exc):
+        sys.stdout, time.sleep, self.animation.play = self.saved
+        return False
+
+def sample(func, repeat, min_time):
+    """Median seconds per call of func over repeat samples, each at least min_time long"""
+    func()
+    calls = 1
+    while True:
+        began = time.perf_counter()
+        for _ in range(calls):
+            func()
+        if time.perf_counter() - began >= min_time:
+            break
+        calls *= 2
+    times = [(time.perf_counter() - began) / calls]
+    for _ in range(repeat - 1):
+        began = time.perf_counter()
+        for _ in range(calls):
+            func()
+        times.append((time.perf_counter() - began) / calls)
+    return statistics.median(times)
+
+def sample_cold(func, reset, repeat):
+    """Median seconds of func after reset(), reset excluded from the timing"""
+    times = []
+    for _ in range(repeat):
+        reset()
+        began = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - began)
+    return statistics.median(times)
+
+def metric(value, unit, better='lower'):
+    """A result; better is 'lower', 'higher' or None for figures that are not compared"""
+    return {'value': round(value, 4), 'unit': unit, 'better': better}
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run(quick=False):
+    """Run every benchmark; returns the results document"""
+    repeat = 3 if quick else 7
+    min_time = 0.02 if quick else 0.1
+    cache = tempfile.mkdtemp(prefix='portfolio-bench-')
+    # Fixed terminal and color depth so runs on different machines render the same screens
+    os.environ.update(PORTFOLIO_CACHE_DIR=cache, COLUMNS='120', LINES='40', COLORTERM='truecolor', TERM='xterm-256color')
+    try:
+        import animation
+        import banner_cache
+        import portfolio_enhanced as portfolio
+        from command_history import CommandHistory
+
+        def empty_cache():
+            shutil.rmtree(cache, ignore_errors=True)
+            os.makedirs(cache)
+            banner_cache._digests.clear()
+
+        metrics = {}
+        image = portfolio.BANNER_IMAGE
+        with Patched(animation) as sink:
+            for width in WIDTHS:
+                seconds = sample_cold(lambda: portfolio.image_to_ascii(image, width=width), empty_cache, repeat)
+                metrics[f'image_to_ascii.w{width}.cold_ms'] = metric(seconds * 1000, 'ms')
+            metrics['image_to_ascii.w100.warm_ms'] = metric(sample(lambda: portfolio.image_to_ascii(image, width=100), repeat, min_time) * 1000, 'ms')
+
+            metrics['print_banner.cold_ms'] = metric(sample_cold(portfolio.print_banner, empty_cache, repeat) * 1000, 'ms')
+            metrics['print_banner.warm_ms'] = metric(sample(portfolio.print_banner, repeat, min_time) * 1000, 'ms')
+
+            history = CommandHistory(maxlen=200, persist=False)
+
+            def script():
+                for line in SCRIPT:
+                    history.add(line)
+                    portfolio.dispatch(line, history)
+            metrics['dispatch.script_us_per_command'] = metric(sample(script, repeat, min_time) / len(SCRIPT) * 1e6, 'us')
+
+            names = portfolio.COMMANDS.names(aliases=True, hidden=True)
+            queries = sorted({name[:length] for name in names for length in range(1, len(name) + 1)}) + ['zz', 'xyz', 'qq']
+
+            def suggestions():
+                for query in queries:
+                    portfolio.get_suggestions(query)
+            metrics['get_suggestions.us'] = metric(sample(suggestions, repeat, min_time) / len(queries) * 1e6, 'us')
+
+            # Output throughput of each command handler on its own, screens memoized as in a live session
+            for name in portfolio.COMMANDS.names(aliases=False, hidden=True):
+                command, invocation = portfolio.COMMANDS.resolve(name, history=history)
+                seconds = sample(lambda: command.run(invocation), repeat, min_time)
+                sink.bytes = 0
+                command.run(invocation)
+                size = sink.bytes
+                metrics[f'cmd.{name}.mb_per_s'] = metric(size / seconds / 1e6 if seconds else 0.0, 'MB/s', better='higher')
+                # Context for the rate above, not a target: content edits change it
+                metrics[f'cmd.{name}.bytes'] = metric(size, 'bytes', better=None)
+    finally:
+        shutil.rmtree(cache, ignore_errors=True)
+
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': int(time.time()),
+            'quick': quick,
+        },
+        'metrics': metrics,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the portfolio benchmark suite')
+    parser.add_argument('-o', '--output', help='write the JSON results here (default: stdout)')
+    parser.add_argument('--quick', action='store_true', help='fewer, shorter samples')
+    args = parser.parse_args()
+    results = run(args.quick)
+    text = json.dumps(results, indent=1, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        width = max(len(name) for name in results['metrics'])
+        for name, entry in sorted(results['metrics'].items()):
+            print(f"{name:<{width}}  {entry['value']:>12.4f} {entry['unit']}")
+        print(f"Results written to {args.output}")
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Static Site Build
+Generates index.html from site_template.html and content.json with every
+command's output pre-rendered to HTML. Sections whose content hash has not
+changed are reused from the previous build. The page and the local files it
+references are then staged in _site/ with gzip (and, when the brotli module
+is installed, brotli) variants of every text file, ready to publish or serve.
+Usage: python build_site.py [--force]
+"""
+
+import gzip
+import html
+import json
+import os
+import re
+import sys
+
+import content
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(ROOT, 'site_template.html')
+OUTPUT_PATH = os.path.join(ROOT, 'index.html')
+MANIFEST_PATH = os.path.join(ROOT, '.site-build.json')
+SITE_DIR = os.path.join(ROOT, '_site')
+
+# Bump when a renderer below changes so every section is rebuilt
+RENDER_VERSION = 1
+
+SECTIONS_MARKER = '<!-- @sections -->'
+
+# Staged files worth compressing; images are compressed already
+COMPRESSIBLE = ('.html', '.css', '.js', '.json', '.svg', '.txt')
+# Precompressed suffix -> Content-Encoding
+VARIANTS = {'.br': 'br', '.gz': 'gzip'}
+
+# Local files the page loads (src="Charliee.png"), staged next to it
+_LOCAL_REF = re.compile(r'(?:src|href)="([^":?#]+)"')
+
+RULE = f'<span class="gray">{"═" * 60}</span>'
+
+# Commands offered on the web page, in help order
+WEB_COMMANDS = (
+    ('help', 'Show this help message'),
+    ('about', 'About me and my background'),
+    ('skills', 'My technical skills and expertise'),
+    ('projects', 'View my recent projects'),
+    ('experience', 'Work experience and education'),
+    ('contact', 'Get in touch with me'),
+    ('social', 'My social media links'),
+    ('resume', 'Download my resume'),
+    ('clear', 'Clear the terminal screen'),
+    ('exit', 'Exit message'),
+)
+
+def esc(text):
+    return html.escape(text, quote=False)
+
+def link(url, text=None):
+    href = url if '://' in url else 'https://' + url
+    return f'<a href="{html.escape(href)}" target="_blank" class="blue">{esc(text or url)}</a>'
+
+def heading(title):
+    return f'\n<span class="cyan bold">{esc(title)}</span>\n{RULE}\n'
+
+def bullets(items, indent='  '):
+    return '\n'.join(f'{indent}• {esc(item)}' for item in items)
+
+def render_help(info):
+    rows = '\n'.join(f'  <span class="green">{name}</span>{" " * (14 - len(name))}{esc(text)}' for name, text in WEB_COMMANDS)
+    return f'\n<span class="cyan bold">Available Commands:</span>\n\n{rows}\n\n<span class="gray">Tip: Use arrow keys to navigate command history</span>\n'
+
+def render_about(info):
+    about = info.about
+    return (
+        heading('About Me') + '\n'
+        + esc('\n'.join(about.intro)) + ' I specialize in:\n\n'
+        + bullets(item for icon, item in about.focus) + '\n\n'
+        + esc('\n'.join(about.background)) + '\n\n'
+        + f'<span class="yellow">💡 "{esc(about.quote)}"</span>\n'
+    )
+
+def render_skills(info):
+    skills = info.skills
+    rows = []
+    for skill, level in skills.languages:
+        filled = level // 5
+        bar = f'<span class="progress-filled">{"█" * filled}</span><span class="progress-empty">{"░" * (20 - filled)}</span>'
+        rows.append(f'  ▸ {esc(skill):<12} {bar}  {level}%')
+    groups = '\n\n'.join(f'<span class="green">{esc(group.title)}:</span>\n{bullets(group.items)}' for group in skills.groups)
+    return heading('Technical Skills') + '\n<span class="green">Programming Languages:</span>\n' + '\n'.join(rows) + '\n\n' + groups + '\n'
+
+def render_projects(info):
+    blocks = []
+    for number, project in enumerate(info.projects, 1):
+        blocks.append(
+            f'<span class="yellow">[{number:02d}]</span> <span class="bold">{esc(project.title)}</span>\n'
+            f'     {esc(project.description)}\n'
+            f'     <span class="blue">Tech:</span> {esc(", ".join(project.tech))}\n'
+            f'     <span class="green">⭐</span> <span class="gray">{esc(" | ".join(project.features))}</span>'
+        )
+    return heading('Recent Projects') + '\n' + '\n\n'.join(blocks) + '\n'
+
+def render_experience(info):
+    experience = info.experience
+    roles = '\n\n'.join(
+        f'  <span class="bold">{esc(role.title)}</span> <span class="gray">| {esc(role.period)}</span>\n'
+        f'  <span class="gray">{esc(role.summary)}</span>\n{bullets(role.points)}'
+        for role in experience.roles
+    )
+    return (
+        heading('Experience & Education')
+        + f'\n<span class="green">📚 Education:</span>\n  {esc(experience.education.degree)}\n  {esc(experience.education.focus)}\n'
+        + f'\n<span class="green">💼 Work Experience:</span>\n\n{roles}\n'
+        + f'\n<span class="green">🏆 Achievements:</span>\n{bullets(experience.achievements)}\n'
+    )
+
+def render_contact(info):
+    rows = '\n'.join(f'<span class="green">{icon} {esc(label)}:</span>{" " * (10 - len(label))}{esc(value)}' for icon, label, value in info.contact.rows)
+    return heading('Contact Information') + f'\n{rows}\n\n<span class="yellow">Feel free to reach out for collaborations or opportunities!</span>\n'
+
+def render_social(info):
+    rows = '\n'.join(f'<span class="green">{esc(entry.label)}:</span>{" " * (11 - len(entry.label))}{link(entry.url, entry.url.split("://", 1)[-1])}' for entry in info.social)
+    return heading('Social Media') + f'\n{rows}\n'
+
+def render_resume(info):
+    label, url = info.resume.links[0]
+    return (
+        heading('Resume')
+        + f'\n<span class="green">📄 Download my resume:</span>\n   {link(url, url.split("://", 1)[-1])}\n'
+        + '\n<span class="gray">Last updated: <span class="js-month"></span></span>\n'
+    )
+
+def render_exit(info):
+    return '''
+<span class="cyan">
+╔═══════════════════════════════════════════════════════════╗
+║  Thanks for visiting my portfolio!                        ║
+║  Hope to hear from you soon! 👋                           ║
+╚═══════════════════════════════════════════════════════════╝
+</span>
+
+<span class="gray">Type 'help' to see commands again</span>
+'''
+
+# Page section -> (renderer, content.json sections it reads)
+SECTIONS = {
+    'help': (render_help, ()),
+    'about': (render_about, ('about',)),
+    'skills': (render_skills, ('skills',)),
+    'projects': (render_projects, ('projects',)),
+    'experience': (render_experience, ('experience',)),
+    'contact': (render_contact, ('contact',)),
+    'social': (render_social, ('social',)),
+    'resume': (render_resume, ('resume',)),
+    'exit': (render_exit, ()),
+}
+
+def section_key(name, info):
+    """Hash of everything a section's HTML depends on"""
+    inputs = [RENDER_VERSION, name] + [info.hashes[source] for source in SECTIONS[name][1]]
+    if name == 'help':
+        inputs.append(WEB_COMMANDS)
+    return content.section_hash(inputs)
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build(force=False):
+    """Build index.html; returns (rebuilt section names, whether index.html was written)"""
+    info = content.load()
+    previous = {} if force else load_manifest().get('sections', {})
+    sections = {}
+    rebuilt = []
+    for name, (render, sources) in SECTIONS.items():
+        key = section_key(name, info)
+        cached = previous.get(name)
+        if cached and cached['hash'] == key:
+            sections[name] = cached
+        else:
+            sections[name] = {'hash': key, 'html': render(info)}
+            rebuilt.append(name)
+
+    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        template = f.read()
+    fragments = ''.join(f'    <template id="cmd-{name}">{entry["html"]}</template>\n' for name, entry in sections.items())
+    page = template.replace(SECTIONS_MARKER + '\n', fragments, 1)
+
+    try:
+        with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
+            written = f.read() != page
+    except OSError:
+        written = True
+    if written:
+        with open(OUTPUT_PATH, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(page)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'sections': sections}, f, ensure_ascii=False, indent=1)
+    return rebuilt, written
+
+def write_if_changed(path, data):
+    """Write bytes unless the file already holds them, so unchanged files keep their mtime; returns whether it wrote"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+def compress(data):
+    """Return {suffix: compressed bytes} for the variants worth keeping (at least 10% smaller)"""
+    variants = {'.gz': gzip.compress(data, 9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return {suffix: packed for suffix, packed in variants.items() if len(packed) < len(data) * 0.9}
+
+def stage(site_dir=SITE_DIR):
+    """Copy index.html and the local files it references into site_dir with precompressed variants; returns the files written"""
+    with open(OUTPUT_PATH, 'r', encoding='utf-8') as f:
+        page = f.read()
+    names = ['index.html'] + sorted({ref for ref in _LOCAL_REF.findall(page) if os.path.isfile(os.path.join(ROOT, ref))})
+    os.makedirs(site_dir, exist_ok=True)
+    written = []
+    for name in names:
+        with open(os.path.join(ROOT, name), 'rb') as f:
+            data = f.read()
+        target = os.path.join(site_dir, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        variants = compress(data) if name.lower().endswith(COMPRESSIBLE) else {}
+        for suffix, packed in [('', data)] + list(variants.items()):
+            if write_if_changed(target + suffix, packed):
+                written.append(name + suffix)
+        # A variant left from an earlier build (say brotli was installed then) would serve stale bytes
+        for suffix in VARIANTS:
+            if suffix not in variants and os.path.exists(target + suffix):
+                os.remove(target + suffix)
+    return written
+
+def main():
+    rebuilt, written = build(force='--force' in sys.argv)
+    print(f"Rebuilt sections: {', '.join(rebuilt) if rebuilt else 'none'}")
+    print(f"{os.path.basename(OUTPUT_PATH)} {'written' if written else 'unchanged'}")
+    staged = stage()
+    print(f"{os.path.relpath(SITE_DIR, ROOT)}/: {', '.join(staged) if staged else 'unchanged'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Persistent Command History
+Commands are appended to a log file one line at a time. Startup reads only
+the tail of the log into a bounded ring buffer, and a trigram index over the
+buffer answers reverse (newest first) substring searches. The index is only
+built when the history is first searched.
+"""
+
+import os
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+
+# Entries kept in memory (and offered to readline for up-arrow recall)
+MAX_ENTRIES = 5000
+
+# The log is rewritten down to its tail once it grows past this size
+MAX_LOG_BYTES = 1024 * 1024
+
+def history_path():
+    """Return the history log path"""
+    override = os.environ.get('PORTFOLIO_HISTORY_FILE')
+    if override:
+        return override
+    base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'terminal-portfolio', 'history')
+
+def read_tail(path, count, block=65536):
+    """Return the last `count` lines of a file, reading backwards from the end"""
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return [], 0
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        data = b''
+        pos = size
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode('utf-8', 'replace').splitlines()
+    if pos > 0:
+        # The first line is probably cut in half
+        lines = lines[1:]
+    return [line for line in lines if line][-count:], size
+
+def _trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class CommandHistory:
+    """Ring buffer of commands backed by an append-only log, loaded on first use"""
+
+    def __init__(self, path=None, maxlen=MAX_ENTRIES, persist=True):
+        self.path = path or history_path()
+        self.maxlen = maxlen
+        # persist=False keeps history in memory only (e.g. one served visitor)
+        self.persist = persist
+        self._buffer = None
+        self._log = None
+        self._readline = None
+
+    def _load(self):
+        """Read the tail of the log"""
+        # A list with a moving head, so any entry is one index away; the oldest
+        # entry (self._buffer[self._head]) has sequence number self.first
+        self._buffer = []
+        self._head = 0
+        self.first = 0
+        # trigram -> sequence numbers, oldest first; None until the first search
+        self._postings = None
+        if not self.persist:
+            return
+        lines, size = read_tail(self.path, self.maxlen)
+        self._buffer = lines
+        if size > MAX_LOG_BYTES:
+            self._compact()
+
+    def _index(self):
+        """The trigram postings, built from the buffer on first use"""
+        if self._postings is None:
+            self._postings = {}
+            for seq, command in enumerate(self, self.first):
+                for gram in _trigrams(command):
+                    self._postings.setdefault(gram, deque()).append(seq)
+        return self._postings
+
+    def _loaded(self):
+        if self._buffer is None:
+            self._load()
+        return self._buffer
+
+    @property
+    def entries(self):
+        """The commands in memory, oldest first (a copy)"""
+        return self._loaded()[self._head:]
+
+    def __len__(self):
+        return len(self._loaded()) - self._head
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return islice(self._loaded(), self._head, None)
+
+    def _at(self, seq):
+        return self._buffer[self._head + seq - self.first]
+
+    def _push(self, command):
+        buffer = self._buffer
+        if len(buffer) - self._head == self.maxlen:
+            # Evict the oldest entry; it is also the oldest posting in every trigram list
+            if self._postings is not None:
+                for gram in _trigrams(buffer[self._head]):
+                    postings = self._postings[gram]
+                    postings.popleft()
+                    if not postings:
+                        del self._postings[gram]
+            self._head += 1
+            self.first += 1
+            if self._head >= self.maxlen:
+                # Drop the evicted slots once they outnumber the live ones (amortized O(1))
+                del buffer[:self._head]
+                self._head = 0
+        seq = self.first + len(buffer) - self._head
+        buffer.append(command)
+        if self._postings is not None:
+            for gram in _trigrams(command):
+                self._postings.setdefault(gram, deque()).append(seq)
+
+    def add(self, command):
+        """Record a command in memory and on disk"""
+        self._loaded()
+        self._push(command)
+        if self.persist:
+            self._append(command)
+        if self._readline and self._readline.get_current_history_length() > self.maxlen:
+            self._readline.remove_history_item(0)
+
+    def _append(self, command):
+        try:
+            if self._log is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._log = open(self.path, 'a', encoding='utf-8')
+            self._log.write(command + '\n')
+            self._log.flush()
+        except OSError:
+            # A read-only home directory still gets in-memory history
+            pass
+
+    def _compact(self):
+        """Rewrite the log as just the entries in memory"""
+        import tempfile
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix='.history-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.writelines(line + '\n' for line in self)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def recent(self, count=10):
+        """The last `count` commands as (number, command), oldest first"""
+        # len() first: it loads the log, which sets self.first
+        last = len(self) + self.first
+        return [(seq + 1, self._at(seq)) for seq in range(max(self.first, last - count), last)]
+
+    def search(self, query, before=None):
+        """Newest (number, command) containing query and older than number `before`, or None"""
+        for match in self.search_all(query, limit=1, before=before):
+            return match
+        return None
+
+    def search_all(self, query, limit=10, before=None):
+        """Newest-first (number, command) pairs containing query (case-insensitive)"""
+        needle = query.lower()
+        # len() first: it loads the log, which sets self.first
+        newest = len(self) - 1 + self.first
+        if before is not None:
+            newest = min(newest, before - 2)
+        grams = _trigrams(needle)
+        if grams:
+            # Walk the shortest posting list; every other trigram and the substring are checked per hit
+            index = self._index()
+            lists = [index.get(gram) for gram in grams]
+            if not all(lists):
+                return []
+            shortest = min(lists, key=len)
+            # Start at the newest posting not past `newest` instead of stepping over the later ones
+            newer = len(shortest) - bisect_right(shortest, newest)
+            candidates = islice(reversed(shortest), newer, None)
+        else:
+            candidates = range(newest, self.first - 1, -1)
+        found = []
+        for seq in candidates:
+            command = self._at(seq)
+            if needle in command.lower():
+                found.append((seq + 1, command))
+                if len(found) == limit:
+                    break
+        return found
+
+    def attach_readline(self):
+        """Seed readline with the loaded entries for up-arrow and Ctrl-R recall"""
+        try:
+            import readline
+        except ImportError:
+            return False
+        # This reads the log tail (at most maxlen lines) now: GNU readline fixes its
+        # history position before any hook runs, so recall cannot be seeded later
+        readline.clear_history()
+        for command in self:
+            readline.add_history(command)
+        self._readline = readline
+        return True
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,126 @@
+"""
+Command Registry
+Decorator-based command table built once at import, carrying the aliases,
+category and help text that the help screen and suggestions are generated from
+"""
+
+import shlex
+
+import profiler
+
+# Returned by a handler to end the session (exit/quit)
+STOP = object()
+
+def takes_arguments(func):
+    """Whether a handler (or the function a decorator wraps) declares any parameters
+
+    Reads the code object rather than using inspect.signature, whose import
+    alone costs ~10 ms of startup.
+    """
+    while hasattr(func, '__wrapped__'):
+        func = func.__wrapped__
+    code = func.__code__
+    # 0x04 | 0x08: CO_VARARGS | CO_VARKEYWORDS (*args, **kwargs)
+    return bool(code.co_argcount or code.co_kwonlyargcount or code.co_flags & 0x0C)
+
+class Command:
+    """A registered command and its metadata"""
+
+    def __init__(self, name, func, aliases=(), category='', help='', usage=None, hidden=False, arguments=()):
+        self.name = name
+        self.func = func
+        self.aliases = tuple(aliases)
+        # Argument values offered by TAB completion
+        self.arguments = tuple(arguments)
+        self.category = category
+        self.help = help
+        self.usage = usage or name
+        self.hidden = hidden
+        # Decided once here so dispatch does not inspect the handler on every call
+        self.wants_invocation = takes_arguments(func)
+
+    def run(self, invocation):
+        with profiler.span('cmd.' + self.name):
+            if self.wants_invocation:
+                return self.func(invocation)
+            return self.func()
+
+class Invocation:
+    """One parsed command line: positional args, --options and caller context (e.g. history)"""
+
+    def __init__(self, name, args, options, raw, **context):
+        self.name = name
+        self.args = args
+        self.options = options
+        self.raw = raw
+        self.__dict__.update(context)
+
+    def flag(self, name):
+        """True if --name was given"""
+        return bool(self.options.get(name))
+
+def parse_line(line):
+    """Split a command line into (name, args, options); options come from --flag and --key=value"""
+    try:
+        tokens = shlex.split(line)
+    except ValueError:
+        # Unbalanced quotes: fall back to plain whitespace splitting
+        tokens = line.split()
+    if not tokens:
+        return '', [], {}
+    args = []
+    options = {}
+    for token in tokens[1:]:
+        if token.startswith('--') and len(token) > 2:
+            key, _, value = token[2:].partition('=')
+            options[key.replace('-', '_')] = value or True
+        else:
+            args.append(token)
+    return tokens[0].lower(), args, options
+
+class CommandRegistry:
+    """Name/alias -> Command table with O(1) dispatch"""
+
+    def __init__(self):
+        self.commands = {}
+        self.lookup = {}
+
+    def command(self, name, aliases=(), category='', help='', usage=None, hidden=False, arguments=()):
+        """Decorator registering a handler; stack it to register one handler under several names"""
+        def register(func):
+            cmd = Command(name, func, aliases, category, help, usage, hidden, arguments)
+            self.commands[name] = cmd
+            for key in (name,) + cmd.aliases:
+                self.lookup[key] = cmd
+            return func
+        return register
+
+    def get(self, name):
+        return self.lookup.get(name)
+
+    def __contains__(self, name):
+        return name in self.lookup
+
+    def names(self, aliases=True, hidden=False):
+        """Command names (and aliases) in registration order"""
+        result = []
+        for cmd in self.commands.values():
+            if cmd.hidden and not hidden:
+                continue
+            result.append(cmd.name)
+            if aliases:
+                result.extend(cmd.aliases)
+        return result
+
+    def categories(self):
+        """Visible commands grouped by category, in registration order"""
+        groups = {}
+        for cmd in self.commands.values():
+            if not cmd.hidden:
+                groups.setdefault(cmd.category, []).append(cmd)
+        return groups
+
+    def resolve(self, line, **context):
+        """Parse a line and return (Command or None, Invocation)"""
+        name, args, options = parse_line(line)
+        return self.lookup.get(name), Invocation(name, args, options, line, **context)
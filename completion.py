@@ -0,0 +1,234 @@
+"""
+Command Completion
+A sorted-array prefix index over command names, aliases and their arguments,
+shared by readline TAB completion and the "Did you mean" suggestions, plus a
+BK-tree for typo-tolerant matching by edit distance over command names and
+content keywords (project titles and tech, skills)
+"""
+
+import re
+from bisect import bisect_left
+
+# One-word terms a visitor might type instead of a command, e.g. "opencv" or "node.js"
+_KEYWORD = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+MIN_KEYWORD = 3
+
+class PrefixIndex:
+    """Sorted, de-duplicated keys; every prefix lookup is two binary searches"""
+
+    def __init__(self, words=()):
+        self.words = sorted(set(words))
+
+    def __len__(self):
+        return len(self.words)
+
+    def _bounds(self, prefix):
+        words = self.words
+        lo = bisect_left(words, prefix)
+        # Smallest string greater than every string starting with prefix; U+10FFFF has no
+        # successor, so drop trailing ones first (past 'a\U0010ffff' comes 'b')
+        stem = prefix.rstrip('\U0010ffff')
+        if not stem:
+            return lo, len(words)
+        upper = stem[:-1] + chr(ord(stem[-1]) + 1)
+        return lo, bisect_left(words, upper, lo)
+
+    def complete(self, prefix, limit=None):
+        """Keys starting with prefix, in sorted order"""
+        lo, hi = self._bounds(prefix)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return self.words[lo:hi]
+
+    def count(self, prefix):
+        """Number of keys starting with prefix, without building the list"""
+        lo, hi = self._bounds(prefix)
+        return hi - lo
+
+def edit_distance(a, b):
+    """Levenshtein distance (insertions, deletions, substitutions)
+
+    Myers' bit-parallel algorithm: one column of the edit matrix is a pair of
+    bit vectors over the shorter word, updated with a few integer operations
+    per character of the longer one instead of a Python loop per cell.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    masks = {}
+    for i, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(b)) - 1
+    top = 1 << (len(b) - 1)
+    plus, minus = full, 0
+    score = len(b)
+    for char in a:
+        eq = masks.get(char, 0)
+        xv = eq | minus
+        xh = (((eq & plus) + plus) ^ plus) | eq
+        hplus = minus | ~(xh | plus)
+        hminus = plus & xh
+        if hplus & top:
+            score += 1
+        elif hminus & top:
+            score -= 1
+        hplus = (hplus << 1) | 1
+        hminus <<= 1
+        plus = (hminus | ~(xv | hplus)) & full
+        minus = hplus & xv & full
+    return score
+
+class BKTree:
+    """Metric tree over words; a query only visits children whose edge distance can still match"""
+
+    def __init__(self, words=(), distance=edit_distance):
+        self.distance = distance
+        # Each node is [word, {edge distance: child node}]
+        self.root = None
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, word):
+        if self.root is None:
+            self.root = [word, {}]
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            d = self.distance(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [word, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """(word, distance) pairs within max_distance, closest first"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            candidate, children = stack.pop()
+            d = self.distance(word, candidate)
+            if d <= max_distance:
+                found.append((candidate, d))
+            # Triangle inequality: only edges in [d - max, d + max] can hold matches
+            for edge, child in children.items():
+                if d - max_distance <= edge <= d + max_distance:
+                    stack.append(child)
+        found.sort(key=lambda item: (item[1], item[0]))
+        return found
+
+def content_keywords(info):
+    """Map content terms to the command line that shows them
+
+    A term from a single project opens that project; other skill terms open
+    skills, and terms shared by several projects open the project list.
+    """
+    def terms(*texts):
+        words = set()
+        for text in texts:
+            for word in _KEYWORD.findall(text.lower()):
+                word = word.rstrip('.')
+                if len(word) >= MIN_KEYWORD:
+                    words.add(word)
+        return words
+
+    projects = {}
+    for number, project in enumerate(info.projects, 1):
+        for word in terms(project.title, *project.tech):
+            projects.setdefault(word, []).append(number)
+    skills = terms(*(skill.name for skill in info.skills.languages), *(item for group in info.skills.groups for item in group.items))
+
+    keywords = {}
+    for word in sorted(set(projects) | skills):
+        numbers = projects.get(word, ())
+        if len(numbers) == 1:
+            keywords[word] = f'projects {numbers[0]}'
+        elif word in skills:
+            keywords[word] = 'skills'
+        else:
+            keywords[word] = 'projects'
+    return keywords
+
+class CommandCompleter:
+    """Completion over a CommandRegistry: command names first, then per-command arguments"""
+
+    def __init__(self, registry, keywords=None):
+        names = registry.names()
+        self.commands = PrefixIndex(names)
+        # Typo index word -> the command line it suggests; names win over keywords
+        self.targets = dict(keywords or {})
+        self.targets.update((name, name) for name in names)
+        # Built on the first typo, so startup does not pay for it
+        self._typos = None
+        self.arguments = {}
+        for command in registry.commands.values():
+            if command.arguments:
+                index = PrefixIndex(command.arguments)
+                for name in (command.name,) + command.aliases:
+                    self.arguments[name] = index
+        self._matches = []
+
+    def suggest(self, partial, limit=None):
+        """Command names (and aliases) starting with partial"""
+        return self.commands.complete(partial.lower(), limit)
+
+    def fuzzy(self, word, max_distance=None, limit=5):
+        """Ranked (command line, matched word, distance) for a mistyped command; short words tolerate fewer edits"""
+        word = word.lower()
+        if max_distance is None:
+            max_distance = 1 if len(word) <= 4 else 2
+        found = []
+        seen = set()
+        if self._typos is None:
+            self._typos = BKTree(self.targets)
+        for match, distance in self._typos.search(word, max_distance):
+            # Closest first, so a command reached through several words keeps its best match
+            target = self.targets[match]
+            if target not in seen:
+                seen.add(target)
+                found.append((target, match, distance))
+        return found[:limit]
+
+    def candidates(self, line, text):
+        """Completions for the word `text` at the end of `line`"""
+        head = line[:len(line) - len(text)]
+        if not head.strip():
+            return self.commands.complete(text.lower())
+        index = self.arguments.get(head.split()[0].lower())
+        return index.complete(text) if index else []
+
+    def complete(self, text, state):
+        """readline completer callback"""
+        if state == 0:
+            import readline
+            line = readline.get_line_buffer()[:readline.get_endidx()]
+            self._matches = [match + ' ' for match in self.candidates(line, text)]
+        return self._matches[state] if state < len(self._matches) else None
+
+def install_readline(completer):
+    """Bind TAB to the completer; returns False where readline is unavailable (e.g. Windows)"""
+    try:
+        import readline
+    except ImportError:
+        return False
+    readline.set_completer(completer.complete)
+    readline.set_completer_delims(' \t\n')
+    if 'libedit' in (readline.__doc__ or ''):
+        # macOS system Python ships libedit, which uses a different binding syntax
+        readline.parse_and_bind('bind ^I rl_complete')
+    else:
+        readline.parse_and_bind('tab: complete')
+    return True
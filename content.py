@@ -0,0 +1,101 @@
+"""
+Portfolio Content
+Loads content.json, the single source for the bio, skills, projects and
+contact data, into a compact model of named tuples shared by the terminal
+commands and the static site build
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+CONTENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content.json')
+
+# Top-level sections, in the order they appear in content.json
+SECTIONS = ('profile', 'about', 'skills', 'projects', 'experience', 'contact', 'social', 'resume', 'quotes', 'jokes')
+
+Profile = namedtuple('Profile', 'name tagline blurb status location interests timezone')
+About = namedtuple('About', 'intro focus background philosophy offline quote')
+Skill = namedtuple('Skill', 'name level')
+SkillGroup = namedtuple('SkillGroup', 'title items')
+Skills = namedtuple('Skills', 'languages groups')
+Project = namedtuple('Project', 'title description tech features note')
+Education = namedtuple('Education', 'degree focus notes')
+Role = namedtuple('Role', 'title period summary points')
+Experience = namedtuple('Experience', 'education roles achievements certifications')
+Contact = namedtuple('Contact', 'rows email github availability response_time')
+Link = namedtuple('Link', 'icon label url note')
+Resume = namedtuple('Resume', 'links highlights')
+Quote = namedtuple('Quote', 'text author')
+Content = namedtuple('Content', SECTIONS + ('hashes', 'digest'))
+
+# (path, mtime_ns, size) -> Content, so every caller shares one parsed copy
+_loaded = {}
+
+def section_hash(value):
+    """Stable hash of one section's raw JSON value"""
+    blob = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+def _build(raw):
+    """Turn parsed JSON into the named-tuple model"""
+    about = raw['about']
+    skills = raw['skills']
+    experience = raw['experience']
+    contact = raw['contact']
+    hashes = {name: section_hash(raw[name]) for name in SECTIONS}
+    return Content(
+        profile=Profile(**{field: _freeze(raw['profile'][field]) for field in Profile._fields}),
+        about=About(
+            intro=tuple(about['intro']),
+            focus=tuple(tuple(item) for item in about['focus']),
+            background=tuple(about['background']),
+            philosophy=tuple(about['philosophy']),
+            offline=tuple(about['offline']),
+            quote=about['quote'],
+        ),
+        skills=Skills(
+            languages=tuple(Skill(name, level) for name, level in skills['languages']),
+            groups=tuple(SkillGroup(group['title'], tuple(group['items'])) for group in skills['groups']),
+        ),
+        projects=tuple(Project(**{field: _freeze(project[field]) for field in Project._fields}) for project in raw['projects']),
+        experience=Experience(
+            education=Education(**{field: _freeze(experience['education'][field]) for field in Education._fields}),
+            roles=tuple(Role(**{field: _freeze(role[field]) for field in Role._fields}) for role in experience['roles']),
+            achievements=tuple(experience['achievements']),
+            certifications=tuple(experience['certifications']),
+        ),
+        contact=Contact(
+            rows=tuple(tuple(row) for row in contact['rows']),
+            email=contact['email'],
+            github=contact['github'],
+            availability=tuple(contact['availability']),
+            response_time=contact['response_time'],
+        ),
+        social=tuple(Link(*link) for link in raw['social']),
+        resume=Resume(
+            links=tuple(tuple(link) for link in raw['resume']['links']),
+            highlights=tuple(raw['resume']['highlights']),
+        ),
+        quotes=tuple(Quote(*quote) for quote in raw['quotes']),
+        jokes=tuple(raw['jokes']),
+        hashes=hashes,
+        digest=section_hash(hashes),
+    )
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+def load(path=None):
+    """Return the content model for content.json, parsing it again only when the file changes"""
+    path = os.path.abspath(path or CONTENT_PATH)
+    st = os.stat(path)
+    stamp = (path, st.st_mtime_ns, st.st_size)
+    content = _loaded.get(stamp)
+    if content is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = _build(json.load(f))
+        _loaded.clear()
+        _loaded[stamp] = content
+    return content
@@ -0,0 +1,284 @@
+"""
+Web Terminal Server
+Serves the staged static site (index.html and its assets) over HTTP/1.1
+with keep-alive. Precompressed .br / .gz variants from the build are chosen
+by Accept-Encoding, every representation carries a strong ETag so
+If-None-Match revalidations are answered with 304, and large files go out
+with sendfile() instead of being copied through Python. Given an app, GET
+/ws is upgraded to a WebSocket session on the real command engine
+(see ws_bridge).
+"""
+
+import asyncio
+import email.utils
+import hashlib
+import mimetypes
+import os
+import sys
+import time
+from urllib.parse import unquote
+
+import profiler
+import server
+import ws_bridge
+
+DEFAULT_PORT = 8080
+
+# Files up to this size are held in memory; larger ones are sent from disk with sendfile()
+SENDFILE_MIN = 64 * 1024
+
+# Seconds an idle keep-alive connection is held open, and the largest request head accepted
+KEEPALIVE_TIMEOUT = 15
+MAX_HEAD = 16 * 1024
+
+# The page is revalidated on every load (a 304 is a few hundred bytes); assets may be reused for an hour
+HTML_CACHE = 'no-cache'
+ASSET_CACHE = 'public, max-age=3600'
+
+# Content-Encoding -> precompressed file suffix, best first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 426: 'Upgrade Required'}
+
+class Representation:
+    """One file as sent: identity or a precompressed variant"""
+
+    def __init__(self, path, encoding):
+        self.path = path
+        self.encoding = encoding
+        stat = os.stat(path)
+        self.stamp = (stat.st_mtime_ns, stat.st_size)
+        self.size = stat.st_size
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        self.etag = f'"{digest.hexdigest()[:32]}"'
+        if self.size <= SENDFILE_MIN:
+            with open(path, 'rb') as f:
+                self.body = f.read()
+        else:
+            self.body = None
+
+class Resource:
+    """A URL path and its representations"""
+
+    def __init__(self, path):
+        self.path = path
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json', 'image/svg+xml'):
+            content_type += '; charset=utf-8'
+        self.content_type = content_type
+        self.cache_control = HTML_CACHE if path.endswith('.html') else ASSET_CACHE
+        self.load()
+
+    def load(self):
+        self.identity = Representation(self.path, None)
+        self.variants = {
+            encoding: Representation(self.path + suffix, encoding)
+            for encoding, suffix in ENCODINGS if os.path.isfile(self.path + suffix)
+        }
+
+    def fresh(self):
+        """Reload when a rebuild has replaced the file, so an ETag never outlives its bytes"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) != self.identity.stamp:
+            self.load()
+        return True
+
+    def choose(self, accept_encoding):
+        """The representation to send for an Accept-Encoding header value"""
+        if not self.variants or not accept_encoding:
+            return self.identity
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding, suffix in ENCODINGS:
+            if encoding in self.variants and accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return self.variants[encoding]
+        return self.identity
+
+def parse_accept_encoding(value):
+    """Return {coding: q} for an Accept-Encoding header"""
+    accepted = {}
+    for item in value.lower().split(','):
+        coding, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip()] = q
+    return accepted
+
+def etag_matches(value, etag):
+    """If-None-Match uses weak comparison: W/ prefixes are ignored and * matches anything"""
+    for tag in value.split(','):
+        tag = tag.strip()
+        if tag == '*' or tag.removeprefix('W/') == etag:
+            return True
+    return False
+
+class Site:
+    """Every file under a directory, by URL path; precompressed variants are found by their source"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.resources = {}
+        variant_suffixes = tuple(suffix for encoding, suffix in ENCODINGS)
+        for directory, dirs, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(directory, name)
+                if name.endswith(variant_suffixes) and os.path.isfile(os.path.splitext(path)[0]):
+                    continue
+                url = '/' + os.path.relpath(path, self.root).replace(os.sep, '/')
+                self.resources[url] = Resource(path)
+        if '/index.html' in self.resources:
+            self.resources['/'] = self.resources['/index.html']
+
+    def lookup(self, target):
+        """The resource for a request target; only files present at startup are ever served"""
+        path = unquote(target.split('?', 1)[0].split('#', 1)[0])
+        if path.endswith('/') and path + 'index.html' in self.resources:
+            path += 'index.html'
+        resource = self.resources.get(path)
+        if resource is None or not resource.fresh():
+            return None
+        return resource
+
+_date = (0, b'')
+
+def http_date():
+    """The Date header value, formatted at most once a second"""
+    global _date
+    now = int(time.time())
+    if _date[0] != now:
+        _date = (now, email.utils.formatdate(now, usegmt=True).encode('ascii'))
+    return _date[1]
+
+def head(status, headers, keep_alive):
+    lines = [f'HTTP/1.1 {status} {REASONS[status]}'.encode('ascii'), b'Date: ' + http_date()]
+    lines.extend(f'{name}: {value}'.encode('latin-1') for name, value in headers)
+    lines.append(b'Connection: keep-alive' if keep_alive else b'Connection: close')
+    return b'\r\n'.join(lines) + b'\r\n\r\n'
+
+def error(status, keep_alive, extra=()):
+    body = f'{status} {REASONS[status]}\n'.encode('ascii')
+    headers = [('Content-Type', 'text/plain; charset=utf-8'), ('Content-Length', len(body))] + list(extra)
+    return head(status, headers, keep_alive) + body
+
+def parse_head(data):
+    """Return (method, target, version, {lowercase name: value}) for a request head, or None when malformed"""
+    try:
+        lines = data.decode('latin-1').split('\r\n')
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        return None
+    if not version.startswith('HTTP/1.'):
+        return None
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(':')
+        if not sep:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+async def respond(site, writer, method, target, version, headers):
+    """Send the response to one request; returns whether the connection stays open"""
+    connection = headers.get('connection', '').lower()
+    keep_alive = 'close' not in connection if version == 'HTTP/1.1' else 'keep-alive' in connection
+    if method not in ('GET', 'HEAD'):
+        writer.write(error(405, keep_alive, [('Allow', 'GET, HEAD')]))
+        return keep_alive
+    resource = site.lookup(target)
+    if resource is None:
+        writer.write(error(404, keep_alive))
+        return keep_alive
+
+    rep = resource.choose(headers.get('accept-encoding'))
+    fields = [('ETag', rep.etag), ('Cache-Control', resource.cache_control)]
+    if resource.variants:
+        fields.append(('Vary', 'Accept-Encoding'))
+    if etag_matches(headers.get('if-none-match', ''), rep.etag):
+        writer.write(head(304, fields, keep_alive))
+        return keep_alive
+
+    fields.append(('Content-Type', resource.content_type))
+    if rep.encoding:
+        fields.append(('Content-Encoding', rep.encoding))
+    fields.append(('Content-Length', rep.size))
+    response = head(200, fields, keep_alive)
+    if method == 'HEAD':
+        writer.write(response)
+    elif rep.body is not None:
+        writer.write(response + rep.body)
+    else:
+        writer.write(response)
+        # The kernel copies straight from the page cache to the socket (plain reads where sendfile is missing)
+        with open(rep.path, 'rb') as f:
+            await asyncio.get_running_loop().sendfile(writer.transport, f, 0, rep.size)
+    return keep_alive
+
+async def _client(site, app, reader, writer):
+    try:
+        while True:
+            try:
+                data = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+            except asyncio.LimitOverrunError:
+                writer.write(error(400, False))
+                break
+            request = parse_head(data)
+            if request is None or request[3].get('content-length', '0') != '0' or 'transfer-encoding' in request[3]:
+                # Nothing here takes a body, and skipping one safely is not worth the code
+                writer.write(error(400, False))
+                break
+            method, target, version, headers = request
+            if app is not None and target.split('?', 1)[0] == ws_bridge.PATH:
+                if method != 'GET' or ws_bridge.handshake_error(headers):
+                    writer.write(error(426, False, [('Upgrade', 'websocket'), ('Sec-WebSocket-Version', '13')]))
+                    break
+                # The connection is the session's from here on
+                await ws_bridge.accept(app, reader, writer, headers)
+                return
+            with profiler.span('http.request'):
+                keep_alive = await respond(site, writer, *request)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(root, host, port=DEFAULT_PORT, app=None):
+    """Serve root (and, given an app, WebSocket sessions) until cancelled"""
+    site = Site(root)
+    if app is not None:
+        server.start_workers()
+    listener = await asyncio.start_server(lambda r, w: _client(site, app, r, w), host, port, limit=MAX_HEAD)
+    print(f"Serving {os.path.relpath(site.root)} ({len(site.resources)} paths) on http://{host}:{port}/")
+    if app is not None:
+        print(f"Live sessions on ws://{host}:{port}{ws_bridge.PATH}  (python ws_client.py ws://{host}:{port}{ws_bridge.PATH})")
+    print("Press Ctrl+C to stop")
+    sys.stdout.flush()
+    async with listener:
+        await listener.serve_forever()
+
+def run(root=None, host='127.0.0.1', port=DEFAULT_PORT, app=None):
+    """Serve from synchronous code until Ctrl+C; with no root the site is built and staged first"""
+    if root is None:
+        import build_site
+        build_site.build()
+        build_site.stage()
+        root = build_site.SITE_DIR
+    try:
+        asyncio.run(serve(root, host, port, app))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,170 @@
+"""
+Full-screen Matrix Digital Rain
+Simulates the rain on flat frame buffers, updates them with bytes.translate
+and os.urandom per frame, and redraws only the cells whose shade or glyph
+changed using cursor-addressed escapes.
+"""
+
+import os
+import random
+import time
+
+from term_caps import TRUECOLOR, COLOR_256, COLOR_16, MONO, terminal_size
+
+GLYPHS = b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz@#$%&*+=<>?'
+
+# Intensity a head cell starts at; every frame each cell fades by one level
+HEAD_LEVEL = 24
+
+# Shade 0 is blank, 1-4 are darker to brighter greens, 5 is the white head
+_SHADES = {
+    TRUECOLOR: ['', '\033[38;2;0;70;0m', '\033[38;2;0;120;30m', '\033[38;2;0;180;50m', '\033[38;2;60;255;90m', '\033[38;2;220;255;220m'],
+    COLOR_256: ['', '\033[38;5;22m', '\033[38;5;28m', '\033[38;5;34m', '\033[38;5;46m', '\033[38;5;194m'],
+    COLOR_16: ['', '\033[32m', '\033[32m', '\033[92m', '\033[92m', '\033[97m'],
+    MONO: ['', '', '', '', '', ''],
+}
+
+ENTER = '\033[?1049h\033[?25l\033[2J'
+LEAVE = '\033[0m\033[?25h\033[?1049l'
+
+# Level -> level - 1, clamped at zero: one translate call fades the whole screen
+_DECAY = bytes(max(0, v - 1) for v in range(256))
+# Level -> shade index
+_SHADE_OF = bytes(
+    0 if v == 0 else 5 if v == HEAD_LEVEL else 1 + min(3, v * 4 // HEAD_LEVEL)
+    for v in range(256)
+)
+# Random byte -> glyph, spread evenly over the alphabet
+_GLYPH_OF = bytes(GLYPHS[v * len(GLYPHS) // 256] for v in range(256))
+
+class MatrixRain:
+    """Animation effect: full-screen digital rain for a fixed duration"""
+
+    # Frames are diffs against the previous one; a slow client instead makes frames() fall behind and skip renders
+    droppable = False
+
+    def __init__(self, width=None, height=None, fps=30, duration=5.0, depth=TRUECOLOR, rng=None):
+        size = terminal_size()
+        self.width = width or size.columns
+        self.height = height or max(1, size.lines - 1)
+        self.fps = fps
+        self.interval = 1.0 / fps
+        self.duration = duration
+        self.shades = _SHADES.get(depth, _SHADES[TRUECOLOR])
+        self.rng = rng or random.Random()
+        self.done = False
+        self.reset()
+
+    def reset(self):
+        cells = self.width * self.height
+        self.levels = bytearray(cells)
+        self.glyphs = bytearray(_GLYPH_OF[b] for b in os.urandom(cells))
+        # What the terminal currently shows, as (shade, glyph) buffers
+        self.shown_shades = bytes(cells)
+        self.shown_glyphs = bytes(b' ' * cells)
+        rng = self.rng
+        self.heads = [rng.randrange(-self.height, self.height) for _ in range(self.width)]
+        self.speeds = [rng.choice((1, 1, 2, 3)) for _ in range(self.width)]
+        self.frame_no = 0
+        self.frame_times = []
+        self.dropped = 0
+
+    def step(self):
+        """Advance the simulation by one frame"""
+        width, height = self.width, self.height
+        levels = self.levels.translate(_DECAY)
+        noise = os.urandom(width)
+        glyphs = self.glyphs
+        heads = self.heads
+        frame_no = self.frame_no
+        for x, speed in enumerate(self.speeds):
+            if frame_no % speed:
+                continue
+            y = heads[x] + 1
+            if y >= height + HEAD_LEVEL:
+                # Trail has left the screen: restart above the top after a random gap (of 1 on a one-row screen)
+                y = -self.rng.randrange(1, max(2, height))
+            heads[x] = y
+            if 0 <= y < height:
+                i = y * width + x
+                levels[i] = HEAD_LEVEL
+                glyphs[i] = _GLYPH_OF[noise[x]]
+        self.levels = levels
+        self.frame_no += 1
+
+    def render(self):
+        """Return the escapes that turn the shown frame into the current one"""
+        width = self.width
+        shades = self.levels.translate(_SHADE_OF)
+        glyphs = bytes(self.glyphs)
+        shown_shades, shown_glyphs = self.shown_shades, self.shown_glyphs
+        palette = self.shades
+        out = []
+        current = -1
+        for y in range(self.height):
+            start = y * width
+            end = start + width
+            new_s, new_g = shades[start:end], glyphs[start:end]
+            if new_s == shown_shades[start:end] and new_g == shown_glyphs[start:end]:
+                continue
+            old_s, old_g = shown_shades[start:end], shown_glyphs[start:end]
+            cursor = -1
+            for x in range(width):
+                s = new_s[x]
+                g = new_g[x]
+                # Blank cells draw as spaces, so their stale glyph never matters
+                if s == old_s[x] and (g == old_g[x] or not s):
+                    continue
+                if x != cursor:
+                    out.append(f'\033[{y + 1};{x + 1}H')
+                if s != current:
+                    out.append(palette[s])
+                    current = s
+                out.append(chr(g) if s else ' ')
+                cursor = x + 1
+        self.shown_shades = shades
+        self.shown_glyphs = glyphs
+        return ''.join(out)
+
+    def frames(self):
+        yield ENTER
+        start = time.perf_counter()
+        total = max(1, int(self.duration * self.fps))
+        frame = 0
+        while frame < total and not self.done:
+            began = time.perf_counter()
+            # Behind schedule: advance the simulation without drawing the frames we missed
+            due = int((began - start) * self.fps)
+            while frame < due and frame < total - 1:
+                self.step()
+                frame += 1
+                self.dropped += 1
+            self.step()
+            data = self.render()
+            self.frame_times.append(time.perf_counter() - began)
+            frame += 1
+            yield data
+        if not self.done:
+            self.done = True
+            yield LEAVE
+
+    def skip(self):
+        if self.done:
+            return ''
+        self.done = True
+        return LEAVE
+
+    # Cancelling must leave the alternate screen just like finishing does
+    cancel = skip
+
+    def stats(self):
+        """Frame timing summary: frames drawn, frames dropped, mean and p95 frame time in ms"""
+        times = sorted(self.frame_times)
+        if not times:
+            return {'frames': 0, 'dropped': self.dropped, 'mean_ms': 0.0, 'p95_ms': 0.0}
+        return {
+            'frames': len(times),
+            'dropped': self.dropped,
+            'mean_ms': sum(times) / len(times) * 1000,
+            'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        }
@@ -5,10 +5,24 @@ A beautiful command-line portfolio with autocomplete and interactive features
 """
 
 import os
+import re
 import sys
-import time
 from datetime import datetime
 
+import animation
+import content
+import banner_cache
+import banner_anim
+import profiler
+import recorder
+import search_index
+from ascii_render import render_image, CLASSIC_RAMP, ASCII, RENDER_MODES
+from command_registry import CommandRegistry, STOP
+from completion import CommandCompleter, content_keywords, install_readline
+from command_history import CommandHistory
+from screen_cache import ScreenCache, slot
+from term_caps import detect_color_depth, apply_color_depth
+
 # Color codes for terminal
 class Colors:
     HEADER = '\033[95m'
@@ -25,70 +39,84 @@ class Colors:
     YELLOW = '\033[33m'
     MAGENTA = '\033[35m'
 
+# Pick truecolor / 256 / 16 / no color once, from COLORTERM, TERM and NO_COLOR
+COLOR_DEPTH = detect_color_depth()
+apply_color_depth(Colors, COLOR_DEPTH)
+
+# Banner renderer: 'ascii', 'halfblock' (two pixels per cell with ▀) or 'braille' (2x4 dots per cell)
+BANNER_MODE = os.environ.get('PORTFOLIO_BANNER_MODE', ASCII).lower()
+if BANNER_MODE not in RENDER_MODES:
+    BANNER_MODE = ASCII
+
+# Banner image; an animated GIF or APNG plays once before the welcome message
+BANNER_IMAGE = os.environ.get('PORTFOLIO_BANNER_IMAGE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Charliee.png')
+
+# Command table, filled in once at import by the @COMMANDS.command decorators below
+COMMANDS = CommandRegistry()
+
+# Rendered command screens, memoized per terminal width, color depth and content version
+SCREENS = ScreenCache(COLOR_DEPTH)
+
 def clear_screen():
     """Clear the terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        # Same bytes `clear` emits, written to whatever stdout is (a served session included) without a subprocess
+        sys.stdout.write('\033[H\033[2J\033[3J')
+        sys.stdout.flush()
 
 def type_effect(text, delay=0.03):
-    """Print text with typing effect"""
-    for char in text:
-        sys.stdout.write(char)
-        sys.stdout.flush()
-        time.sleep(delay)
-    print()
+    """Print text with typing effect (any key skips)"""
+    animation.play(animation.typing(text, delay))
+
+def fast_start_enabled():
+    """Check for --fast-start on the command line or PORTFOLIO_FAST=1"""
+    return '--fast-start' in sys.argv[1:] or os.environ.get('PORTFOLIO_FAST') == '1'
 
-def image_to_ascii(image_path, width=80):
+def image_to_ascii(image_path, width=80, lazy=False):
     """Convert image to colored ASCII art"""
+    mode = f'{BANNER_MODE}-{COLOR_DEPTH}'
+
+    def render():
+        # A cold render is mostly the first Pillow import plus the conversion itself
+        with profiler.span('banner.pil_import'):
+            import PIL.Image
+        with profiler.span('banner.render'):
+            return render_image(image_path, width=width, aspect=0.5, ascii_chars=CLASSIC_RAMP, depth=COLOR_DEPTH, mode=BANNER_MODE)
     try:
-        from PIL import Image
-        
-        # Open and resize image
-        img = Image.open(image_path)
-        
-        # Calculate new height to maintain aspect ratio
-        aspect_ratio = img.height / img.width
-        height = int(width * aspect_ratio * 0.5)  # 0.5 because terminal chars are taller than wide
-        
-        # Resize image
-        img = img.resize((width, height))
-        img = img.convert('RGB')
-        
-        # ASCII characters from darkest to lightest
-        ascii_chars = ['@', '#', 'S', '%', '?', '*', '+', ';', ':', ',', '.', ' ']
-        
-        ascii_art = []
-        for y in range(height):
-            line = ""
-            for x in range(width):
-                r, g, b = img.getpixel((x, y))
-                
-                # Calculate brightness
-                brightness = (r + g + b) / 3
-                char_index = int(brightness / 255 * (len(ascii_chars) - 1))
-                char = ascii_chars[len(ascii_chars) - 1 - char_index]
-                
-                # Add color using ANSI escape codes
-                line += f"\033[38;2;{r};{g};{b}m{char}\033[0m"
-            
-            ascii_art.append(line)
-        
-        return '\n'.join(ascii_art)
+        if lazy:
+            # Never block on Pillow: use a cached render, or warm the cache in the background
+            image_ascii = banner_cache.peek(image_path, width, 0.5, CLASSIC_RAMP, mode)
+            if image_ascii is None:
+                banner_cache.warm_in_background(image_path, width, 0.5, CLASSIC_RAMP, render, mode)
+            return image_ascii
+        return banner_cache.cached_render(image_path, width, 0.5, CLASSIC_RAMP, render, mode)
     except ImportError:
         return None
     except Exception as e:
         return None
 
-def print_banner():
+def print_banner(lazy=False, image_path=None):
     """Print banner with image"""
-    
-    # Try to display the PNG image as ASCII art
-    image_path = os.path.join(os.path.dirname(__file__), 'Charliee.png')
-    image_ascii = image_to_ascii(image_path, width=60)
+    image_path = image_path or BANNER_IMAGE
+
+    # Animated banners play from cached frame deltas, rewriting only the cells that change
+    with profiler.span('banner.animation'):
+        animated = banner_anim.play_banner(image_path, 60, 0.5, CLASSIC_RAMP, COLOR_DEPTH, lazy=lazy)
+    if animated:
+        sys.stdout.write('\n')
+        return
+
+    # Try to display the image as ASCII art
+    with profiler.span('banner.lookup'):
+        image_ascii = image_to_ascii(image_path, width=60, lazy=lazy)
     
     if image_ascii:
-        # Display the image
-        print(image_ascii)
-        print()  # Add spacing
+        # Display the image (a cached blob goes straight to stdout)
+        with profiler.span('banner.write'):
+            sys.stdout.write(image_ascii + '\n\n')
+            sys.stdout.flush()
     else:
         # Fallback to text-based ASCII art from file
         ascii_lines = []
@@ -127,208 +155,258 @@ def print_welcome():
     print(f"{Colors.GRAY}Type 'help' to see available commands{Colors.ENDC}")
     print(f"{Colors.GRAY}Type 'exit' or 'quit' to leave{Colors.ENDC}\n")
 
+@COMMANDS.command('help', help='Show this help message')
+@SCREENS.screen
 def cmd_help():
-    """Display help information"""
+    """Display help information, generated from the command registry"""
+    rows = []
+    for commands in COMMANDS.categories().values():
+        for command in commands:
+            rows.append(f"  {Colors.OKGREEN}{command.usage}{Colors.ENDC}{' ' * max(1, 14 - len(command.usage))}{command.help}")
+    
     help_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Available Commands:{Colors.ENDC}
 
-  {Colors.OKGREEN}help{Colors.ENDC}          Show this help message
-  {Colors.OKGREEN}about{Colors.ENDC}         About me and my background
-  {Colors.OKGREEN}skills{Colors.ENDC}        My technical skills and expertise
-  {Colors.OKGREEN}projects{Colors.ENDC}      View my recent projects
-  {Colors.OKGREEN}experience{Colors.ENDC}    Work experience and education
-  {Colors.OKGREEN}contact{Colors.ENDC}       Get in touch with me
-  {Colors.OKGREEN}social{Colors.ENDC}        My social media links
-  {Colors.OKGREEN}resume{Colors.ENDC}        Download my resume
-  {Colors.OKGREEN}clear{Colors.ENDC}         Clear the terminal screen
-  {Colors.OKGREEN}banner{Colors.ENDC}        Display the banner again
-  {Colors.OKGREEN}exit/quit{Colors.ENDC}     Exit the portfolio
+{chr(10).join(rows)}
 
 {Colors.GRAY}Tip: Press TAB for autocomplete suggestions{Colors.ENDC}
 """
-    print(help_text)
+    return help_text + '\n'
 
+@COMMANDS.command('about', help='About me and my background')
+@SCREENS.screen
 def cmd_about():
     """Display about information"""
+    about = content.load().about
     about_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}About Me{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-Hi! I'm a passionate developer who loves creating innovative solutions
-and building amazing digital experiences. I specialize in:
+{chr(10).join(about.intro)} I specialize in:
 
-  • Full-stack web development
-  • Machine Learning & AI
-  • Mobile application development
-  • UI/UX design
+{chr(10).join(f"  • {item}" for icon, item in about.focus)}
 
-With a strong foundation in computer science and a drive for continuous
-learning, I'm always exploring new technologies and pushing the boundaries
-of what's possible.
+{chr(10).join(about.background)}
 
-{Colors.OKGREEN}💡 "Code is poetry written in logic"{Colors.ENDC}
+{Colors.OKGREEN}💡 "{about.quote}"{Colors.ENDC}
 """
-    print(about_text)
+    return about_text + '\n'
+
 
+@COMMANDS.command('skills', help='My technical skills and expertise')
+@SCREENS.screen
 def cmd_skills():
     """Display skills"""
+    skills = content.load().skills
+    bars = '\n'.join(f"  ▸ {skill:<15} {'█' * (level // 5)}{'░' * (20 - level // 5)}  {level}%" for skill, level in skills.languages)
+    groups = '\n\n'.join(
+        f"{Colors.OKGREEN}{group.title}:{Colors.ENDC}\n" + '\n'.join(f"  • {item}" for item in group.items)
+        for group in skills.groups
+    )
     skills_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Technical Skills{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
 {Colors.OKGREEN}Programming Languages:{Colors.ENDC}
-  ▸ Python          ████████████████░░  90%
-  ▸ JavaScript      ███████████████░░░  85%
-  ▸ C++             ██████████████░░░░  80%
-  ▸ Java            ████████████░░░░░░  75%
-  ▸ TypeScript      ███████████░░░░░░░  70%
-
-{Colors.OKGREEN}Web Development:{Colors.ENDC}
-  • Frontend: React, Vue.js, HTML5, CSS3, TailwindCSS
-  • Backend: Node.js, Express, Django, Flask
-  • Database: MongoDB, PostgreSQL, MySQL
-
-{Colors.OKGREEN}Mobile Development:{Colors.ENDC}
-  • React Native
-  • Android (Java/Kotlin)
-  • Flutter
-
-{Colors.OKGREEN}Tools & Technologies:{Colors.ENDC}
-  • Git, GitHub, Docker
-  • AWS, Firebase
-  • Machine Learning: TensorFlow, PyTorch, Scikit-learn
-  • Web Automation: Selenium, Puppeteer
+{bars}
+
+{groups}
 """
-    print(skills_text)
+    return skills_text + '\n'
+
 
-def cmd_projects():
-    """Display projects"""
-    projects_text = f"""
+@COMMANDS.command('projects', help='View my recent projects', arguments=tuple(str(i) for i in range(1, len(content.load().projects) + 1)))
+@SCREENS.screen
+def cmd_projects(invocation):
+    """Display projects (`projects 3` shows only the third)"""
+    header = f"""
 {Colors.OKCYAN}{Colors.BOLD}Recent Projects{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
-
-{Colors.YELLOW}[01]{Colors.ENDC} {Colors.BOLD}JEE-CODE Platform{Colors.ENDC}
-     Online coding platform with multi-language support
-     Tech: React, Node.js, Monaco Editor
-     {Colors.GRAY}⭐ 25+ coding problems | Real-time code execution{Colors.ENDC}
-
-{Colors.YELLOW}[02]{Colors.ENDC} {Colors.BOLD}Indian Sign Language Detection{Colors.ENDC}
-     ML-powered ISL recognition for A-Z alphabets and 0-9 digits
-     Tech: Python, TensorFlow, OpenCV
-     {Colors.GRAY}⭐ Real-time webcam translation{Colors.ENDC}
-
-{Colors.YELLOW}[03]{Colors.ENDC} {Colors.BOLD}Google Form Automation Bot{Colors.ENDC}
-     Intelligent form filling with human-like behavior
-     Tech: Python, Selenium, Google Sheets API
-     {Colors.GRAY}⭐ Resume capability | Random delays for authenticity{Colors.ENDC}
-
-{Colors.YELLOW}[04]{Colors.ENDC} {Colors.BOLD}Monkeytype Clone{Colors.ENDC}
-     Speed typing application with real-time WPM tracking
-     Tech: HTML5, CSS3, Vanilla JavaScript
-     {Colors.GRAY}⭐ Minimalist dark theme | Multiple test modes{Colors.ENDC}
-
-{Colors.YELLOW}[05]{Colors.ENDC} {Colors.BOLD}Terminal Portfolio{Colors.ENDC}
-     Interactive command-line portfolio (you're looking at it!)
-     Tech: Python
-     {Colors.GRAY}⭐ ASCII art | Autocomplete | Command history{Colors.ENDC}
 """
-    print(projects_text)
+    projects = [
+        f"""{Colors.YELLOW}[{number:02d}]{Colors.ENDC} {Colors.BOLD}{project.title}{Colors.ENDC}
+     {project.description}
+     Tech: {', '.join(project.tech)}
+     {Colors.GRAY}⭐ {' | '.join(project.features)}{Colors.ENDC}"""
+        for number, project in enumerate(content.load().projects, 1)
+    ]
+
+    if invocation.args:
+        try:
+            index = int(invocation.args[0])
+        except ValueError:
+            index = 0
+        if not 1 <= index <= len(projects):
+            return f"{Colors.FAIL}No project {invocation.args[0]} (choose 1-{len(projects)}){Colors.ENDC}\n"
+        projects = [projects[index - 1]]
+
+    return header + '\n' + '\n\n'.join(projects) + '\n\n'
 
+
+@COMMANDS.command('experience', help='Work experience and education')
+@SCREENS.screen
 def cmd_experience():
     """Display experience"""
+    experience = content.load().experience
+    roles = '\n\n'.join(
+        f"  {Colors.BOLD}{role.title}{Colors.ENDC}\n  {Colors.GRAY}{role.summary}{Colors.ENDC}\n" + '\n'.join(f"  • {point}" for point in role.points)
+        for role in experience.roles
+    )
     experience_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Experience & Education{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
 {Colors.OKGREEN}📚 Education:{Colors.ENDC}
-  • Bachelor's in Computer Science
-  • Specialized in Machine Learning & Web Development
+  • {experience.education.degree}
+  • {experience.education.focus}
 
 {Colors.OKGREEN}💼 Work Experience:{Colors.ENDC}
-  
-  {Colors.BOLD}Full-Stack Developer{Colors.ENDC}
-  {Colors.GRAY}Building scalable web applications and APIs{Colors.ENDC}
-  • Developed 10+ full-stack projects
-  • Implemented ML models in production
-  • Automated workflows saving 100+ hours
+
+{roles}
 
 {Colors.OKGREEN}🏆 Achievements:{Colors.ENDC}
-  • Built coding platform with 25+ problems
-  • Created multiple automation tools
-  • Developed real-time ML detection systems
+{chr(10).join(f"  • {item}" for item in experience.achievements)}
 """
-    print(experience_text)
+    return experience_text + '\n'
+
 
+@COMMANDS.command('contact', help='Get in touch with me')
+@SCREENS.screen
 def cmd_contact():
     """Display contact information"""
+    rows = '\n'.join(f"{Colors.OKGREEN}{icon} {label}:{Colors.ENDC}{' ' * (10 - len(label))}{value}" for icon, label, value in content.load().contact.rows)
     contact_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Contact Information{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-{Colors.OKGREEN}📧 Email:{Colors.ENDC}     your.email@example.com
-{Colors.OKGREEN}📱 Phone:{Colors.ENDC}     +91 XXXXX-XXXXX
-{Colors.OKGREEN}🌍 Location:{Colors.ENDC}  India
-{Colors.OKGREEN}💼 LinkedIn:{Colors.ENDC}  linkedin.com/in/yourprofile
-{Colors.OKGREEN}🐱 GitHub:{Colors.ENDC}    github.com/yourusername
+{rows}
 
 {Colors.YELLOW}Feel free to reach out for collaborations or opportunities!{Colors.ENDC}
 """
-    print(contact_text)
+    return contact_text + '\n'
 
+
+@COMMANDS.command('social', help='My social media links')
+@SCREENS.screen
 def cmd_social():
     """Display social media links"""
+    links = '\n'.join(f"{Colors.OKGREEN}{link.label}:{Colors.ENDC}{' ' * (11 - len(link.label))}{link.url}" for link in content.load().social)
     social_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Social Media{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-{Colors.OKGREEN}GitHub:{Colors.ENDC}     https://github.com/yourusername
-{Colors.OKGREEN}LinkedIn:{Colors.ENDC}   https://linkedin.com/in/yourprofile
-{Colors.OKGREEN}Twitter:{Colors.ENDC}    https://twitter.com/yourusername
-{Colors.OKGREEN}Instagram:{Colors.ENDC}  https://instagram.com/yourusername
-{Colors.OKGREEN}Portfolio:{Colors.ENDC}  https://yourwebsite.com
+{links}
 """
-    print(social_text)
+    return social_text + '\n'
+
 
+def resume_slots():
+    """Dynamic parts of the resume screen"""
+    return {'updated': datetime.now().strftime('%B %Y')}
+
+@COMMANDS.command('resume', help='Download my resume')
+@SCREENS.template(resume_slots)
 def cmd_resume():
     """Display resume download information"""
+    label, url = content.load().resume.links[0]
     resume_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Resume{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
 {Colors.OKGREEN}📄 Download my resume:{Colors.ENDC}
-   https://yourwebsite.com/resume.pdf
+   {url}
 
 {Colors.YELLOW}Or scan the QR code:{Colors.ENDC}
    [QR code would appear here in GUI version]
 
-{Colors.GRAY}Last updated: {datetime.now().strftime('%B %Y')}{Colors.ENDC}
+{Colors.GRAY}Last updated: {slot('updated')}{Colors.ENDC}
 """
-    print(resume_text)
+    return resume_text + '\n'
+
+def search_sources():
+    """(command, screen text) for every screen the search command covers"""
+    return [
+        ('about', cmd_about.screen()),
+        ('skills', cmd_skills.screen()),
+        ('projects', cmd_projects.screen(COMMANDS.resolve('projects')[1])),
+        ('experience', cmd_experience.screen()),
+        ('contact', cmd_contact.screen()),
+        ('social', cmd_social.screen()),
+        ('resume', cmd_resume.screen()),
+    ]
+
+@COMMANDS.command('search', help='Search the whole portfolio', usage='search <terms>')
+def cmd_search(invocation):
+    """Ranked full-text search over every screen (`search opencv`)"""
+    query = ' '.join(invocation.args)
+    if not query:
+        print(f"{Colors.WARNING}Usage: search <terms>{Colors.ENDC}")
+        return
+    # Built on first use, then loaded from disk until content.json or this script changes
+    index = search_index.load_or_build('classic', (content.load().digest, os.stat(__file__).st_mtime_ns), search_sources)
+    results = index.search(query)
+    if not results:
+        print(f"{Colors.WARNING}No matches for \"{query}\"{Colors.ENDC}")
+        return
+
+    highlight = lambda word: f"{Colors.BOLD}{Colors.YELLOW}{word}{Colors.ENDC}"
+    print(f"{Colors.OKCYAN}{Colors.BOLD}Results for \"{query}\"{Colors.ENDC}")
+    print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}")
+    for number, (score, doc_id) in enumerate(results, 1):
+        command, title, text, length = index.docs[doc_id]
+        # Numbered entries ("[02] ...") open on their own, e.g. `projects 2`
+        entry = re.match(r'\[(\d+)\]', title)
+        target = f"{command} {int(entry.group(1))}" if entry else command
+        print(f"\n  {number}. {search_index.snippet(title, query, highlight)}  {Colors.GRAY}({target}){Colors.ENDC}")
+        rest = text.split('\n', 1)[1:]
+        if rest:
+            print(f"     {search_index.snippet(rest[0], query, highlight)}")
+
+@COMMANDS.command('stats', hidden=True, help='Timing percentiles for this session (run with --profile)')
+def cmd_stats():
+    """Show the span timings collected by --profile"""
+    if not profiler.ENABLED:
+        print(f"{Colors.GRAY}Profiling is off; start with --profile to collect timings{Colors.ENDC}")
+        return
+    print(f"{Colors.OKCYAN}{Colors.BOLD}Timings{Colors.ENDC}")
+    print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}\n")
+    print(profiler.format_summary())
+    print(f"\n{Colors.GRAY}Screen cache: {SCREENS.hits} hits, {SCREENS.misses} misses{Colors.ENDC}")
 
 def cmd_unknown(cmd):
     """Handle unknown commands"""
     print(f"{Colors.FAIL}Command not found: {cmd}{Colors.ENDC}")
     print(f"{Colors.GRAY}Type 'help' to see available commands{Colors.ENDC}\n")
 
-# Command mapping
-COMMANDS = {
-    'help': cmd_help,
-    'about': cmd_about,
-    'skills': cmd_skills,
-    'projects': cmd_projects,
-    'experience': cmd_experience,
-    'contact': cmd_contact,
-    'social': cmd_social,
-    'resume': cmd_resume,
-    'banner': lambda: (clear_screen(), print_banner(), print_welcome()),
-    'clear': lambda: (clear_screen(), print_banner(), print_welcome()),
-}
+@COMMANDS.command('banner', help='Display the banner again')
+@COMMANDS.command('clear', help='Clear the terminal screen')
+def cmd_clear():
+    """Clear the screen and show the banner again"""
+    clear_screen()
+    print_banner()
+    print_welcome()
+
+@COMMANDS.command('exit', aliases=('quit', 'q'), help='Exit the portfolio', usage='exit/quit')
+def cmd_exit():
+    """Say goodbye and end the session"""
+    print(f"{Colors.OKCYAN}Thanks for visiting my portfolio!{Colors.ENDC}")
+    print(f"{Colors.GRAY}See you soon! 👋{Colors.ENDC}\n")
+    return STOP
+
+# Prefix index over every registered name, alias and argument, plus typo matching that
+# also knows content keywords ("opencv" -> projects 2); built once all commands exist
+COMPLETER = CommandCompleter(COMMANDS, content_keywords(content.load()))
 
 def get_suggestions(partial_cmd):
-    """Get command suggestions based on partial input"""
-    if not partial_cmd:
-        return list(COMMANDS.keys())
-    return [cmd for cmd in COMMANDS.keys() if cmd.startswith(partial_cmd.lower())]
+    """Get command suggestions based on partial input (same index as TAB completion)"""
+    return COMPLETER.suggest(partial_cmd)
+
+def suggestion_label(line, word, distance):
+    """A typo match with the word it matched and how many edits away it was"""
+    notes = [] if word == line else [word]
+    if distance:
+        notes.append(f"{distance} edit{'s' if distance > 1 else ''}")
+    return f"{line}{Colors.GRAY}  ({', '.join(notes)})" if notes else line
 
 def print_suggestions(suggestions):
     """Print autocomplete suggestions"""
@@ -338,10 +416,12 @@ def print_suggestions(suggestions):
 def main():
     """Main function"""
     clear_screen()
-    print_banner()
+    print_banner(lazy=fast_start_enabled())
     print_welcome()
     
-    command_history = []
+    command_history = CommandHistory()
+    install_readline(COMPLETER)
+    command_history.attach_readline()
     
     while True:
         try:
@@ -352,32 +432,32 @@ def main():
                 continue
             
             # Add to history
-            command_history.append(user_input)
-            
-            # Parse command
-            cmd = user_input.lower()
+            command_history.add(user_input)
             
-            # Check for exit commands
-            if cmd in ['exit', 'quit', 'q']:
-                print(f"\n{Colors.OKCYAN}Thanks for visiting my portfolio!{Colors.ENDC}")
-                print(f"{Colors.GRAY}See you soon! 👋{Colors.ENDC}\n")
-                break
+            # Parse command and arguments (e.g. "projects 3")
+            command, invocation = COMMANDS.resolve(user_input, history=command_history)
             
             # Check if command exists
-            if cmd in COMMANDS:
+            if command:
                 print()
-                COMMANDS[cmd]()
+                if command.run(invocation) is STOP:
+                    break
                 print()
+                with profiler.span('output.flush'):
+                    sys.stdout.flush()
             else:
                 # Show suggestions for partial matches
-                suggestions = get_suggestions(cmd)
+                suggestions = get_suggestions(invocation.name)
+                if not suggestions:
+                    # No prefix match: fall back to typo-tolerant matches, closest first
+                    suggestions = [suggestion_label(*match) for match in COMPLETER.fuzzy(invocation.name)]
                 if suggestions and len(suggestions) <= 5:
                     print(f"{Colors.WARNING}Did you mean:{Colors.ENDC}")
                     for suggestion in suggestions:
                         print(f"  • {Colors.OKGREEN}{suggestion}{Colors.ENDC}")
                     print()
                 else:
-                    cmd_unknown(cmd)
+                    cmd_unknown(invocation.name)
         
         except KeyboardInterrupt:
             print(f"\n\n{Colors.OKCYAN}Thanks for visiting my portfolio!{Colors.ENDC}")
@@ -389,4 +469,6 @@ def main():
             print(f"{Colors.FAIL}Error: {str(e)}{Colors.ENDC}\n")
 
 if __name__ == "__main__":
+    profiler.from_argv()
+    recorder.from_argv(title='Terminal Portfolio')
     main()
@@ -5,11 +5,26 @@ Includes: Progress animations, Easter eggs, and more interactivity
 """
 
 import os
+import re
 import sys
-import time
 import random
 from datetime import datetime
 
+import animation
+import content
+import banner_cache
+import banner_anim
+import profiler
+import recorder
+import search_index
+from ascii_render import render_image, DETAILED_RAMP, ASCII, RENDER_MODES
+from matrix_rain import MatrixRain
+from command_registry import CommandRegistry, STOP
+from completion import CommandCompleter, content_keywords, install_readline
+from command_history import CommandHistory
+from screen_cache import ScreenCache, slot
+from term_caps import detect_color_depth, apply_color_depth
+
 # Color codes for terminal
 class Colors:
     # Basic colors
@@ -33,82 +48,98 @@ class Colors:
     BLUE = '\033[34m'
     CYAN = '\033[36m'
 
+# Pick truecolor / 256 / 16 / no color once, from COLORTERM, TERM and NO_COLOR
+COLOR_DEPTH = detect_color_depth()
+apply_color_depth(Colors, COLOR_DEPTH)
+
+# Banner renderer: 'ascii', 'halfblock' (two pixels per cell with ▀) or 'braille' (2x4 dots per cell)
+BANNER_MODE = os.environ.get('PORTFOLIO_BANNER_MODE', ASCII).lower()
+if BANNER_MODE not in RENDER_MODES:
+    BANNER_MODE = ASCII
+
+# Banner image; an animated GIF or APNG plays once before the welcome message
+BANNER_IMAGE = os.environ.get('PORTFOLIO_BANNER_IMAGE') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Charliee.png')
+
+# Target frame rate for the full-screen matrix effect
+MATRIX_FPS = int(os.environ.get('PORTFOLIO_MATRIX_FPS', '30'))
+
+# Command table, filled in once at import by the @COMMANDS.command decorators below
+COMMANDS = CommandRegistry()
+
+# Rendered command screens, memoized per terminal width, color depth and content version
+SCREENS = ScreenCache(COLOR_DEPTH)
+
 def clear_screen():
     """Clear the terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        # Same bytes `clear` emits, written to whatever stdout is (a served session included) without a subprocess
+        sys.stdout.write('\033[H\033[2J\033[3J')
+        sys.stdout.flush()
 
 def type_effect(text, delay=0.03):
-    """Print text with typing effect"""
-    for char in text:
-        sys.stdout.write(char)
-        sys.stdout.flush()
-        time.sleep(delay)
-    print()
+    """Print text with typing effect (any key skips)"""
+    animation.play(animation.typing(text, delay))
 
-def loading_animation(text="Loading", duration=2):
-    """Display a loading animation"""
+def spinner(text, duration):
+    """Spinner effect that ends with a Done line"""
     chars = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-    end_time = time.time() + duration
-    i = 0
-    while time.time() < end_time:
-        sys.stdout.write(f'\r{Colors.OKCYAN}{chars[i % len(chars)]} {text}...{Colors.ENDC}')
-        sys.stdout.flush()
-        time.sleep(0.1)
-        i += 1
-    print(f'\r{Colors.OKGREEN}✓ Done!{Colors.ENDC}           ')
+    frames = [f'\r{Colors.OKCYAN}{chars[i % len(chars)]} {text}...{Colors.ENDC}'
+              for i in range(max(1, round(duration / 0.1)))]
+    return animation.Transient(frames, 0.1, final=f'\r{Colors.OKGREEN}✓ Done!{Colors.ENDC}           \n')
 
-def image_to_ascii(image_path, width=100):
+def loading_animation(text="Loading", duration=2):
+    """Display a loading animation (any key skips)"""
+    animation.play(spinner(text, duration))
+
+def fast_start_enabled():
+    """Check for --fast-start on the command line or PORTFOLIO_FAST=1"""
+    return '--fast-start' in sys.argv[1:] or os.environ.get('PORTFOLIO_FAST') == '1'
+
+def image_to_ascii(image_path, width=100, lazy=False):
     """Convert image to colored ASCII art with better detail"""
+    mode = f'{BANNER_MODE}-{COLOR_DEPTH}'
+
+    def render():
+        # A cold render is mostly the first Pillow import plus the conversion itself
+        with profiler.span('banner.pil_import'):
+            import PIL.Image
+        with profiler.span('banner.render'):
+            return render_image(image_path, width=width, aspect=0.45, ascii_chars=DETAILED_RAMP, depth=COLOR_DEPTH, mode=BANNER_MODE)
     try:
-        from PIL import Image
-        
-        # Open and resize image
-        img = Image.open(image_path)
-        
-        # Calculate new height to maintain aspect ratio
-        aspect_ratio = img.height / img.width
-        height = int(width * aspect_ratio * 0.45)  # Adjusted for better aspect ratio
-        
-        # Resize image
-        img = img.resize((width, height))
-        img = img.convert('RGB')
-        
-        # More detailed ASCII characters for better quality
-        ascii_chars = ['█', '▓', '▒', '░', '@', '#', 'S', '%', '?', '*', '+', ';', ':', ',', '.', ' ']
-        
-        ascii_art = []
-        for y in range(height):
-            line = ""
-            for x in range(width):
-                r, g, b = img.getpixel((x, y))
-                
-                # Calculate brightness
-                brightness = (r + g + b) / 3
-                char_index = int(brightness / 255 * (len(ascii_chars) - 1))
-                char = ascii_chars[len(ascii_chars) - 1 - char_index]
-                
-                # Add color using ANSI escape codes (True Color RGB)
-                line += f"\033[38;2;{r};{g};{b}m{char}\033[0m"
-            
-            ascii_art.append(line)
-        
-        return '\n'.join(ascii_art)
+        if lazy:
+            # Never block on Pillow: use a cached render, or warm the cache in the background
+            image_ascii = banner_cache.peek(image_path, width, 0.45, DETAILED_RAMP, mode)
+            if image_ascii is None:
+                banner_cache.warm_in_background(image_path, width, 0.45, DETAILED_RAMP, render, mode)
+            return image_ascii
+        return banner_cache.cached_render(image_path, width, 0.45, DETAILED_RAMP, render, mode)
     except ImportError:
         return None
     except Exception as e:
         return None
 
-def print_banner():
+def print_banner(lazy=False, image_path=None):
     """Print banner with image"""
-    
-    # Try to display the PNG image as high-quality ASCII art
-    image_path = os.path.join(os.path.dirname(__file__), 'Charliee.png')
-    image_ascii = image_to_ascii(image_path, width=100)  # Larger width for more detail
+    image_path = image_path or BANNER_IMAGE
+
+    # Animated banners play from cached frame deltas, rewriting only the cells that change
+    with profiler.span('banner.animation'):
+        animated = banner_anim.play_banner(image_path, 100, 0.45, DETAILED_RAMP, COLOR_DEPTH, lazy=lazy)
+    if animated:
+        sys.stdout.write('\n')
+        return
+
+    # Try to display the image as high-quality ASCII art
+    with profiler.span('banner.lookup'):
+        image_ascii = image_to_ascii(image_path, width=100, lazy=lazy)  # Larger width for more detail
     
     if image_ascii:
-        # Display the image
-        print(image_ascii)
-        print()  # Add spacing
+        # Display the image (a cached blob goes straight to stdout)
+        with profiler.span('banner.write'):
+            sys.stdout.write(image_ascii + '\n\n')
+            sys.stdout.flush()
     else:
         # Fallback to text-based ASCII art from file
         ascii_lines = []
@@ -147,374 +178,364 @@ def print_welcome():
     print(f"{Colors.GRAY}Type 'help' to see available commands{Colors.ENDC}")
     print(f"{Colors.GRAY}Type 'exit' or 'quit' to leave{Colors.ENDC}\n")
 
+@COMMANDS.command('help', category='📋 Information Commands', help='Show this help message')
+@SCREENS.screen
 def cmd_help():
-    """Display help information"""
+    """Display help information, generated from the command registry"""
+    sections = []
+    for category, commands in COMMANDS.categories().items():
+        rows = [f"{Colors.OKGREEN}{category}:{Colors.ENDC}"]
+        for command in commands:
+            rows.append(f"  {Colors.BOLD}{command.usage}{Colors.ENDC}{' ' * max(1, 14 - len(command.usage))}{command.help}")
+        sections.append('\n'.join(rows))
+    
     help_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}╔═══════════════════════════════════════════════════════════╗
 ║                    AVAILABLE COMMANDS                     ║
 ╚═══════════════════════════════════════════════════════════╝{Colors.ENDC}
 
-{Colors.OKGREEN}📋 Information Commands:{Colors.ENDC}
-  {Colors.BOLD}help{Colors.ENDC}          Show this help message
-  {Colors.BOLD}about{Colors.ENDC}         About me and my background
-  {Colors.BOLD}whoami{Colors.ENDC}        Quick introduction
-
-{Colors.OKGREEN}💼 Professional:{Colors.ENDC}
-  {Colors.BOLD}skills{Colors.ENDC}        My technical skills and expertise
-  {Colors.BOLD}projects{Colors.ENDC}      View my recent projects
-  {Colors.BOLD}experience{Colors.ENDC}    Work experience and education
-  {Colors.BOLD}resume{Colors.ENDC}        Download my resume
-
-{Colors.OKGREEN}📞 Contact & Social:{Colors.ENDC}
-  {Colors.BOLD}contact{Colors.ENDC}       Get in touch with me
-  {Colors.BOLD}social{Colors.ENDC}        My social media links
-  {Colors.BOLD}email{Colors.ENDC}         Send me an email
-
-{Colors.OKGREEN}🎮 Fun & Extras:{Colors.ENDC}
-  {Colors.BOLD}quote{Colors.ENDC}         Random inspirational quote
-  {Colors.BOLD}joke{Colors.ENDC}          Random programming joke
-  {Colors.BOLD}matrix{Colors.ENDC}        Matrix effect (Easter egg!)
-  {Colors.BOLD}hack{Colors.ENDC}          Hacking simulator (Easter egg!)
-
-{Colors.OKGREEN}🔧 Utilities:{Colors.ENDC}
-  {Colors.BOLD}clear{Colors.ENDC}         Clear the terminal screen
-  {Colors.BOLD}banner{Colors.ENDC}        Display the banner again
-  {Colors.BOLD}time{Colors.ENDC}          Show current time
-  {Colors.BOLD}history{Colors.ENDC}       Show command history
-
-{Colors.OKGREEN}🚪 Exit:{Colors.ENDC}
-  {Colors.BOLD}exit/quit{Colors.ENDC}     Exit the portfolio
-
+{chr(10).join(section + chr(10) for section in sections)}
 {Colors.GRAY}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 💡 Tip: Try typing partial commands for autocomplete suggestions!
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}
 """
-    print(help_text)
+    return help_text + '\n'
 
+@COMMANDS.command('whoami', category='📋 Information Commands', help='Quick introduction')
+@SCREENS.screen
 def cmd_whoami():
     """Quick introduction"""
+    profile = content.load().profile
     text = f"""
 {Colors.OKCYAN}{Colors.BOLD}$ whoami{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-{Colors.OKGREEN}Developer • Designer • Problem Solver{Colors.ENDC}
+{Colors.OKGREEN}{profile.tagline}{Colors.ENDC}
 
-A passionate tech enthusiast who turns coffee into code ☕
-and ideas into reality 💡
+{chr(10).join(profile.blurb)}
 
-{Colors.YELLOW}Current Status:{Colors.ENDC} Available for exciting opportunities!
-{Colors.YELLOW}Location:{Colors.ENDC} India 🇮🇳
-{Colors.YELLOW}Interests:{Colors.ENDC} Web Dev, ML/AI, Automation, Open Source
+{Colors.YELLOW}Current Status:{Colors.ENDC} {profile.status}
+{Colors.YELLOW}Location:{Colors.ENDC} {profile.location}
+{Colors.YELLOW}Interests:{Colors.ENDC} {', '.join(profile.interests)}
 
 {Colors.GRAY}Type 'about' for more details{Colors.ENDC}
 """
-    print(text)
+    return text + '\n'
 
+
+@COMMANDS.command('about', category='📋 Information Commands', help='About me and my background')
+@SCREENS.screen
 def cmd_about():
     """Display about information"""
+    about = content.load().about
+    focus = '\n'.join(f"  • {icon} {item}" for icon, item in about.focus)
+    offline = '\n'.join(f"  • {item}" for item in about.offline)
     about_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}About Me{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-Hi! 👋 I'm a passionate developer who loves creating innovative solutions
-and building amazing digital experiences. 
+{chr(10).join(about.intro)}
 
 {Colors.OKGREEN}What I Do:{Colors.ENDC}
-  • 🌐 Full-stack web development
-  • 🤖 Machine Learning & AI
-  • 📱 Mobile application development
-  • 🎨 UI/UX design
-  • ⚡ Automation & scripting
+{focus}
 
 {Colors.OKGREEN}My Philosophy:{Colors.ENDC}
-I believe in writing clean, efficient code and creating user experiences
-that make a difference. Every project is an opportunity to learn something
-new and push the boundaries of what's possible.
+{chr(10).join(about.philosophy)}
 
 {Colors.OKGREEN}When I'm Not Coding:{Colors.ENDC}
-  • 📚 Reading tech blogs and documentation
-  • 🎮 Exploring new technologies
-  • 💡 Working on side projects
-  • 🌱 Contributing to open source
+{offline}
 
-{Colors.YELLOW}💡 "Code is poetry written in logic"{Colors.ENDC}
+{Colors.YELLOW}💡 "{about.quote}"{Colors.ENDC}
 """
-    print(about_text)
+    return about_text + '\n'
+
 
-def cmd_skills():
-    """Display skills with animated progress bars"""
+@COMMANDS.command('skills', category='💼 Professional', help='My technical skills and expertise', arguments=('--no-anim',))
+def cmd_skills(invocation):
+    """Display skills with animated progress bars (`skills --no-anim` prints them at once)"""
     print(f"\n{Colors.OKCYAN}{Colors.BOLD}Technical Skills{Colors.ENDC}")
     print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}\n")
-    
-    skills = [
-        ("Python", 90),
-        ("JavaScript", 85),
-        ("C++", 80),
-        ("Java", 75),
-        ("TypeScript", 70),
-    ]
-    
-    print(f"{Colors.OKGREEN}Programming Languages:{Colors.ENDC}")
-    for skill, level in skills:
+    # Any key (or --no-anim) shows the rest at once
+    animation.play(skills_effect(), animate=not invocation.flag('no_anim'))
+
+def skills_effect():
+    """The skills screen below its heading, revealing one line every 0.1s"""
+    skills = content.load().skills
+    bars = []
+    for skill, level in skills.languages:
         filled = int(level / 5)
         empty = 20 - filled
         bar = f"{Colors.OKGREEN}{'█' * filled}{Colors.GRAY}{'░' * empty}{Colors.ENDC}"
-        print(f"  ▸ {skill:<15} {bar}  {level}%")
-        time.sleep(0.1)
-    
-    print(f"\n{Colors.OKGREEN}Web Development:{Colors.ENDC}")
-    web_skills = [
-        "• Frontend: React, Vue.js, HTML5, CSS3, TailwindCSS",
-        "• Backend: Node.js, Express, Django, Flask",
-        "• Database: MongoDB, PostgreSQL, MySQL, Firebase"
-    ]
-    for skill in web_skills:
-        print(f"  {skill}")
-        time.sleep(0.1)
-    
-    print(f"\n{Colors.OKGREEN}Mobile Development:{Colors.ENDC}")
-    mobile_skills = ["React Native", "Android (Java/Kotlin)", "Flutter"]
-    for skill in mobile_skills:
-        print(f"  • {skill}")
-        time.sleep(0.1)
-    
-    print(f"\n{Colors.OKGREEN}Tools & Technologies:{Colors.ENDC}")
-    tools = [
-        "• Version Control: Git, GitHub",
-        "• DevOps: Docker, AWS, Firebase",
-        "• ML/AI: TensorFlow, PyTorch, Scikit-learn, OpenCV",
-        "• Automation: Selenium, Puppeteer, BeautifulSoup"
-    ]
-    for tool in tools:
-        print(f"  {tool}")
-        time.sleep(0.1)
-    print()
+        bars.append(f"  ▸ {skill:<15} {bar}  {level}%")
 
-def cmd_projects():
-    """Display projects"""
-    projects_text = f"""
+    effects = [
+        animation.text(f"{Colors.OKGREEN}Programming Languages:{Colors.ENDC}\n"),
+        animation.lines(bars),
+    ]
+    for group in skills.groups:
+        effects.append(animation.text(f"\n{Colors.OKGREEN}{group.title}:{Colors.ENDC}\n"))
+        effects.append(animation.lines(f"  • {item}" for item in group.items))
+    effects.append(animation.text("\n"))
+    return animation.Sequence(*effects)
+
+
+@COMMANDS.command('projects', category='💼 Professional', help='View my recent projects', arguments=tuple(str(i) for i in range(1, len(content.load().projects) + 1)))
+@SCREENS.screen
+def cmd_projects(invocation):
+    """Display projects (`projects 3` shows only the third)"""
+    info = content.load()
+    header = f"""
 {Colors.OKCYAN}{Colors.BOLD}Featured Projects{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
-
-{Colors.YELLOW}[01]{Colors.ENDC} {Colors.BOLD}JEE-CODE Platform{Colors.ENDC}
-     {Colors.GRAY}Competitive coding platform with multi-language support{Colors.ENDC}
-     {Colors.OKBLUE}Tech:{Colors.ENDC} React, Node.js, Monaco Editor, Express
-     {Colors.OKGREEN}⭐ Features:{Colors.ENDC} 25+ problems | Real-time execution | Test cases
-     {Colors.GRAY}┗━► Status: Live & Production Ready{Colors.ENDC}
-
-{Colors.YELLOW}[02]{Colors.ENDC} {Colors.BOLD}Indian Sign Language Detection{Colors.ENDC}
-     {Colors.GRAY}ML-powered ISL recognition system{Colors.ENDC}
-     {Colors.OKBLUE}Tech:{Colors.ENDC} Python, TensorFlow, OpenCV, Mediapipe
-     {Colors.OKGREEN}⭐ Features:{Colors.ENDC} A-Z alphabets | 0-9 digits | Real-time detection
-     {Colors.GRAY}┗━► Accuracy: 94%+ on test dataset{Colors.ENDC}
-
-{Colors.YELLOW}[03]{Colors.ENDC} {Colors.BOLD}Google Form Automation Bot{Colors.ENDC}
-     {Colors.GRAY}Intelligent form filling with human-like behavior{Colors.ENDC}
-     {Colors.OKBLUE}Tech:{Colors.ENDC} Python, Selenium, Google Sheets API
-     {Colors.OKGREEN}⭐ Features:{Colors.ENDC} Auto-resume | Smart delays | Error recovery
-     {Colors.GRAY}┗━► Processed 1000+ forms successfully{Colors.ENDC}
-
-{Colors.YELLOW}[04]{Colors.ENDC} {Colors.BOLD}Monkeytype Clone{Colors.ENDC}
-     {Colors.GRAY}Speed typing application with real-time metrics{Colors.ENDC}
-     {Colors.OKBLUE}Tech:{Colors.ENDC} HTML5, CSS3, Vanilla JavaScript
-     {Colors.OKGREEN}⭐ Features:{Colors.ENDC} WPM tracking | Multiple modes | Dark theme
-     {Colors.GRAY}┗━► 60 FPS smooth animation{Colors.ENDC}
-
-{Colors.YELLOW}[05]{Colors.ENDC} {Colors.BOLD}Terminal Portfolio{Colors.ENDC}
-     {Colors.GRAY}Interactive CLI portfolio (you're using it!){Colors.ENDC}
-     {Colors.OKBLUE}Tech:{Colors.ENDC} Python, ANSI colors
-     {Colors.OKGREEN}⭐ Features:{Colors.ENDC} Autocomplete | Easter eggs | Animations
-     {Colors.GRAY}┗━► Pure Python, no dependencies{Colors.ENDC}
-
+"""
+    projects = [
+        f"""{Colors.YELLOW}[{number:02d}]{Colors.ENDC} {Colors.BOLD}{project.title}{Colors.ENDC}
+     {Colors.GRAY}{project.description}{Colors.ENDC}
+     {Colors.OKBLUE}Tech:{Colors.ENDC} {', '.join(project.tech)}
+     {Colors.OKGREEN}⭐ Features:{Colors.ENDC} {' | '.join(project.features)}
+     {Colors.GRAY}┗━► {project.note}{Colors.ENDC}"""
+        for number, project in enumerate(info.projects, 1)
+    ]
+    footer = f"""
 {Colors.GRAY}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-View all projects: github.com/yourusername
+View all projects: {info.contact.github}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Colors.ENDC}
 """
-    print(projects_text)
 
+    if invocation.args:
+        try:
+            index = int(invocation.args[0])
+        except ValueError:
+            index = 0
+        if not 1 <= index <= len(projects):
+            return f"{Colors.FAIL}❌ No project {invocation.args[0]} (choose 1-{len(projects)}){Colors.ENDC}\n"
+        projects = [projects[index - 1]]
+
+    return header + '\n' + '\n\n'.join(projects) + '\n' + footer + '\n'
+
+
+@COMMANDS.command('experience', category='💼 Professional', help='Work experience and education')
+@SCREENS.screen
 def cmd_experience():
     """Display experience"""
+    experience = content.load().experience
+    education = experience.education
+    roles = '\n\n'.join(
+        f"  {Colors.BOLD}{role.title}{Colors.ENDC} {Colors.GRAY}| {role.period}{Colors.ENDC}\n" + '\n'.join(f"  • {point}" for point in role.points)
+        for role in experience.roles
+    )
     experience_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Experience & Education{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
 {Colors.OKGREEN}📚 Education:{Colors.ENDC}
-  {Colors.BOLD}Bachelor of Technology in Computer Science{Colors.ENDC}
-  {Colors.GRAY}Specialized in Machine Learning & Web Development{Colors.ENDC}
-  • Graduated with Honors
-  • Relevant Coursework: DS&A, DBMS, ML, AI, Web Technologies
+  {Colors.BOLD}{education.degree}{Colors.ENDC}
+  {Colors.GRAY}{education.focus}{Colors.ENDC}
+{chr(10).join(f"  • {note}" for note in education.notes)}
 
 {Colors.OKGREEN}💼 Professional Experience:{Colors.ENDC}
-  
-  {Colors.BOLD}Full-Stack Developer{Colors.ENDC} {Colors.GRAY}| 2023 - Present{Colors.ENDC}
-  • Developed 10+ full-stack web applications
-  • Implemented ML models in production environments
-  • Created automation tools saving 100+ hours of manual work
-  • Mentored junior developers and conducted code reviews
+
+{roles}
 
 {Colors.OKGREEN}🏆 Achievements:{Colors.ENDC}
-  • 🥇 Built coding platform serving 1000+ users
-  • 🚀 Developed 5+ production-ready ML models
-  • ⚡ Automated workflows reducing processing time by 80%
-  • 💻 Contributed to 10+ open-source projects
-  • 📊 Improved application performance by 60%
+{chr(10).join(f"  • {item}" for item in experience.achievements)}
 
 {Colors.OKGREEN}📜 Certifications:{Colors.ENDC}
-  • Machine Learning Specialization
-  • Full-Stack Web Development
-  • Cloud Computing Fundamentals
+{chr(10).join(f"  • {item}" for item in experience.certifications)}
 """
-    print(experience_text)
+    return experience_text + '\n'
 
+
+@COMMANDS.command('contact', category='📞 Contact & Social', help='Get in touch with me')
+@SCREENS.screen
 def cmd_contact():
     """Display contact information"""
+    contact = content.load().contact
+    rows = '\n'.join(f"{Colors.OKGREEN}{icon} {label}:{Colors.ENDC}{' ' * (14 - len(label))}{value}" for icon, label, value in contact.rows)
+    box = '\n'.join(f"║  {line}{' ' * (56 - len(line))}║" for line in contact.availability)
     contact_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Contact Information{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-{Colors.OKGREEN}📧 Email:{Colors.ENDC}         your.email@example.com
-{Colors.OKGREEN}📱 Phone:{Colors.ENDC}         +91 XXXXX-XXXXX
-{Colors.OKGREEN}🌍 Location:{Colors.ENDC}      India
-{Colors.OKGREEN}💼 LinkedIn:{Colors.ENDC}      linkedin.com/in/yourprofile
-{Colors.OKGREEN}🐱 GitHub:{Colors.ENDC}        github.com/yourusername
-{Colors.OKGREEN}🌐 Website:{Colors.ENDC}       yourwebsite.com
-{Colors.OKGREEN}💬 Discord:{Colors.ENDC}       yourusername#1234
+{rows}
 
 {Colors.YELLOW}╔═══════════════════════════════════════════════════════════╗
-║  💼 Currently open to exciting opportunities!             ║
-║  📬 Feel free to reach out for collaborations!            ║
+{box}
 ╚═══════════════════════════════════════════════════════════╝{Colors.ENDC}
 
-{Colors.GRAY}Response time: Usually within 24 hours{Colors.ENDC}
+{Colors.GRAY}Response time: {contact.response_time}{Colors.ENDC}
 """
-    print(contact_text)
+    return contact_text + '\n'
+
 
+@COMMANDS.command('social', category='📞 Contact & Social', help='My social media links')
+@SCREENS.screen
 def cmd_social():
     """Display social media links"""
+    links = '\n\n'.join(
+        f"{Colors.OKGREEN}{link.icon} {link.label}:{Colors.ENDC}{' ' * (13 - len(link.label))}{link.url}\n"
+        f"                    {Colors.GRAY}↳ {link.note}{Colors.ENDC}"
+        for link in content.load().social
+    )
     social_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Social Media & Links{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-{Colors.OKGREEN}🐱 GitHub:{Colors.ENDC}       https://github.com/yourusername
-                    {Colors.GRAY}↳ Check out my open-source projects!{Colors.ENDC}
-
-{Colors.OKGREEN}💼 LinkedIn:{Colors.ENDC}     https://linkedin.com/in/yourprofile
-                    {Colors.GRAY}↳ Let's connect professionally!{Colors.ENDC}
-
-{Colors.OKGREEN}🐦 Twitter:{Colors.ENDC}      https://twitter.com/yourusername
-                    {Colors.GRAY}↳ Follow for tech updates!{Colors.ENDC}
-
-{Colors.OKGREEN}📷 Instagram:{Colors.ENDC}    https://instagram.com/yourusername
-                    {Colors.GRAY}↳ Behind the scenes content!{Colors.ENDC}
-
-{Colors.OKGREEN}🌐 Portfolio:{Colors.ENDC}    https://yourwebsite.com
-                    {Colors.GRAY}↳ Full portfolio website!{Colors.ENDC}
-
-{Colors.OKGREEN}📝 Blog:{Colors.ENDC}         https://yourblog.com
-                    {Colors.GRAY}↳ Tech articles and tutorials!{Colors.ENDC}
+{links}
 """
-    print(social_text)
+    return social_text + '\n'
 
+
+@COMMANDS.command('email', category='📞 Contact & Social', help='Send me an email')
 def cmd_email():
     """Display email information"""
     print(f"\n{Colors.OKGREEN}📧 Opening email client...{Colors.ENDC}")
     loading_animation("Preparing email", 1)
-    print(f"\n{Colors.OKCYAN}Send an email to:{Colors.ENDC} {Colors.BOLD}your.email@example.com{Colors.ENDC}")
+    print(f"\n{Colors.OKCYAN}Send an email to:{Colors.ENDC} {Colors.BOLD}{content.load().contact.email}{Colors.ENDC}")
     print(f"{Colors.GRAY}Subject: Portfolio Inquiry{Colors.ENDC}\n")
 
+
+@COMMANDS.command('resume', category='💼 Professional', help='Download my resume')
 def cmd_resume():
     """Display resume download information"""
     print(f"\n{Colors.OKGREEN}📄 Preparing resume download...{Colors.ENDC}")
     loading_animation("Fetching resume", 1.5)
-    
+    resume_screen()
+
+def resume_slots():
+    """Dynamic parts of the resume screen"""
+    return {'updated': datetime.now().strftime('%B %Y')}
+
+@SCREENS.template(resume_slots)
+def resume_screen():
+    """Resume download links; the last-updated month is filled in per call"""
+    resume = content.load().resume
     resume_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}Resume Download{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
 {Colors.OKGREEN}📥 Download Links:{Colors.ENDC}
-  • PDF Format:  https://yourwebsite.com/resume.pdf
-  • DOCX Format: https://yourwebsite.com/resume.docx
-  • LaTeX Source: https://github.com/yourusername/resume
+{chr(10).join(f"  • {label + ':':<13} {url}" for label, url in resume.links)}
 
 {Colors.OKGREEN}📊 Resume Highlights:{Colors.ENDC}
-  • 10+ projects showcased
-  • 3+ years of experience
-  • 15+ technical skills listed
-  • 5+ certifications
+{chr(10).join(f"  • {item}" for item in resume.highlights)}
 
-{Colors.GRAY}Last updated: {datetime.now().strftime('%B %Y')}{Colors.ENDC}
+{Colors.GRAY}Last updated: {slot('updated')}{Colors.ENDC}
 {Colors.YELLOW}✨ Pro tip: Check my GitHub for a live resume repository!{Colors.ENDC}
 """
-    print(resume_text)
+    return resume_text + '\n'
+
 
+@COMMANDS.command('quote', category='🎮 Fun & Extras', help='Random inspirational quote')
 def cmd_quote():
     """Display random inspirational quote"""
-    quotes = [
-        ("First, solve the problem. Then, write the code.", "John Johnson"),
-        ("Code is like humor. When you have to explain it, it's bad.", "Cory House"),
-        ("Make it work, make it right, make it fast.", "Kent Beck"),
-        ("Programming isn't about what you know; it's about what you can figure out.", "Chris Pine"),
-        ("The best error message is the one that never shows up.", "Thomas Fuchs"),
-        ("Simplicity is the soul of efficiency.", "Austin Freeman"),
-        ("Clean code always looks like it was written by someone who cares.", "Robert C. Martin"),
-        ("Any fool can write code that a computer can understand. Good programmers write code that humans can understand.", "Martin Fowler"),
-    ]
-    
-    quote, author = random.choice(quotes)
-    
+    quote, author = random.choice(content.load().quotes)
+
     print(f"\n{Colors.OKCYAN}{Colors.BOLD}💡 Inspirational Quote{Colors.ENDC}")
     print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}\n")
     print(f"{Colors.YELLOW}\"{quote}\"{Colors.ENDC}")
     print(f"{Colors.GRAY}— {author}{Colors.ENDC}\n")
 
+
+@COMMANDS.command('joke', category='🎮 Fun & Extras', help='Random programming joke')
 def cmd_joke():
     """Display random programming joke"""
-    jokes = [
-        "Why do programmers prefer dark mode?\nBecause light attracts bugs! 🐛",
-        "How many programmers does it take to change a light bulb?\nNone. It's a hardware problem! 💡",
-        "Why do Java developers wear glasses?\nBecause they don't C#! 👓",
-        "What's a programmer's favorite place to hang out?\nThe Foo Bar! 🍺",
-        "Why did the programmer quit his job?\nBecause he didn't get arrays! 📊",
-        "How do you comfort a JavaScript bug?\nYou console it! 🐛",
-        "Why did the developer go broke?\nBecause he used up all his cache! 💰",
-    ]
-    
-    joke = random.choice(jokes)
-    
+    joke = random.choice(content.load().jokes)
+
     print(f"\n{Colors.OKGREEN}{Colors.BOLD}😄 Programming Joke{Colors.ENDC}")
     print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}\n")
     print(f"{Colors.YELLOW}{joke}{Colors.ENDC}\n")
 
+
+def time_slots():
+    """Dynamic parts of the time screen"""
+    now = datetime.now()
+    return {'date': now.strftime('%A, %B %d, %Y'), 'clock': now.strftime('%I:%M:%S %p')}
+
+@COMMANDS.command('time', category='🔧 Utilities', help='Show current time')
+@SCREENS.template(time_slots)
 def cmd_time():
     """Display current time"""
-    now = datetime.now()
     time_text = f"""
 {Colors.OKCYAN}{Colors.BOLD}🕐 Current Time{Colors.ENDC}
 {Colors.GRAY}{'═' * 60}{Colors.ENDC}
 
-{Colors.OKGREEN}Date:{Colors.ENDC}  {now.strftime('%A, %B %d, %Y')}
-{Colors.OKGREEN}Time:{Colors.ENDC}  {now.strftime('%I:%M:%S %p')}
-{Colors.OKGREEN}Zone:{Colors.ENDC}  IST (UTC+5:30)
+{Colors.OKGREEN}Date:{Colors.ENDC}  {slot('date')}
+{Colors.OKGREEN}Time:{Colors.ENDC}  {slot('clock')}
+{Colors.OKGREEN}Zone:{Colors.ENDC}  {content.load().profile.timezone}
 """
-    print(time_text)
+    return time_text + '\n'
+
+@COMMANDS.command('stats', hidden=True, help='Timing percentiles for this session (run with --profile)')
+def cmd_stats():
+    """Show the span timings collected by --profile"""
+    if not profiler.ENABLED:
+        print(f"{Colors.GRAY}Profiling is off; start with --profile to collect timings{Colors.ENDC}")
+        return
+    print(f"{Colors.OKCYAN}{Colors.BOLD}Timings{Colors.ENDC}")
+    print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}\n")
+    print(profiler.format_summary())
+    print(f"\n{Colors.GRAY}Screen cache: {SCREENS.hits} hits, {SCREENS.misses} misses{Colors.ENDC}")
+
+def search_sources():
+    """(command, screen text) for every screen the search command covers"""
+    return [
+        ('whoami', cmd_whoami.screen()),
+        ('about', cmd_about.screen()),
+        ('skills', skills_effect().skip()),
+        ('projects', cmd_projects.screen(COMMANDS.resolve('projects')[1])),
+        ('experience', cmd_experience.screen()),
+        ('contact', cmd_contact.screen()),
+        ('social', cmd_social.screen()),
+        ('resume', resume_screen.screen()),
+    ]
+
+@COMMANDS.command('search', category='🔧 Utilities', help='Search the whole portfolio', usage='search <terms>')
+def cmd_search(invocation):
+    """Ranked full-text search over every screen (`search opencv`)"""
+    query = ' '.join(invocation.args)
+    if not query:
+        print(f"{Colors.WARNING}Usage: search <terms>   e.g. search opencv{Colors.ENDC}")
+        return
+    # Built on first use, then loaded from disk until content.json or this script changes
+    index = search_index.load_or_build('enhanced', (content.load().digest, os.stat(__file__).st_mtime_ns), search_sources)
+    results = index.search(query)
+    if not results:
+        print(f"{Colors.WARNING}🔎 No matches for \"{query}\"{Colors.ENDC}")
+        return
 
+    highlight = lambda word: f"{Colors.BOLD}{Colors.YELLOW}{word}{Colors.ENDC}"
+    print(f"{Colors.OKCYAN}{Colors.BOLD}🔎 Results for \"{query}\"{Colors.ENDC}")
+    print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}")
+    for number, (score, doc_id) in enumerate(results, 1):
+        command, title, text, length = index.docs[doc_id]
+        # Numbered entries ("[02] ...") open on their own, e.g. `projects 2`
+        entry = re.match(r'\[(\d+)\]', title)
+        target = f"{command} {int(entry.group(1))}" if entry else command
+        print(f"\n  {Colors.OKGREEN}{number}.{Colors.ENDC} {search_index.snippet(title, query, highlight)}  {Colors.GRAY}→ {target}{Colors.ENDC}")
+        rest = text.split('\n', 1)[1:]
+        if rest:
+            print(f"     {search_index.snippet(rest[0], query, highlight)}")
+
+@COMMANDS.command('matrix', category='🎮 Fun & Extras', help='Matrix effect (Easter egg!)')
 def cmd_matrix():
-    """Matrix effect Easter egg"""
-    print(f"\n{Colors.OKGREEN}Initializing Matrix...{Colors.ENDC}")
-    time.sleep(1)
+    """Full-screen Matrix rain Easter egg (any key exits)"""
+    rain = MatrixRain(fps=MATRIX_FPS, duration=6, depth=COLOR_DEPTH)
+    animation.play(animation.Sequence(
+        animation.text(f"\n{Colors.OKGREEN}Initializing Matrix...{Colors.ENDC}\n"),
+        animation.pause(1),
+        rain,
+    ))
     
-    for _ in range(10):
-        line = ''.join(random.choice('01') for _ in range(60))
-        print(f"{Colors.OKGREEN}{line}{Colors.ENDC}")
-        time.sleep(0.1)
-    
-    print(f"\n{Colors.OKCYAN}Wake up, Neo... 🕶️{Colors.ENDC}\n")
+    stats = rain.stats()
+    print(f"\n{Colors.OKCYAN}Wake up, Neo... 🕶️{Colors.ENDC}")
+    print(f"{Colors.GRAY}{stats['frames']} frames @ {rain.fps} FPS target | "
+          f"{stats['mean_ms']:.1f} ms avg / {stats['p95_ms']:.1f} ms p95 frame time | "
+          f"{stats['dropped']} dropped{Colors.ENDC}\n")
 
+@COMMANDS.command('hack', category='🎮 Fun & Extras', help='Hacking simulator (Easter egg!)')
 def cmd_hack():
     """Hacking simulator Easter egg"""
-    print(f"\n{Colors.FAIL}{Colors.BOLD}[!] INITIALIZING HACKING SEQUENCE{Colors.ENDC}")
-    time.sleep(0.5)
-    
     steps = [
         "Connecting to mainframe...",
         "Bypassing firewall...",
@@ -524,112 +545,179 @@ def cmd_hack():
         "HACK COMPLETE!"
     ]
     
-    for step in steps:
-        loading_animation(step, 1)
-    
-    print(f"\n{Colors.OKGREEN}{Colors.BOLD}[✓] Just kidding! You've been pranked! 😄{Colors.ENDC}\n")
-
-def cmd_history(history):
-    """Display command history"""
+    # One scheduled sequence: any key skips to the punchline, Esc/q/Ctrl+C cancels
+    animation.play(animation.Sequence(
+        animation.text(f"\n{Colors.FAIL}{Colors.BOLD}[!] INITIALIZING HACKING SEQUENCE{Colors.ENDC}\n"),
+        animation.pause(0.5),
+        *[spinner(step, 1) for step in steps],
+        animation.text(f"\n{Colors.OKGREEN}{Colors.BOLD}[✓] Just kidding! You've been pranked! 😄{Colors.ENDC}\n\n"),
+    ))
+
+@COMMANDS.command('history', category='🔧 Utilities', help='Show or search command history', usage='history [text]')
+def cmd_history(invocation):
+    """Display recent commands, or the newest commands containing the given text"""
+    history = invocation.history
+    query = ' '.join(invocation.args)
     print(f"\n{Colors.OKCYAN}{Colors.BOLD}Command History{Colors.ENDC}")
     print(f"{Colors.GRAY}{'═' * 60}{Colors.ENDC}\n")
     
-    if not history:
-        print(f"{Colors.GRAY}No commands in history yet.{Colors.ENDC}\n")
+    # Newest first when searching, like Ctrl-R
+    newest = history.recent(1)[-1][0] if history else None
+    entries = history.search_all(query, before=newest) if query else history.recent(10)
+    if not entries:
+        print(f"{Colors.GRAY}No matching commands in history.{Colors.ENDC}\n" if query else f"{Colors.GRAY}No commands in history yet.{Colors.ENDC}\n")
         return
     
-    for i, cmd in enumerate(history[-10:], 1):  # Show last 10 commands
-        print(f"{Colors.YELLOW}{i:2d}{Colors.ENDC}  {cmd}")
+    for number, cmd in entries:
+        print(f"{Colors.YELLOW}{number:4d}{Colors.ENDC}  {cmd}")
     print()
 
+@COMMANDS.command('banner', category='🔧 Utilities', help='Display the banner again')
+@COMMANDS.command('clear', category='🔧 Utilities', help='Clear the terminal screen')
+def cmd_clear():
+    """Clear the screen and show the banner again"""
+    clear_screen()
+    print_banner()
+    print_welcome()
+
+def print_goodbye():
+    """Print the farewell box"""
+    print(f"{Colors.OKCYAN}╔═══════════════════════════════════════════════════════════╗")
+    print(f"║  Thanks for visiting my portfolio!                        ║")
+    print(f"║  Hope to hear from you soon! 👋                           ║")
+    print(f"╚═══════════════════════════════════════════════════════════╝{Colors.ENDC}\n")
+
+@COMMANDS.command('exit', aliases=('quit', 'q'), category='🚪 Exit', help='Exit the portfolio', usage='exit/quit')
+def cmd_exit():
+    """Say goodbye and end the session"""
+    print_goodbye()
+    return STOP
+
 def cmd_unknown(cmd):
     """Handle unknown commands"""
     print(f"{Colors.FAIL}❌ Command not found: {Colors.BOLD}{cmd}{Colors.ENDC}")
     print(f"{Colors.GRAY}Type 'help' to see available commands{Colors.ENDC}\n")
 
-# Command mapping
-def get_commands(history):
-    return {
-        'help': cmd_help,
-        'whoami': cmd_whoami,
-        'about': cmd_about,
-        'skills': cmd_skills,
-        'projects': cmd_projects,
-        'experience': cmd_experience,
-        'contact': cmd_contact,
-        'social': cmd_social,
-        'email': cmd_email,
-        'resume': cmd_resume,
-        'quote': cmd_quote,
-        'joke': cmd_joke,
-        'time': cmd_time,
-        'matrix': cmd_matrix,
-        'hack': cmd_hack,
-        'history': lambda: cmd_history(history),
-        'banner': lambda: (clear_screen(), print_banner(), print_welcome()),
-        'clear': lambda: (clear_screen(), print_banner(), print_welcome()),
-    }
-
-def get_suggestions(partial_cmd, commands):
-    """Get command suggestions based on partial input"""
-    if not partial_cmd:
-        return list(commands.keys())
-    return [cmd for cmd in commands.keys() if cmd.startswith(partial_cmd.lower())]
+# Prefix index over every registered name, alias and argument, plus typo matching that
+# also knows content keywords ("opencv" -> projects 2); built once all commands exist
+COMPLETER = CommandCompleter(COMMANDS, content_keywords(content.load()))
+
+def get_suggestions(partial_cmd):
+    """Get command suggestions based on partial input (same index as TAB completion)"""
+    return COMPLETER.suggest(partial_cmd)
+
+def suggestion_label(line, word, distance):
+    """A typo match with the word it matched and how many edits away it was"""
+    notes = [] if word == line else [word]
+    if distance:
+        notes.append(f"{distance} edit{'s' if distance > 1 else ''}")
+    return f"{line}{Colors.GRAY}  ({', '.join(notes)})" if notes else line
+
+def dispatch(user_input, command_history):
+    """Run one command line; returns STOP when the session should end"""
+    # Parse command and arguments (e.g. "projects 3", "skills --no-anim")
+    command, invocation = COMMANDS.resolve(user_input, history=command_history)
+    
+    # Check if command exists
+    if command:
+        print()
+        if command.run(invocation) is STOP:
+            return STOP
+        print()
+        with profiler.span('output.flush'):
+            sys.stdout.flush()
+    else:
+        # Show suggestions for partial matches
+        suggestions = get_suggestions(invocation.name)
+        if not suggestions:
+            # No prefix match: fall back to typo-tolerant matches, closest first
+            suggestions = [suggestion_label(*match) for match in COMPLETER.fuzzy(invocation.name)]
+        if suggestions and len(suggestions) <= 5:
+            print(f"\n{Colors.WARNING}💡 Did you mean:{Colors.ENDC}")
+            for suggestion in suggestions:
+                print(f"   → {Colors.OKGREEN}{suggestion}{Colors.ENDC}")
+            print()
+        else:
+            cmd_unknown(invocation.name)
+
+def prompt():
+    """The command prompt"""
+    return f"{Colors.OKGREEN}portfolio@terminal{Colors.ENDC}:{Colors.OKBLUE}~${Colors.ENDC} "
+
+def show_welcome():
+    """Clear the screen and show the banner and welcome message"""
+    clear_screen()
+    print_banner()
+    print_welcome()
+
+def session_app():
+    """The portfolio as driven by a served session (telnet, SSH or WebSocket)"""
+    import server
+    return server.App(show_welcome, dispatch, prompt(), error=lambda e: print(f"{Colors.FAIL}❌ Error: {str(e)}{Colors.ENDC}\n"), farewell=print_goodbye)
+
+def serve():
+    """Serve the portfolio to many visitors at once (--serve [--host H] [--port N] [--ssh-port N])"""
+    import server
+    server.run(
+        session_app(),
+        host=server.cli_option('--host', server.DEFAULT_HOST),
+        port=int(server.cli_option('--port', server.DEFAULT_PORT)),
+        ssh_port=int(server.cli_option('--ssh-port', server.DEFAULT_SSH_PORT)),
+    )
+
+def serve_http():
+    """Serve the web terminal over HTTP, with live sessions on /ws (--http [--host H] [--port N] [--root DIR] [--static])"""
+    import http_server
+    import server
+    http_server.run(
+        root=server.cli_option('--root', None),
+        host=server.cli_option('--host', server.DEFAULT_HOST),
+        port=int(server.cli_option('--port', http_server.DEFAULT_PORT)),
+        app=None if '--static' in sys.argv else session_app(),
+    )
+
+def replay():
+    """Play back a --record file (--replay FILE [--speed N] [--seek SECONDS] [--idle-limit SECONDS] [--loop])"""
+    import server
+    idle_limit = server.cli_option('--idle-limit', None)
+    try:
+        recorder.replay(
+            server.cli_option('--replay', None),
+            speed=float(server.cli_option('--speed', 1)),
+            seek=float(server.cli_option('--seek', 0)),
+            idle_limit=float(idle_limit) if idle_limit else None,
+            loop='--loop' in sys.argv,
+        )
+    except (OSError, RuntimeError, ValueError) as e:
+        sys.exit(f"Cannot replay: {e}")
 
 def main():
     """Main function"""
     clear_screen()
-    print_banner()
+    print_banner(lazy=fast_start_enabled())
     print_welcome()
     
-    command_history = []
+    command_history = CommandHistory()
+    install_readline(COMPLETER)
+    command_history.attach_readline()
     
     while True:
         try:
             # Get user input
-            user_input = input(f"{Colors.OKGREEN}portfolio@terminal{Colors.ENDC}:{Colors.OKBLUE}~${Colors.ENDC} ").strip()
+            user_input = input(prompt()).strip()
             
             if not user_input:
                 continue
             
             # Add to history
-            command_history.append(user_input)
-            
-            # Parse command
-            cmd = user_input.lower()
+            command_history.add(user_input)
             
-            # Get current commands (with history)
-            COMMANDS = get_commands(command_history)
-            
-            # Check for exit commands
-            if cmd in ['exit', 'quit', 'q']:
-                print(f"\n{Colors.OKCYAN}╔═══════════════════════════════════════════════════════════╗")
-                print(f"║  Thanks for visiting my portfolio!                        ║")
-                print(f"║  Hope to hear from you soon! 👋                           ║")
-                print(f"╚═══════════════════════════════════════════════════════════╝{Colors.ENDC}\n")
+            if dispatch(user_input, command_history) is STOP:
                 break
-            
-            # Check if command exists
-            if cmd in COMMANDS:
-                print()
-                COMMANDS[cmd]()
-                print()
-            else:
-                # Show suggestions for partial matches
-                suggestions = get_suggestions(cmd, COMMANDS)
-                if suggestions and len(suggestions) <= 5:
-                    print(f"\n{Colors.WARNING}💡 Did you mean:{Colors.ENDC}")
-                    for suggestion in suggestions:
-                        print(f"   → {Colors.OKGREEN}{suggestion}{Colors.ENDC}")
-                    print()
-                else:
-                    cmd_unknown(cmd)
         
         except KeyboardInterrupt:
-            print(f"\n\n{Colors.OKCYAN}╔═══════════════════════════════════════════════════════════╗")
-            print(f"║  Thanks for visiting my portfolio!                        ║")
-            print(f"║  Hope to hear from you soon! 👋                           ║")
-            print(f"╚═══════════════════════════════════════════════════════════╝{Colors.ENDC}\n")
+            print("\n")
+            print_goodbye()
             break
         except EOFError:
             break
@@ -637,4 +725,13 @@ def main():
             print(f"{Colors.FAIL}❌ Error: {str(e)}{Colors.ENDC}\n")
 
 if __name__ == "__main__":
-    main()
+    profiler.from_argv()
+    if '--replay' in sys.argv[:-1]:
+        replay()
+    elif '--serve' in sys.argv:
+        serve()
+    elif '--http' in sys.argv:
+        serve_http()
+    else:
+        recorder.from_argv(title='Terminal Portfolio')
+        main()
@@ -0,0 +1,135 @@
+"""
+Opt-in Instrumentation
+With --profile, named spans (banner phases, command handlers, output flushes)
+are timed with perf_counter_ns into rolling windows reported as p50/p95/p99.
+--profile-out FILE also writes, on exit, a Chrome trace (FILE.json, open in
+chrome://tracing or Perfetto) or a cProfile dump (any other name, read with
+pstats). Disabled, a span is a shared no-op context manager.
+"""
+
+import atexit
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# Samples kept per span name, and trace events kept overall
+WINDOW = 1000
+MAX_EVENTS = 100000
+
+ENABLED = False
+
+_samples = {}
+_events = deque(maxlen=MAX_EVENTS)
+_profile = None
+_out_path = None
+
+class _NullSpan:
+    """What span() returns while profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL = _NullSpan()
+
+class _Span:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+def span(name):
+    """Context manager timing the block under name (no-op unless profiling is on)"""
+    return _Span(name) if ENABLED else _NULL
+
+def record(name, start_ns, end_ns):
+    """Add one timed interval to its rolling window and the trace"""
+    window = _samples.get(name)
+    if window is None:
+        window = _samples.setdefault(name, deque(maxlen=WINDOW))
+    window.append(end_ns - start_ns)
+    if _out_path:
+        _events.append((name, start_ns, end_ns - start_ns, threading.get_ident()))
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def summary():
+    """Return (name, count, p50, p95, p99, max) rows in milliseconds, slowest p95 first"""
+    rows = []
+    for name, window in list(_samples.items()):
+        ordered = sorted(window)
+        if not ordered:
+            continue
+        ms = [percentile(ordered, fraction) / 1e6 for fraction in (0.5, 0.95, 0.99)]
+        rows.append((name, len(ordered), *ms, ordered[-1] / 1e6))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows
+
+def format_summary():
+    """The summary as a plain text table"""
+    lines = [f"{'span':<24} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+    for name, count, p50, p95, p99, worst in summary():
+        lines.append(f"{name:<24} {count:>6} {p50:>9.3f} {p95:>9.3f} {p99:>9.3f} {worst:>9.3f}")
+    return '\n'.join(lines)
+
+def enable(out_path=None):
+    """Start collecting; out_path picks the exit dump (.json -> Chrome trace, otherwise cProfile)"""
+    global ENABLED, _out_path, _profile
+    ENABLED = True
+    _out_path = out_path
+    if out_path and not out_path.endswith('.json'):
+        import cProfile
+        _profile = cProfile.Profile()
+        _profile.enable()
+    atexit.register(finish)
+
+def from_argv(argv=None):
+    """Enable profiling for --profile [--profile-out FILE]; returns whether it is on"""
+    argv = sys.argv if argv is None else argv
+    if '--profile' not in argv and '--profile-out' not in argv:
+        return False
+    out_path = argv[argv.index('--profile-out') + 1] if '--profile-out' in argv[:-1] else None
+    enable(out_path)
+    return True
+
+def write_trace(path):
+    """Write the recorded spans in Chrome trace event format (microsecond timestamps)"""
+    import json
+
+    pid = os.getpid()
+    events = [
+        {'name': name, 'ph': 'X', 'ts': start // 1000, 'dur': duration / 1000, 'pid': pid, 'tid': tid}
+        for name, start, duration, tid in list(_events)
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+def finish():
+    """Print the summary and write the --profile-out dump; runs once at exit"""
+    global ENABLED, _profile
+    if not ENABLED:
+        return
+    ENABLED = False
+    if _samples:
+        print(format_summary(), file=sys.stderr)
+    if _profile is not None:
+        _profile.disable()
+        _profile.dump_stats(_out_path)
+        _profile = None
+        print(f"cProfile stats written to {_out_path} (python -m pstats {_out_path})", file=sys.stderr)
+    elif _out_path:
+        write_trace(_out_path)
+        print(f"Chrome trace written to {_out_path}", file=sys.stderr)
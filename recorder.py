@@ -0,0 +1,323 @@
+"""
+Session Recording and Replay
+--record FILE puts a sink in front of stdout that passes everything through
+and timestamps it into an asciicast v2 file (JSON lines, playable with
+asciinema), gzip or zstd compressed when FILE ends in .gz or .zst. Next to
+it goes FILE.idx: keyframes, the events where the screen was cleared, from
+which playback can start without replaying what came before. Replay streams
+the events back on the animation engine's fixed-rate schedule, so a kiosk
+shows the banner, matrix and hack exactly as recorded without PIL or any
+animation code running.
+"""
+
+import atexit
+import builtins
+import json
+import os
+import re
+import sys
+import time
+
+import animation
+from term_caps import terminal_size
+
+INDEX_VERSION = 1
+
+# Writes less than this many seconds apart (and not separated by a flush) share one event
+MERGE_WINDOW = 0.005
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# What playback writes before starting mid-recording, and after stopping early
+RESET = '\033[?1049l\033[0m\033[H\033[2J'
+RESTORE = '\033[?1049l\033[0m\033[?25h'
+
+_SCREEN = re.compile(r'\x1b\[\?1049([hl])|\x1b\[[23]J|\x1bc')
+# Output as a terminal would receive it through a pty (ONLCR)
+_BARE_LF = re.compile(r'(?<!\r)\n')
+
+_recording = None
+
+def open_cast(path, mode):
+    """Open a cast file as a binary stream, (de)compressing by extension when writing and by magic bytes when reading"""
+    # Imported here: every launch loads this module, but only recording and replay need gzip
+    import gzip
+
+    if mode == 'wb':
+        if path.endswith('.gz'):
+            return gzip.open(path, 'wb', compresslevel=6)
+        if path.endswith('.zst'):
+            zstandard = _zstandard()
+            return zstandard.ZstdCompressor(level=10).stream_writer(open(path, 'wb'))
+        return open(path, 'wb')
+    f = open(path, 'rb')
+    magic = f.read(4)
+    f.seek(0)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=f)
+    if magic == ZSTD_MAGIC:
+        return _zstandard().ZstdDecompressor().stream_reader(f, closefd=True)
+    return f
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError('zstd casts need the zstandard module: pip install zstandard')
+    return zstandard
+
+class ScreenState:
+    """Tracks just enough of the output to tell whether an event leaves a freshly cleared main screen"""
+
+    def __init__(self):
+        self.alternate = False
+
+    def is_keyframe(self, data):
+        cleared = False
+        for match in _SCREEN.finditer(data):
+            if match.group(1):
+                self.alternate = match.group(1) == 'h'
+                # Leaving the alternate screen brings back whatever was under it
+                cleared = False
+            elif not self.alternate:
+                cleared = True
+        return cleared and not self.alternate
+
+class CastWriter:
+    """Appends timestamped output to an asciicast v2 file, building its keyframe index as it goes"""
+
+    def __init__(self, path, width, height, title=None):
+        self.path = path
+        self.file = open_cast(path, 'wb')
+        header = {'version': 2, 'width': width, 'height': height, 'timestamp': int(time.time()),
+                  'env': {'TERM': os.environ.get('TERM', ''), 'SHELL': os.environ.get('SHELL', '')}}
+        if title:
+            header['title'] = title
+        self.offset = self._write(header)
+        self.start = time.perf_counter()
+        self.screen = ScreenState()
+        self.keyframes = [[0.0, self.offset]]
+        self.last = 0.0
+        self.pending = []
+        self.pending_at = 0.0
+
+    def _write(self, record):
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        self.file.write(line)
+        return len(line)
+
+    def output(self, text):
+        now = time.perf_counter() - self.start
+        if self.pending and now - self.pending_at > MERGE_WINDOW:
+            self.emit()
+        if not self.pending:
+            self.pending_at = now
+        self.pending.append(text)
+
+    def emit(self):
+        """Write the pending output as one event"""
+        if not self.pending:
+            return
+        data = _BARE_LF.sub('\r\n', ''.join(self.pending))
+        self.pending = []
+        at = round(self.pending_at, 6)
+        if self.screen.is_keyframe(data) and self.keyframes[-1][1] != self.offset:
+            self.keyframes.append([at, self.offset])
+        self.offset += self._write([at, 'o', data])
+        self.last = at
+
+    def close(self):
+        self.emit()
+        self.file.close()
+        save_index(self.path, {'duration': self.last, 'keyframes': self.keyframes})
+
+class RecordingOutput:
+    """Stands in for sys.stdout while recording: every write goes to the terminal and into the cast"""
+
+    # No binary layer, so pre-encoded screens come through write() too (see screen_cache.write_bytes)
+    buffer = None
+
+    def __init__(self, real, writer):
+        self._real = real
+        self._writer = writer
+
+    def write(self, text):
+        self._real.write(text)
+        self._writer.output(text)
+        return len(text)
+
+    def flush(self):
+        self._real.flush()
+        self._writer.emit()
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+def _recorded_input(real_input):
+    """input() that records its prompt and the echoed line, which readline writes past sys.stdout"""
+    def recorded(prompt=''):
+        out = sys.stdout
+        try:
+            interactive = sys.stdin.isatty() and out.isatty()
+        except (AttributeError, ValueError):
+            interactive = False
+        if interactive:
+            # Without readline's \001/\002 markers around the prompt's escape codes
+            _recording.output(str(prompt).replace('\001', '').replace('\002', ''))
+            _recording.emit()
+        line = real_input(prompt)
+        if interactive:
+            _recording.output(line + '\n')
+            _recording.emit()
+        return line
+    return recorded
+
+def start(path, title=None):
+    """Record everything written to stdout from now until exit"""
+    global _recording
+    size = terminal_size()
+    _recording = CastWriter(path, size.columns, size.lines, title)
+    sys.stdout = RecordingOutput(sys.stdout, _recording)
+    builtins.input = _recorded_input(builtins.input)
+    atexit.register(finish)
+
+def finish():
+    """Close the recording; runs once at exit"""
+    global _recording
+    if _recording is None:
+        return
+    recording, _recording = _recording, None
+    if isinstance(sys.stdout, RecordingOutput):
+        sys.stdout.flush()
+        sys.stdout = sys.stdout._real
+    recording.close()
+    print(f"Recording saved to {recording.path} ({recording.last:.1f}s, replay with --replay {recording.path})", file=sys.stderr)
+
+def from_argv(argv=None, title=None):
+    """Start recording for --record FILE; returns whether it is on"""
+    argv = sys.argv if argv is None else argv
+    if '--record' not in argv[:-1]:
+        return False
+    try:
+        start(argv[argv.index('--record') + 1], title)
+    except (OSError, RuntimeError) as e:
+        sys.exit(f"Cannot record: {e}")
+    return True
+
+def index_path(path):
+    return path + '.idx'
+
+def save_index(path, index):
+    """Write the keyframe index next to a cast, stamped with the cast's size and mtime"""
+    stat = os.stat(path)
+    index = dict(index, version=INDEX_VERSION, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    try:
+        with open(index_path(path), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+    except OSError:
+        pass
+
+def build_index(path):
+    """Scan a cast (one from asciinema included) for its keyframes"""
+    screen = ScreenState()
+    with open_cast(path, 'rb') as f:
+        offset = len(f.readline())
+        keyframes = [[0.0, offset]]
+        last = 0.0
+        for line in f:
+            event = json.loads(line)
+            if event[1] == 'o' and screen.is_keyframe(event[2]) and keyframes[-1][1] != offset:
+                keyframes.append([event[0], offset])
+            last = event[0]
+            offset += len(line)
+    return {'duration': last, 'keyframes': keyframes}
+
+def load_index(path):
+    """The keyframe index of a cast: saved next to it while current, otherwise rebuilt (and saved)"""
+    stat = os.stat(path)
+    try:
+        with open(index_path(path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if (index.get('version'), index.get('size'), index.get('mtime_ns')) == (INDEX_VERSION, stat.st_size, stat.st_mtime_ns):
+            return index
+    except (OSError, ValueError):
+        pass
+    index = build_index(path)
+    save_index(path, index)
+    return index
+
+class CastPlayback:
+    """Effect playing a cast's output events at their recorded times
+
+    Starting at `seek` seconds, the output from the last keyframe before it
+    is written at once, then the rest plays in time. Gaps are capped at
+    idle_limit (default: the cast's idle_time_limit) and divided by speed.
+    Skipping or cancelling stops on the current frame.
+    """
+
+    droppable = False
+
+    def __init__(self, path, speed=1.0, seek=0.0, idle_limit=None):
+        self.path = path
+        self.speed = speed
+        self.seek = seek
+        self.index = load_index(path) if seek > 0 else None
+        self.idle_limit = idle_limit
+        self.interval = 0
+        self.done = False
+
+    def events(self):
+        """(time, data) of every output event from the keyframe at or before seek"""
+        with open_cast(self.path, 'rb') as f:
+            header = json.loads(f.readline())
+            if self.idle_limit is None:
+                self.idle_limit = header.get('idle_time_limit')
+            if self.index:
+                starts = [offset for at, offset in self.index['keyframes'] if at <= self.seek]
+                if starts[-1] > f.tell():
+                    f.seek(starts[-1])
+            for line in f:
+                at, kind, data = json.loads(line)
+                if kind == 'o':
+                    yield at, data
+
+    def frames(self):
+        # Each frame is followed by the gap up to the next event, so one event is held back
+        pending = [RESET] if self.seek > 0 else []
+        clock = self.seek
+        for at, data in self.events():
+            if at < self.seek:
+                pending.append(data)
+                continue
+            self.interval = self.delay(at - clock)
+            yield ''.join(pending)
+            if self.done:
+                return
+            pending = [data]
+            clock = at
+        self.interval = 0
+        self.done = True
+        yield ''.join(pending)
+
+    def delay(self, gap):
+        if self.idle_limit:
+            gap = min(gap, self.idle_limit)
+        return max(0.0, gap) / self.speed
+
+    def skip(self):
+        if self.done:
+            return ''
+        self.done = True
+        return RESTORE
+
+    def cancel(self):
+        return self.skip()
+
+def replay(path, speed=1.0, seek=0.0, idle_limit=None, loop=False):
+    """Play a cast to stdout; with loop, start over until Esc/q/Ctrl+C"""
+    while True:
+        outcome = animation.play(CastPlayback(path, speed, seek, idle_limit))
+        if not loop or outcome == 'cancelled':
+            return outcome
+        seek = 0.0
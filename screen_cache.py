@@ -0,0 +1,110 @@
+"""
+Memoized Command Screens
+Static command output is rendered once per (arguments, terminal width, color
+depth, content version) and kept as encoded bytes. Templates keep named
+slots (dates, times) that are filled in at call time.
+"""
+
+import functools
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+import content
+from term_caps import terminal_size
+
+_SLOT = re.compile('\x00([a-z_]+)\x00')
+
+def slot(name):
+    """Placeholder for a value a template fills in on every call"""
+    return f'\x00{name}\x00'
+
+def write_bytes(blob, out=None):
+    """Write pre-encoded output, straight to the binary buffer when stdout has one"""
+    out = out or sys.stdout
+    buffer = getattr(out, 'buffer', None)
+    if buffer is None:
+        out.write(blob.decode(getattr(out, 'encoding', None) or 'utf-8', 'replace'))
+        return
+    # Anything still in the text layer has to go out first to keep the order
+    out.flush()
+    buffer.write(blob)
+
+class ScreenCache:
+    """LRU of rendered screens; decorate a function returning the screen text with .screen or .template(fill)"""
+
+    def __init__(self, depth, maxsize=256):
+        self.depth = depth
+        self.maxsize = maxsize
+        self.screens = OrderedDict()
+        # Served sessions look up screens from many worker threads at once
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, func, args, encoding):
+        parts = []
+        for arg in args:
+            if hasattr(arg, 'options'):
+                # An Invocation: only its arguments and options change the screen
+                parts.append((tuple(arg.args), tuple(sorted(arg.options.items()))))
+            else:
+                parts.append(arg)
+        # Content digest and terminal width are part of the key, so edits and resizes miss naturally
+        return (func.__qualname__, tuple(parts), terminal_size().columns, self.depth, content.load().digest, encoding)
+
+    def lookup(self, func, args, encoding):
+        """Return the compiled screen for a call, rendering it on a miss"""
+        key = self._key(func, args, encoding)
+        with self.lock:
+            parts = self.screens.get(key)
+            if parts is not None:
+                self.hits += 1
+                self.screens.move_to_end(key)
+                return parts
+            self.misses += 1
+        # Rendered outside the lock so a slow screen does not hold up other sessions
+        parts = self.compile(func(*args), encoding)
+        with self.lock:
+            self.screens[key] = parts
+            self.screens.move_to_end(key)
+            while len(self.screens) > self.maxsize:
+                self.screens.popitem(last=False)
+        return parts
+
+    @staticmethod
+    def compile(text, encoding):
+        """Split screen text into encoded literal chunks alternating with slot names"""
+        pieces = _SLOT.split(text)
+        return tuple(piece.encode(encoding, 'replace') if i % 2 == 0 else piece for i, piece in enumerate(pieces))
+
+    def clear(self):
+        with self.lock:
+            self.screens.clear()
+
+    def screen(self, func):
+        """Memoize a screen with no dynamic parts"""
+        return self.template(None)(func)
+
+    def template(self, fill):
+        """Memoize a screen whose slot() placeholders are filled from fill() -> {name: value} on every call"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                out = sys.stdout
+                encoding = getattr(out, 'encoding', None) or 'utf-8'
+                parts = self.lookup(func, args, encoding)
+                if len(parts) == 1:
+                    blob = parts[0]
+                else:
+                    values = fill()
+                    blob = b''.join(
+                        part if i % 2 == 0 else str(values[part]).encode(encoding, 'replace')
+                        for i, part in enumerate(parts)
+                    )
+                write_bytes(blob, out)
+            # The bare screen text, dynamic slots left empty (what the search index reads)
+            wrapper.screen = lambda *args: _SLOT.sub('', func(*args))
+            return wrapper
+        return decorate
@@ -0,0 +1,202 @@
+"""
+Full-Text Search
+An inverted index over the plain text of the command screens, ranked with
+BM25. Screens are split into blocks (one per project, role, paragraph...),
+ANSI codes stripped and tokens normalized; the finished index is kept on
+disk next to the banner cache so a restart loads it instead of rebuilding.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import unicodedata
+
+import banner_cache
+
+# Bump when tokenizing or the file layout changes so saved indexes are rebuilt
+INDEX_VERSION = 1
+
+# BM25 term-frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+_ANSI = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+# Words, keeping tech names such as c++, c#, node.js and html5 whole
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+_RULE = re.compile(r'^[\s═━─]+$')
+
+_indexes = {}
+
+def plain_text(text):
+    """Strip ANSI escapes from screen text"""
+    return _ANSI.sub('', text)
+
+def fold(text):
+    """Lowercase and drop accents so 'Résumé' and 'resume' meet"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+def normalize(word):
+    """Index form of one lowercase token: a light plural strip (projects -> project)"""
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+def tokenize(text):
+    """Normalized tokens of a piece of text, in order"""
+    return [normalize(word) for word in _TOKEN.findall(fold(text))]
+
+def split_blocks(text):
+    """Cut a screen into blank-line separated blocks, dropping section headings (a title over a rule)"""
+    blocks = []
+    for block in re.split(r'\n\s*\n', plain_text(text)):
+        lines = [line.rstrip() for line in block.strip('\n').split('\n') if line.strip()]
+        if not lines or _RULE.match(lines[-1]):
+            continue
+        blocks.append('\n'.join(lines))
+    return blocks
+
+class SearchIndex:
+    """Documents (command, title, text) plus term -> (doc ids, term frequencies) postings"""
+
+    def __init__(self, docs, postings):
+        self.docs = docs
+        self.postings = postings
+        lengths = [length for command, title, text, length in docs]
+        average = sum(lengths) / len(lengths) if lengths else 1
+        # Per-document BM25 denominator term, computed once
+        self.norms = [K1 * (1 - B + B * length / average) for length in lengths]
+        self.weights = {}
+
+    @classmethod
+    def build(cls, sources):
+        """Index (command, screen text) pairs"""
+        docs = []
+        postings = {}
+        for command, text in sources:
+            for block in split_blocks(text):
+                tokens = tokenize(block)
+                if not tokens:
+                    continue
+                doc_id = len(docs)
+                title = block.split('\n', 1)[0].strip(' •▸')
+                docs.append((command, title, block, len(tokens)))
+                counts = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, count in counts.items():
+                    ids, tfs = postings.setdefault(token, ([], []))
+                    ids.append(doc_id)
+                    tfs.append(count)
+        return cls(docs, postings)
+
+    def _weights(self, term, ids, tfs):
+        """BM25 term-frequency part of a posting list, computed on first use of the term"""
+        weights = self.weights.get(term)
+        if weights is None:
+            norms = self.norms
+            weights = [tf * (K1 + 1) / (tf + norms[doc_id]) for doc_id, tf in zip(ids, tfs)]
+            self.weights[term] = weights
+        return weights
+
+    def search(self, query, limit=5):
+        """Return up to limit (score, doc id) pairs, best first"""
+        total = len(self.docs)
+        found = [(term, self.postings[term]) for term in set(tokenize(query)) if term in self.postings]
+        # Words in most documents ("project", "the") barely move BM25 but cost the most; drop them when rarer words are present
+        rare = [item for item in found if len(item[1][0]) * 2 <= total]
+        scores = {}
+        get = scores.get
+        for term, (ids, tfs) in rare or found:
+            idf = math.log(1 + (total - len(ids) + 0.5) / (len(ids) + 0.5))
+            for doc_id, weight in zip(ids, self._weights(term, ids, tfs)):
+                scores[doc_id] = get(doc_id, 0.0) + idf * weight
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, doc_id) for doc_id, score in best]
+
+    def to_json(self):
+        return {'version': INDEX_VERSION, 'docs': self.docs, 'postings': self.postings}
+
+    @classmethod
+    def from_json(cls, data):
+        docs = [tuple(doc) for doc in data['docs']]
+        postings = {term: tuple(posting) for term, posting in data['postings'].items()}
+        return cls(docs, postings)
+
+def snippet(text, query, highlight, width=72):
+    """The line of a document matching the most query terms, cut to width around the first hit, hits passed through highlight"""
+    terms = set(tokenize(query))
+    best_line, best_hits = text.split('\n', 1)[0], 0
+    for line in text.split('\n'):
+        hits = sum(1 for match in _TOKEN.finditer(fold(line)) if normalize(match.group()) in terms)
+        if hits > best_hits:
+            best_line, best_hits = line, hits
+    line = best_line.strip()
+
+    # Folding keeps positions for ordinary text, so match offsets map back onto the original line
+    folded = fold(line)
+    spans = [match.span() for match in _TOKEN.finditer(folded) if normalize(match.group()) in terms] if len(folded) == len(line) else []
+    start = 0
+    if len(line) > width:
+        first = spans[0][0] if spans else 0
+        start = max(0, min(first - width // 4, len(line) - width))
+    end = start + width
+    parts = ['…' if start else '']
+    position = start
+    for hit_start, hit_end in spans:
+        if hit_start < start or hit_end > end:
+            continue
+        parts.append(line[position:hit_start])
+        parts.append(highlight(line[hit_start:hit_end]))
+        position = hit_end
+    parts.append(line[position:end])
+    if end < len(line):
+        parts.append('…')
+    return ''.join(parts)
+
+def index_path(name, key):
+    return os.path.join(banner_cache.cache_dir(), f'search-{name}-{key}.json')
+
+def load_or_build(name, key_parts, sources):
+    """Return the index for key_parts: from memory, from disk, or built from sources() and saved
+
+    name tells apart the indexes of different front ends sharing the cache directory.
+    """
+    key = hashlib.sha256('\0'.join(map(str, (INDEX_VERSION,) + tuple(key_parts))).encode('utf-8')).hexdigest()[:32]
+    index = _indexes.get((name, key))
+    if index is not None:
+        return index
+    path = index_path(name, key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION:
+            raise ValueError('old index')
+        index = SearchIndex.from_json(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        index = SearchIndex.build(sources())
+        save(path, index)
+    _indexes[(name, key)] = index
+    return index
+
+def save(path, index):
+    """Write an index atomically; a read-only cache directory just means rebuilding next time"""
+    import tempfile
+
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index.to_json(), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        # Indexes of older content for the same front end are never loaded again
+        prefix = os.path.basename(path).rsplit('-', 1)[0] + '-'
+        for entry in os.listdir(directory):
+            if entry.startswith(prefix) and entry.endswith('.json') and entry != os.path.basename(path):
+                os.remove(os.path.join(directory, entry))
+    except OSError:
+        pass
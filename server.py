@@ -0,0 +1,542 @@
+"""
+Multi-visitor Server Mode
+Serves the command engine over an asyncio telnet server, and over SSH when
+asyncssh is installed. Every connection is a session with its own history
+and terminal size; command handlers run in worker threads whose stdout is
+routed to their session, while the banner and content caches are shared.
+Session output is coalesced into one transport write per flush and held
+back (or, for animation frames, dropped) while a client is slow to read.
+"""
+
+import asyncio
+import codecs
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import banner_cache
+import profiler
+import term_caps
+from command_history import CommandHistory
+from command_registry import STOP
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 2323
+DEFAULT_SSH_PORT = 2222
+
+# Commands running at the same moment; visitors sitting at the prompt hold no thread
+MAX_WORKERS = 64
+
+# Seconds a visitor may sit at the prompt before being disconnected
+IDLE_TIMEOUT = 900
+
+# Served history lives in memory only
+SESSION_HISTORY = 200
+
+# Transport buffer sizes: above HIGH_WATER a session is congested until it drains below LOW_WATER
+HIGH_WATER = 64 * 1024
+LOW_WATER = 16 * 1024
+
+# Seconds a command may wait on a client that reads nothing before the session is dropped
+STALL_TIMEOUT = 30
+
+# Telnet protocol bytes (RFC 854, 857, 858, 1073)
+IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+ECHO, SGA, NAWS = 1, 3, 31
+
+# Queued instead of a line when the visitor presses Ctrl+C at the prompt
+INTERRUPT = object()
+
+_current = contextvars.ContextVar('session', default=None)
+_executor = None
+_console = sys.stdout
+
+def log(message):
+    """Write a line to the server console, whichever session is current"""
+    _console.write(message + '\n')
+    _console.flush()
+
+def cli_option(name, default, argv=None):
+    """Return the value following `name` on the command line, or default"""
+    argv = sys.argv if argv is None else argv
+    if name in argv[:-1]:
+        return argv[argv.index(name) + 1]
+    return default
+
+class App:
+    """The parts of the portfolio a session drives"""
+
+    def __init__(self, welcome, dispatch, prompt, error=None, farewell=None):
+        self.welcome = welcome
+        self.dispatch = dispatch
+        self.prompt = prompt
+        self.error = error
+        self.farewell = farewell
+
+class _Routed:
+    """Stands in for sys.stdout / sys.stdin: the current session's stream inside a session, the real one elsewhere"""
+
+    def __init__(self, real, attr):
+        self._real = real
+        self._attr = attr
+
+    def __getattr__(self, name):
+        session = _current.get()
+        target = getattr(session, self._attr) if session else self._real
+        return getattr(target, name)
+
+def install_streams():
+    """Route sys.stdout and sys.stdin through the current session"""
+    global _console
+    if not isinstance(sys.stdout, _Routed):
+        _console = sys.stdout
+        sys.stdout = _Routed(sys.stdout, 'stdout')
+        sys.stdin = _Routed(sys.stdin, 'stdin')
+
+class SessionOutput:
+    """A session's stdout: collects writes from the command thread and hands them to the event loop on flush"""
+
+    encoding = 'utf-8'
+    errors = 'replace'
+
+    def __init__(self, session, loop):
+        self.session = session
+        self.loop = loop
+        self.parts = []
+        # Set while the client keeps up; cleared above the high water mark
+        self.ready = threading.Event()
+        self.ready.set()
+        self.closed = False
+        self.bytes_sent = 0
+        self.writes = 0
+        self.stalled = 0.0
+        self.dropped = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        return len(text)
+
+    def flush(self):
+        """Hand everything written since the last flush to the loop as one write, waiting while congested"""
+        with profiler.span('session.flush'):
+            self._flush()
+
+    def _flush(self):
+        if self.closed:
+            self.parts = []
+            return
+        if not self.parts:
+            return
+        if not self.ready.is_set():
+            began = time.perf_counter()
+            drained = self.ready.wait(STALL_TIMEOUT)
+            self.stalled += time.perf_counter() - began
+            if not drained:
+                # The client stopped reading: give up on it rather than buffer forever
+                self.closed = True
+                self.parts = []
+                self.loop.call_soon_threadsafe(self.session.abort)
+                return
+        data = ''.join(self.parts)
+        self.parts = []
+        self.loop.call_soon_threadsafe(self.session.deliver, data)
+
+    def skip_frame(self):
+        """Called by animations before a replaceable frame: True (and counted) if the client is behind"""
+        if self.ready.is_set():
+            return False
+        self.dropped += 1
+        return True
+
+    def isatty(self):
+        return False
+
+class SessionInput:
+    """A session's stdin while a command runs: just the keys typed, so animations can be skipped"""
+
+    def __init__(self):
+        self.keys = deque()
+
+    def isatty(self):
+        return False
+
+    def poll_key(self):
+        return self.keys.popleft() if self.keys else None
+
+class Session:
+    """One visitor: history, terminal size and the streams their commands write to"""
+
+    def __init__(self, app, send, buffered, drain, close, columns=80, lines=24):
+        self.app = app
+        # Transport hooks: send text (returns bytes written), bytes still buffered, wait for the buffer to drain, close
+        self.send = send
+        self.buffered = buffered
+        self.drain = drain
+        self.close = close
+        self.size = [columns, lines]
+        self.sized = asyncio.Event()
+        self.history = CommandHistory(maxlen=SESSION_HISTORY, persist=False)
+        self.stdout = SessionOutput(self, asyncio.get_running_loop())
+        self.stdin = SessionInput()
+        self.lines = asyncio.Queue()
+        self.busy = False
+        self.commands = 0
+
+    def deliver(self, text):
+        """Write to the client (on the loop) and start backpressure once its buffer passes the high water mark"""
+        out = self.stdout
+        if out.closed:
+            return
+        out.bytes_sent += self.send(text)
+        out.writes += 1
+        if out.ready.is_set() and self.buffered() > HIGH_WATER:
+            out.ready.clear()
+            asyncio.ensure_future(self._drained())
+
+    async def _drained(self):
+        try:
+            await self.drain()
+        except (ConnectionError, OSError):
+            self.stdout.closed = True
+        self.stdout.ready.set()
+
+    def abort(self):
+        self.stdout.closed = True
+        self.lines.put_nowait(None)
+        self.close()
+
+    def stats(self):
+        """Output counters for this session"""
+        out = self.stdout
+        return {'bytes_sent': out.bytes_sent, 'writes': out.writes, 'stalled_s': out.stalled, 'dropped_frames': out.dropped, 'commands': self.commands}
+
+    def resize(self, columns, lines):
+        if columns > 0 and lines > 0:
+            self.size[:] = [columns, lines]
+            self.sized.set()
+
+    async def call(self, func, *args):
+        """Run a handler in a worker thread with this session's streams and size"""
+        self.busy = True
+        try:
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(_executor, context.run, self._invoke, func, args)
+        finally:
+            self.busy = False
+            self.stdin.keys.clear()
+
+    def _invoke(self, func, args):
+        try:
+            return func(*args)
+        except Exception as e:
+            if self.app.error:
+                self.app.error(e)
+        finally:
+            self.stdout.flush()
+
+    async def run(self):
+        """Welcome the visitor, then read and dispatch lines until exit, EOF or idle timeout"""
+        _current.set(self)
+        term_caps.session_size.set(self.size)
+        try:
+            # Give the client a moment to report its window size before the first screen
+            await asyncio.wait_for(self.sized.wait(), 0.3)
+        except asyncio.TimeoutError:
+            pass
+        await self.call(self.app.welcome)
+        while True:
+            self.deliver(self.app.prompt)
+            try:
+                line = await asyncio.wait_for(self.lines.get(), IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                line = None
+            if line is None:
+                break
+            if line is INTERRUPT:
+                if self.app.farewell:
+                    await self.call(self.app.farewell)
+                break
+            line = line.strip()
+            if not line:
+                continue
+            self.history.add(line)
+            self.commands += 1
+            if await self.call(self.app.dispatch, line, self.history) is STOP:
+                break
+
+class LineSession(Session):
+    """Session over a character stream (telnet, WebSocket): server-side echo and line editing; subclasses provide _raw(bytes)"""
+
+    def __init__(self, app, send, buffered, drain, close):
+        super().__init__(app, send, buffered, drain, close)
+        self.buffer = []
+        self.escape = ''
+        self.last_cr = False
+        self.recall = 0
+
+    def _send(self, text):
+        data = text.replace('\n', '\r\n').encode('utf-8', 'replace')
+        self._raw(data)
+        return len(data)
+
+    def text(self, text):
+        for ch in text:
+            if self.busy:
+                # A command is running: keys go to its animation (any key skips, Esc/q/Ctrl+C cancel)
+                self.stdin.keys.append(ch)
+            else:
+                self.key(ch)
+
+    def key(self, ch):
+        """Line editing at the prompt"""
+        if self.escape:
+            self.escape += ch
+            if (len(self.escape) == 2 and ch not in '[O') or (len(self.escape) > 2 and (ch.isalpha() or ch == '~')):
+                self._escape_sequence(self.escape)
+                self.escape = ''
+            return
+        if ch == '\n' and self.last_cr:
+            self.last_cr = False
+            return
+        self.last_cr = ch == '\r'
+        if ch in '\r\n':
+            line = ''.join(self.buffer)
+            self.buffer = []
+            self.recall = 0
+            self._raw(b'\r\n')
+            self.lines.put_nowait(line)
+        elif ch == '\x1b':
+            self.escape = ch
+        elif ch in '\x7f\x08':
+            if self.buffer:
+                self.buffer.pop()
+                self._raw(b'\b \b')
+        elif ch == '\x03':
+            self._raw(b'^C\r\n')
+            self.lines.put_nowait(INTERRUPT)
+        elif ch == '\x04':
+            if not self.buffer:
+                self.lines.put_nowait(None)
+        elif ch == '\x15':
+            self._replace_line('')
+        elif ch >= ' ':
+            self.buffer.append(ch)
+            self._raw(ch.encode('utf-8'))
+
+    def _escape_sequence(self, sequence):
+        # Up/down arrows walk this session's history
+        entries = self.history.entries
+        if sequence[-1] == 'A' and self.recall < len(entries):
+            self.recall += 1
+        elif sequence[-1] == 'B' and self.recall > 0:
+            self.recall -= 1
+        else:
+            return
+        self._replace_line(entries[-self.recall] if self.recall else '')
+
+    def _replace_line(self, text):
+        self.buffer = list(text)
+        self.deliver('\r' + self.app.prompt + '\033[K' + text)
+
+class TelnetSession(LineSession):
+    """Session over a raw TCP stream: telnet negotiation on top of line editing"""
+
+    def __init__(self, app, reader, writer):
+        transport = writer.transport
+        transport.set_write_buffer_limits(HIGH_WATER, LOW_WATER)
+        super().__init__(app, self._send, transport.get_write_buffer_size, writer.drain, writer.close)
+        self.reader = reader
+        self.writer = writer
+        self.decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self.state = 'data'
+        self.verb = None
+        self.sb = bytearray()
+
+    def _raw(self, data):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+    def negotiate(self):
+        # We echo and edit lines ourselves, without go-aheads, and want window size reports
+        self._raw(bytes([IAC, WILL, ECHO, IAC, WILL, SGA, IAC, DO, NAWS]))
+
+    async def pump(self):
+        """Read from the client until it disconnects"""
+        try:
+            while True:
+                data = await self.reader.read(4096)
+                if not data:
+                    break
+                self.feed(data)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.lines.put_nowait(None)
+
+    def feed(self, data):
+        """Split telnet commands from typed text"""
+        plain = bytearray()
+        for byte in data:
+            state = self.state
+            if state == 'data':
+                if byte == IAC:
+                    self.state = 'iac'
+                else:
+                    plain.append(byte)
+            elif state == 'iac':
+                if byte == IAC:
+                    plain.append(byte)
+                    self.state = 'data'
+                elif byte in (WILL, WONT, DO, DONT):
+                    self.verb = byte
+                    self.state = 'option'
+                elif byte == SB:
+                    self.sb = bytearray()
+                    self.state = 'sb'
+                else:
+                    self.state = 'data'
+            elif state == 'option':
+                self._option(self.verb, byte)
+                self.state = 'data'
+            elif state == 'sb':
+                if byte == IAC:
+                    self.state = 'sb-iac'
+                else:
+                    self.sb.append(byte)
+            else:
+                if byte == SE:
+                    self._subnegotiation(bytes(self.sb))
+                    self.state = 'data'
+                else:
+                    self.sb.append(byte)
+                    self.state = 'sb'
+        if plain:
+            self.text(self.decoder.decode(bytes(plain)))
+
+    def _option(self, verb, option):
+        # Refuse anything we did not offer or ask for
+        if verb == WILL and option != NAWS:
+            self._raw(bytes([IAC, DONT, option]))
+        elif verb == DO and option not in (ECHO, SGA):
+            self._raw(bytes([IAC, WONT, option]))
+
+    def _subnegotiation(self, payload):
+        if len(payload) >= 5 and payload[0] == NAWS:
+            self.resize(payload[1] << 8 | payload[2], payload[3] << 8 | payload[4])
+
+def log_session(kind, peer, session):
+    stats = session.stats()
+    log(f"{kind} {peer}: {stats['commands']} commands, {stats['bytes_sent']} bytes in {stats['writes']} writes, "
+        f"{stats['stalled_s']:.2f}s stalled, {stats['dropped_frames']} frames dropped"
+        + (f", {stats['frames']} WebSocket frames" if 'frames' in stats else ''))
+
+async def _telnet_client(app, reader, writer):
+    session = TelnetSession(app, reader, writer)
+    session.negotiate()
+    pump = asyncio.ensure_future(session.pump())
+    try:
+        await session.run()
+    finally:
+        log_session('telnet', writer.get_extra_info('peername'), session)
+        pump.cancel()
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+async def _start_ssh(app, host, port):
+    """Start the SSH listener if asyncssh is installed; visitors log in with any name and no password"""
+    try:
+        import asyncssh
+    except ImportError:
+        return None
+
+    key_path = os.path.join(banner_cache.cache_dir(), 'ssh_host_key')
+    if not os.path.exists(key_path):
+        os.makedirs(os.path.dirname(key_path), exist_ok=True)
+        asyncssh.generate_private_key('ssh-ed25519').write_private_key(key_path)
+
+    class OpenServer(asyncssh.SSHServer):
+        def begin_auth(self, username):
+            return False
+
+    async def pump(session, process):
+        while True:
+            try:
+                line = await process.stdin.readline()
+            except asyncssh.TerminalSizeChanged as exc:
+                session.resize(exc.width, exc.height)
+                continue
+            except (asyncssh.BreakReceived, asyncssh.SignalReceived):
+                if session.busy:
+                    session.stdin.keys.append('\x03')
+                else:
+                    session.lines.put_nowait(INTERRUPT)
+                continue
+            if not line:
+                session.lines.put_nowait(None)
+                return
+            if session.busy:
+                # The line editor only hands over whole lines, so Enter is the skip key here
+                session.stdin.keys.append('\n')
+            else:
+                session.lines.put_nowait(line.rstrip('\r\n'))
+
+    async def handle(process):
+        columns, lines = process.get_terminal_size()[:2]
+        channel = process.channel
+        channel.set_write_buffer_limits(HIGH_WATER, LOW_WATER)
+
+        def send(text):
+            process.stdout.write(text)
+            return len(text.encode('utf-8', 'replace'))
+
+        session = Session(app, send, channel.get_write_buffer_size, process.stdout.drain, channel.close, columns or 80, lines or 24)
+        session.sized.set()
+        reader = asyncio.ensure_future(pump(session, process))
+        try:
+            await session.run()
+        finally:
+            log_session('ssh', process.get_extra_info('peername'), session)
+            reader.cancel()
+            process.exit(0)
+
+    return await asyncssh.create_server(OpenServer, host, port, server_host_keys=[key_path], process_factory=handle)
+
+def start_workers():
+    """Route stdio through sessions and create the pool command handlers run on (once per process)"""
+    global _executor
+    install_streams()
+    if _executor is None:
+        _executor = ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix='session')
+
+async def serve(app, host=DEFAULT_HOST, port=DEFAULT_PORT, ssh_port=DEFAULT_SSH_PORT):
+    """Accept visitors until cancelled"""
+    start_workers()
+    telnet = await asyncio.start_server(lambda r, w: _telnet_client(app, r, w), host, port)
+    print(f"Serving telnet on {host}:{port}  (telnet {host} {port})")
+    ssh = await _start_ssh(app, host, ssh_port) if ssh_port else None
+    if ssh:
+        print(f"Serving SSH on {host}:{ssh_port}  (ssh -p {ssh_port} {host})")
+    elif ssh_port:
+        print("SSH disabled: pip install asyncssh to enable it")
+    print("Press Ctrl+C to stop")
+    sys.stdout.flush()
+    try:
+        async with telnet:
+            await telnet.serve_forever()
+    finally:
+        if ssh:
+            ssh.close()
+
+def run(app, host=DEFAULT_HOST, port=DEFAULT_PORT, ssh_port=DEFAULT_SSH_PORT):
+    """Serve from synchronous code until Ctrl+C"""
+    try:
+        asyncio.run(serve(app, host, port, ssh_port))
+    except KeyboardInterrupt:
+        pass
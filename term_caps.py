@@ -0,0 +1,186 @@
+"""
+Terminal Color Capability Detection
+Picks a truecolor, xterm-256, ANSI-16 or monochrome backend from the
+environment and provides precomputed palette lookup tables for each
+"""
+
+import contextvars
+import os
+import sys
+
+TRUECOLOR = 'truecolor'
+COLOR_256 = '256'
+COLOR_16 = '16'
+MONO = 'mono'
+
+COLOR_DEPTHS = (TRUECOLOR, COLOR_256, COLOR_16, MONO)
+
+# TERM prefixes known to understand at least the 16 basic ANSI colors
+_ANSI_TERMS = ('xterm', 'screen', 'tmux', 'rxvt', 'vt100', 'vt220', 'linux', 'ansi', 'cygwin', 'konsole', 'putty', 'alacritty', 'kitty')
+
+# Served sessions set this to their client's [columns, lines] so size-aware effects use it
+session_size = contextvars.ContextVar('session_size', default=None)
+
+def terminal_size(fallback=(80, 24)):
+    """Return the terminal size, preferring the current served session's"""
+    size = session_size.get()
+    if size:
+        return os.terminal_size(size)
+    # shutil.get_terminal_size, minus importing shutil (and its bz2/lzma) on every launch
+    columns = _env_int('COLUMNS')
+    lines = _env_int('LINES')
+    if columns <= 0 or lines <= 0:
+        try:
+            real = os.get_terminal_size(sys.__stdout__.fileno())
+        except (AttributeError, ValueError, OSError):
+            real = os.terminal_size(fallback)
+        columns = columns if columns > 0 else real.columns or fallback[0]
+        lines = lines if lines > 0 else real.lines or fallback[1]
+    return os.terminal_size((columns, lines))
+
+def _env_int(name):
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return 0
+
+def detect_color_depth(env=None):
+    """Return the color depth the terminal supports, based on NO_COLOR, COLORTERM and TERM"""
+    env = os.environ if env is None else env
+
+    # https://no-color.org: any non-empty value disables color
+    if env.get('NO_COLOR'):
+        return MONO
+
+    override = env.get('PORTFOLIO_COLORS', '').lower()
+    if override in COLOR_DEPTHS:
+        return override
+
+    colorterm = env.get('COLORTERM', '').lower()
+    if colorterm in ('truecolor', '24bit'):
+        return TRUECOLOR
+
+    term = env.get('TERM', '').lower()
+    if not term:
+        # Windows Terminal and modern conhost handle 24-bit color without setting TERM
+        if os.name == 'nt' or env.get('WT_SESSION'):
+            return TRUECOLOR
+        return COLOR_16
+    if term == 'dumb':
+        return MONO
+    if term.endswith('-direct') or 'truecolor' in term:
+        return TRUECOLOR
+    if '256color' in term:
+        return COLOR_256
+    if term.startswith(_ANSI_TERMS):
+        return COLOR_16
+    return MONO
+
+_color_defaults = {}
+
+def apply_color_depth(colors, depth):
+    """Adjust a Colors-style class of escape attributes for the given depth"""
+    if not _color_defaults.get(colors):
+        _color_defaults[colors] = {
+            name: value for name, value in vars(colors).items()
+            if name.isupper() and isinstance(value, str)
+        }
+    for name, value in _color_defaults[colors].items():
+        # The class only uses basic/bright SGR codes, which every color terminal has
+        setattr(colors, name, '' if depth == MONO else value)
+
+# xterm-256 color cube levels and the default 16-color palette
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+_ANSI_16 = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+
+# Foreground / background escape for every palette index
+FG_256 = [f'\033[38;5;{i}m' for i in range(256)]
+BG_256 = [f'\033[48;5;{i}m' for i in range(256)]
+FG_16 = [f'\033[{30 + i}m' for i in range(8)] + [f'\033[{90 + i}m' for i in range(8)]
+BG_16 = [f'\033[{40 + i}m' for i in range(8)] + [f'\033[{100 + i}m' for i in range(8)]
+
+def _nearest_cube_level(value):
+    return min(range(6), key=lambda i: abs(_CUBE_LEVELS[i] - value))
+
+def _distance(a, b):
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+def _build_256(bits):
+    """Map every quantized RGB triple to the closest cube or grayscale-ramp index"""
+    levels = 1 << bits
+    half = 1 << (7 - bits) if bits < 8 else 0
+    centers = [(v << (8 - bits)) + half for v in range(levels)]
+    cube_of = [_nearest_cube_level(c) for c in centers]
+    lut = bytearray(levels ** 3)
+    i = 0
+    for r in centers:
+        cr = cube_of[r >> (8 - bits)]
+        for g in centers:
+            cg = cube_of[g >> (8 - bits)]
+            for b in centers:
+                cb = cube_of[b >> (8 - bits)]
+                cube = (_CUBE_LEVELS[cr], _CUBE_LEVELS[cg], _CUBE_LEVELS[cb])
+                gray_step = min(23, max(0, ((r + g + b) // 3 - 3) // 10))
+                gray = 8 + gray_step * 10
+                if _distance((r, g, b), (gray, gray, gray)) < _distance((r, g, b), cube):
+                    lut[i] = 232 + gray_step
+                else:
+                    lut[i] = 16 + 36 * cr + 6 * cg + cb
+                i += 1
+    return bytes(lut)
+
+def _build_16(bits):
+    """Map every quantized RGB triple to the closest of the 16 ANSI colors"""
+    levels = 1 << bits
+    half = 1 << (7 - bits) if bits < 8 else 0
+    centers = [(v << (8 - bits)) + half for v in range(levels)]
+    lut = bytearray(levels ** 3)
+    i = 0
+    for r in centers:
+        for g in centers:
+            for b in centers:
+                lut[i] = min(range(16), key=lambda n: _distance((r, g, b), _ANSI_16[n]))
+                i += 1
+    return bytes(lut)
+
+class Palette:
+    """Precomputed RGB -> palette index lookup for one color depth"""
+
+    def __init__(self, depth, bits, lut, fg, bg):
+        self.depth = depth
+        self.bits = bits
+        self.lut = lut
+        self.fg = fg
+        self.bg = bg
+        # bytes.translate tables that drop each channel to `bits` bits
+        shift = 8 - bits
+        self.reduce = bytes(v >> shift for v in range(256))
+
+    def index_row(self, reds, greens, blues):
+        """Return the palette index for every pixel of a row of channel bytes"""
+        lut = self.lut
+        bits = self.bits
+        rs = reds.translate(self.reduce)
+        gs = greens.translate(self.reduce)
+        bs = blues.translate(self.reduce)
+        return bytes([lut[(r << (bits * 2)) | (g << bits) | b] for r, g, b in zip(rs, gs, bs)])
+
+_palettes = {}
+
+def palette(depth):
+    """Return the lookup-table palette for a 256 or 16 color depth (built once)"""
+    pal = _palettes.get(depth)
+    if pal is None:
+        if depth == COLOR_256:
+            pal = Palette(depth, 5, _build_256(5), FG_256, BG_256)
+        elif depth == COLOR_16:
+            pal = Palette(depth, 4, _build_16(4), FG_16, BG_16)
+        else:
+            raise ValueError(f"no palette for color depth {depth!r}")
+        _palettes[depth] = pal
+    return pal
@@ -0,0 +1,50 @@
+"""
+assic.py batch conversion: the plain .txt and the colored .ans of one image
+must draw the same glyphs.
+Run from the repository root with: python -m pytest tests
+"""
+
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+import assic
+
+_SGR = re.compile('\x1b\\[[0-9;]*m')
+
+def convert(image, width):
+    out_dir = tempfile.mkdtemp(prefix='assic-test-')
+    path = os.path.join(out_dir, 'source.png')
+    image.save(path)
+    assic.convert_file(path, 'out', out_dir, width, 1.0)
+    with open(os.path.join(out_dir, 'out.txt'), encoding='utf-8') as f:
+        txt = f.read()
+    with open(os.path.join(out_dir, 'out.ans'), encoding='utf-8') as f:
+        ans = f.read()
+    return txt, _SGR.sub('', ans)
+
+class TextMatchesAnsiTest(unittest.TestCase):
+    def test_half_black_half_white(self):
+        image = Image.new('RGB', (40, 20), (255, 255, 255))
+        image.paste((0, 0, 0), (0, 0, 20, 20))
+        txt, ans = convert(image, 40)
+        self.assertEqual(txt, ans)
+        first = txt.splitlines()[0]
+        # Dark pixels are the dense end of ASCII_CHARS in both files
+        self.assertEqual(first[:20], '@' * 20)
+        self.assertEqual(first[20:], ' ' * 20)
+
+    def test_color_gradient(self):
+        image = Image.new('RGB', (64, 32))
+        image.putdata([(x * 4, y * 8, (x + y) * 2) for y in range(32) for x in range(64)])
+        txt, ans = convert(image, 64)
+        self.assertEqual(txt, ans)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""
+PrefixIndex lookups, including prefixes ending in U+10FFFF, the one code
+point with no successor to bound the search.
+Run from the repository root with: python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from completion import PrefixIndex
+
+MAX = '\U0010ffff'
+
+class PrefixIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex(['a', 'a' + MAX, 'a' + MAX + 'x', 'a' + MAX + MAX, 'ab', 'b', MAX, MAX + 'z'])
+
+    def brute(self, prefix):
+        return [word for word in self.index.words if word.startswith(prefix)]
+
+    def test_plain_prefixes(self):
+        for prefix in ('', 'a', 'ab', 'b', 'c'):
+            self.assertEqual(self.index.complete(prefix), self.brute(prefix))
+
+    def test_prefix_ending_in_max_code_point(self):
+        for prefix in (MAX, MAX + MAX, 'a' + MAX, 'a' + MAX + MAX, 'b' + MAX):
+            self.assertEqual(self.index.complete(prefix), self.brute(prefix))
+            self.assertEqual(self.index.count(prefix), len(self.brute(prefix)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+MatrixRain on tiny terminals, such as a served session whose client reports
+only one or two lines, and terminal restore when an effect fails mid-play.
+Run from the repository root with: python -m pytest tests
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import animation
+from matrix_rain import ENTER, HEAD_LEVEL, LEAVE, MatrixRain
+from term_caps import session_size
+
+class OneRowTest(unittest.TestCase):
+    def test_steps_past_the_trail_restart_on_one_row(self):
+        # A 2-line session leaves one row for the rain
+        token = session_size.set((20, 2))
+        self.addCleanup(session_size.reset, token)
+        rain = MatrixRain(rng=random.Random(1))
+        self.assertEqual((rain.width, rain.height), (20, 1))
+        # Enough frames for every column's trail to leave the screen and restart several times
+        for _ in range(10 * (HEAD_LEVEL + 2) * 3):
+            rain.step()
+            rain.render()
+        self.assertTrue(all(head < 1 + HEAD_LEVEL for head in rain.heads))
+
+class RestoreOnErrorTest(unittest.TestCase):
+    def test_failing_effect_leaves_the_alternate_screen(self):
+        class Broken(MatrixRain):
+            def render(self):
+                raise RuntimeError('boom')
+
+        out = []
+        rain = Broken(width=10, height=5, duration=1.0)
+        with self.assertRaises(RuntimeError):
+            animation.play(rain, out.append, lambda: None)
+        self.assertEqual(out[0], ENTER)
+        self.assertIn(LEAVE, ''.join(out[1:]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+ScreenCache under concurrent lookups, as in --serve mode where many session
+threads at different terminal widths share one cache.
+Run from the repository root with: python -m pytest tests
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screen_cache import ScreenCache
+from term_caps import TRUECOLOR, session_size
+
+THREADS = 16
+ROUNDS = 2000
+
+def screen(name):
+    return f'screen {name} at {session_size.get()[0]} columns'
+
+class ConcurrentLookupTest(unittest.TestCase):
+    def test_lookups_from_many_threads_with_constant_eviction(self):
+        # Switch threads as often as possible so unguarded get/move_to_end pairs interleave
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        cache = ScreenCache(TRUECOLOR, maxsize=4)
+        errors = []
+        start = threading.Barrier(THREADS)
+
+        def session(width):
+            # Every width is its own key, so a tiny cache evicts on nearly every miss
+            session_size.set((width, 24))
+            start.wait()
+            try:
+                for i in range(ROUNDS):
+                    name = str(i % 3)
+                    parts = cache.lookup(screen, (name,), 'utf-8')
+                    if parts != (f'screen {name} at {width} columns'.encode('utf-8'),):
+                        errors.append(parts)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=session, args=(40 + i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache.screens), cache.maxsize)
+        self.assertEqual(cache.hits + cache.misses, THREADS * ROUNDS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+"""
+WebSocket Bridge
+Attaches browser clients to the real command engine: the --http server
+upgrades GET /ws (RFC 6455) into a session like a telnet visitor's, with
+the same worker threads, history and line editing. Everything a session
+writes during one turn of the event loop goes out as a single binary frame.
+
+Wire protocol: server -> client binary frames carry terminal output (UTF-8,
+ANSI escapes, CRLF line ends); client -> server binary frames carry typed
+keys, and text frames carry JSON control messages, for now only
+{"type": "resize", "cols": N, "rows": N}.
+"""
+
+import asyncio
+import base64
+import codecs
+import hashlib
+import json
+import os
+import struct
+
+import server
+
+PATH = '/ws'
+
+GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# Frame opcodes
+CONTINUATION, TEXT, BINARY, CLOSE, PING, PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+# Close codes
+NORMAL, GOING_AWAY, PROTOCOL_ERROR, TOO_BIG = 1000, 1001, 1002, 1009
+
+# Largest message accepted from a client; keys and resizes are tiny
+MAX_MESSAGE = 64 * 1024
+
+class ProtocolError(Exception):
+    def __init__(self, message, code=PROTOCOL_ERROR):
+        super().__init__(message)
+        self.code = code
+
+def accept_key(key):
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key"""
+    return base64.b64encode(hashlib.sha1((key + GUID).encode('ascii')).digest()).decode('ascii')
+
+def handshake_error(headers):
+    """Why an upgrade request (lowercase header names) is unacceptable, or None"""
+    if headers.get('upgrade', '').lower() != 'websocket':
+        return 'not a WebSocket upgrade'
+    if 'upgrade' not in headers.get('connection', '').lower():
+        return 'missing Connection: Upgrade'
+    if headers.get('sec-websocket-version') != '13':
+        return 'unsupported WebSocket version'
+    try:
+        if len(base64.b64decode(headers.get('sec-websocket-key', ''), validate=True)) != 16:
+            return 'bad Sec-WebSocket-Key'
+    except ValueError:
+        return 'bad Sec-WebSocket-Key'
+    return None
+
+def handshake_response(headers):
+    return (
+        'HTTP/1.1 101 Switching Protocols\r\n'
+        'Upgrade: websocket\r\n'
+        'Connection: Upgrade\r\n'
+        f"Sec-WebSocket-Accept: {accept_key(headers['sec-websocket-key'])}\r\n\r\n"
+    ).encode('ascii')
+
+def mask_bytes(payload, mask):
+    """XOR payload with a 4-byte key (done as one big integer, not byte by byte)"""
+    if not payload:
+        return payload
+    length = len(payload)
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(key, 'little')).to_bytes(length, 'little')
+
+def encode_frame(opcode, payload, mask=False):
+    """One final frame; clients must mask what they send, servers must not"""
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        head = struct.pack('!BB', 0x80 | opcode, mask_bit | length)
+    elif length < 1 << 16:
+        head = struct.pack('!BBH', 0x80 | opcode, mask_bit | 126, length)
+    else:
+        head = struct.pack('!BBQ', 0x80 | opcode, mask_bit | 127, length)
+    if mask:
+        key = os.urandom(4)
+        return head + key + mask_bytes(payload, key)
+    return head + payload
+
+async def read_frame(reader, masked=True):
+    """Return (fin, opcode, payload) for the next frame; masked says what the peer must do"""
+    first, second = await reader.readexactly(2)
+    if first & 0x70:
+        raise ProtocolError('reserved bits set')
+    if bool(second & 0x80) != masked:
+        raise ProtocolError('bad masking')
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', await reader.readexactly(8))[0]
+    opcode = first & 0x0F
+    if opcode >= CLOSE and (length > 125 or not first & 0x80):
+        raise ProtocolError('bad control frame')
+    if length > MAX_MESSAGE:
+        raise ProtocolError('message too big', TOO_BIG)
+    key = await reader.readexactly(4) if masked else None
+    payload = await reader.readexactly(length)
+    return bool(first & 0x80), opcode, mask_bytes(payload, key) if masked else payload
+
+async def read_message(reader, write, masked=True):
+    """Return (opcode, payload) of the next data message, answering pings; (CLOSE, code bytes) when the peer closes"""
+    opcode = None
+    parts = []
+    size = 0
+    while True:
+        fin, frame_opcode, payload = await read_frame(reader, masked)
+        if frame_opcode == PING:
+            write(encode_frame(PONG, payload, mask=not masked))
+            continue
+        if frame_opcode == PONG:
+            continue
+        if frame_opcode == CLOSE:
+            return CLOSE, payload[:2]
+        if frame_opcode == CONTINUATION:
+            if opcode is None:
+                raise ProtocolError('continuation without a message')
+        elif frame_opcode in (TEXT, BINARY):
+            if opcode is not None:
+                raise ProtocolError('new message inside a fragmented one')
+            opcode = frame_opcode
+        else:
+            raise ProtocolError('unknown opcode')
+        size += len(payload)
+        if size > MAX_MESSAGE:
+            raise ProtocolError('message too big', TOO_BIG)
+        parts.append(payload)
+        if fin:
+            return opcode, b''.join(parts)
+
+class WebSocketSession(server.LineSession):
+    """A browser visitor: output batched into one binary frame per loop turn, keys and resizes from the client"""
+
+    def __init__(self, app, reader, writer):
+        transport = writer.transport
+        transport.set_write_buffer_limits(server.HIGH_WATER, server.LOW_WATER)
+        super().__init__(app, self._send, self._buffered, writer.drain, writer.close)
+        self.reader = reader
+        self.writer = writer
+        self.decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self.pending = bytearray()
+        self.frames = 0
+
+    def _raw(self, data):
+        if not self.pending:
+            asyncio.get_running_loop().call_soon(self._frame)
+        self.pending += data
+
+    def _frame(self):
+        """Send everything written since the last frame as one message"""
+        data = bytes(self.pending)
+        self.pending.clear()
+        if data and not self.writer.is_closing():
+            self.writer.write(encode_frame(BINARY, data))
+            self.frames += 1
+
+    def _buffered(self):
+        return self.writer.transport.get_write_buffer_size() + len(self.pending)
+
+    def stats(self):
+        stats = super().stats()
+        stats['frames'] = self.frames
+        return stats
+
+    def control(self, payload):
+        try:
+            message = json.loads(payload)
+            if message.get('type') == 'resize':
+                self.resize(int(message['cols']), int(message['rows']))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            pass
+
+    async def pump(self):
+        """Read messages until the client closes; returns the close code to answer with"""
+        code = NORMAL
+        try:
+            while True:
+                opcode, payload = await read_message(self.reader, self.writer.write)
+                if opcode == CLOSE:
+                    break
+                if opcode == TEXT:
+                    self.control(payload)
+                else:
+                    self.text(self.decoder.decode(payload))
+        except ProtocolError as e:
+            code = e.code
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            code = None
+        finally:
+            self.lines.put_nowait(None)
+        return code
+
+async def accept(app, reader, writer, headers):
+    """Complete the upgrade of an HTTP connection and run its session until either side ends it"""
+    session = WebSocketSession(app, reader, writer)
+    writer.write(handshake_response(headers))
+    pump = asyncio.ensure_future(session.pump())
+    try:
+        await session.run()
+    finally:
+        session._frame()
+        if pump.done():
+            code = pump.result()
+        else:
+            pump.cancel()
+            code = GOING_AWAY if session.stdout.closed else NORMAL
+        server.log_session('websocket', writer.get_extra_info('peername'), session)
+        if code is not None and not writer.is_closing():
+            writer.write(encode_frame(CLOSE, struct.pack('!H', code)))
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
@@ -0,0 +1,165 @@
+"""
+WebSocket Terminal Client
+Attaches this terminal to a live session served by `portfolio_enhanced.py
+--http`, the same way the browser page does: keys go up as binary frames,
+the window size as a resize message, and output is written straight to the
+terminal. With -c it runs commands non-interactively and prints what they
+wrote, which is handy for checking the bridge from a script.
+Usage: python ws_client.py [ws://host:port/ws] [-c COMMAND ...]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+
+import ws_bridge
+from ws_bridge import BINARY, CLOSE, NORMAL, TEXT, encode_frame, read_message
+
+DEFAULT_URL = 'ws://127.0.0.1:8080/ws'
+
+# What the portfolio prompt contains; scripted runs wait for it between commands
+PROMPT_MARKER = b'portfolio@terminal'
+
+class WebSocketClient:
+    """Client end of a bridge session"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    @classmethod
+    async def connect(cls, url=DEFAULT_URL):
+        parts = urlsplit(url)
+        if parts.scheme != 'ws':
+            raise ValueError('only ws:// URLs are supported')
+        host, port = parts.hostname or '127.0.0.1', parts.port or 80
+        reader, writer = await asyncio.open_connection(host, port)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        writer.write((
+            f'GET {parts.path or "/"} HTTP/1.1\r\n'
+            f'Host: {host}:{port}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n\r\n'
+        ).encode('ascii'))
+        head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+        status = head.split('\r\n', 1)[0]
+        if ' 101 ' not in status + ' ' or f'Sec-WebSocket-Accept: {ws_bridge.accept_key(key)}' not in head:
+            writer.close()
+            raise ConnectionError(f'upgrade refused: {status}')
+        return cls(reader, writer)
+
+    def send_keys(self, text):
+        self.writer.write(encode_frame(BINARY, text.encode('utf-8'), mask=True))
+
+    def resize(self, cols, rows):
+        self.writer.write(encode_frame(TEXT, json.dumps({'type': 'resize', 'cols': cols, 'rows': rows}).encode('utf-8'), mask=True))
+
+    async def recv(self):
+        """The next output frame's bytes, or None once the server has closed"""
+        if self.closed:
+            return None
+        opcode, payload = await read_message(self.reader, self.writer.write, masked=False)
+        if opcode == CLOSE:
+            self.closed = True
+            return None
+        return payload
+
+    async def expect(self, marker=PROMPT_MARKER):
+        """Read output until marker appears; returns everything read (stops early if the server closes)"""
+        seen = bytearray()
+        while marker not in seen[-(len(marker) + 65536):]:
+            data = await self.recv()
+            if data is None:
+                break
+            seen += data
+        return bytes(seen)
+
+    async def close(self, code=NORMAL):
+        if not self.closed and not self.writer.is_closing():
+            self.writer.write(encode_frame(CLOSE, code.to_bytes(2, 'big'), mask=True))
+            self.closed = True
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+async def run_commands(url, commands, cols=100, rows=40):
+    """Run commands in a fresh session and write their output to stdout"""
+    client = await WebSocketClient.connect(url)
+    client.resize(cols, rows)
+    out = sys.stdout.buffer
+    out.write(await client.expect())
+    for command in commands:
+        client.send_keys(command + '\r')
+        out.write(await client.expect())
+        out.flush()
+    out.write(b'\r\n')
+    await client.close()
+
+async def interact(url):
+    """Attach this terminal to a session until either side closes"""
+    import signal
+    import termios
+    import tty
+
+    client = await WebSocketClient.connect(url)
+    loop = asyncio.get_running_loop()
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+
+    def send_size():
+        size = os.get_terminal_size()
+        client.resize(size.columns, size.lines)
+
+    def on_key():
+        data = os.read(fd, 1024)
+        if data:
+            client.send_keys(data.decode('utf-8', 'replace'))
+
+    send_size()
+    tty.setraw(fd)
+    loop.add_reader(fd, on_key)
+    loop.add_signal_handler(signal.SIGWINCH, send_size)
+    out = sys.stdout.buffer
+    try:
+        while True:
+            data = await client.recv()
+            if data is None:
+                break
+            out.write(data)
+            out.flush()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        loop.remove_reader(fd)
+        loop.remove_signal_handler(signal.SIGWINCH)
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        await client.close()
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Attach to a live portfolio session over WebSocket')
+    parser.add_argument('url', nargs='?', default=DEFAULT_URL, help=f'session URL (default: {DEFAULT_URL})')
+    parser.add_argument('-c', '--command', action='append', default=[], help='run a command and print its output (repeatable)')
+    args = parser.parse_args()
+    try:
+        if args.command:
+            asyncio.run(run_commands(args.url, args.command))
+        else:
+            asyncio.run(interact(args.url))
+    except (ConnectionError, OSError, ValueError) as e:
+        print(f"ws_client: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()